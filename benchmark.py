@@ -0,0 +1,701 @@
+"""Benchmark untuk bot.py (tanpa koneksi ke Discord)
+
+Contoh:
+    python benchmark.py banner --renders 200
+    python benchmark.py load --concurrency 1,10,50 --requests 500 --latency 80
+    python benchmark.py load --scenarios meme,crypto --error-rate 0.05
+"""
+
+import argparse
+import asyncio
+import io
+import itertools
+import logging
+import math
+import random
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from urllib.parse import urlsplit
+
+import discord
+from aiohttp import web
+from PIL import Image
+
+import bot
+
+
+def make_image_bytes(size, color):
+    image = Image.new("RGB", (size, size), color=color)
+    data = io.BytesIO()
+    image.save(data, format="PNG")
+    return data.getvalue()
+
+
+def bench_banner(renders, image_format, png_optimize, avatars, warm):
+    renderer = bot.BannerRenderer(
+        image_format=image_format, png_optimize=png_optimize, avatars=avatars
+    )
+    icon_bytes = make_image_bytes(renderer.icon_size, (240, 200, 60))
+    avatar_bytes = make_image_bytes(renderer.avatar_size, (60, 200, 240))
+    key = ("Benchmark Guild", "icon")
+
+    total_bytes = 0
+    start = time.perf_counter()
+    for i in range(renders):
+        # warm: layer guild sudah di-cache, cold: setiap render guild baru
+        guild_id = 1 if warm else i
+        banner = renderer.render_sync(
+            guild_id,
+            key,
+            "Benchmark Guild",
+            icon_bytes,
+            f"Member {i}",
+            avatar_bytes if avatars else None,
+        )
+        total_bytes += len(banner.getvalue())
+    elapsed = time.perf_counter() - start
+
+    label = image_format + (" (optimized)" if png_optimize else "")
+    print(
+        f"{label:<16} avatar={'yes' if avatars else 'no':<3} "
+        f"{'warm' if warm else 'cold':<4} "
+        f"{renders / elapsed:8.1f} renders/s  "
+        f"{total_bytes / renders / 1024:7.1f} KiB/banner"
+    )
+
+
+def run_banner(args):
+    print(f"Banner {bot.BANNER_WIDTH}x{bot.BANNER_HEIGHT}, {args.renders} renders")
+    for image_format, png_optimize in (("png", False), ("png", True), ("webp", False)):
+        for avatars in (False, True):
+            for warm in (False, True):
+                bench_banner(args.renders, image_format, png_optimize, avatars, warm)
+
+
+# Load test: command callback asli, Discord palsu, upstream dari server stub lokal
+class StubUpstream:
+    """Server aiohttp lokal yang meniru semua API upstream bot
+
+    URL upstream ditulis ulang jadi http://127.0.0.1:PORT/<host><path> lewat
+    HTTPClient.rewrite, jadi command tetap memanggil URL aslinya.
+    """
+
+    def __init__(self, latency, jitter, error_rate, coins):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.coins = [
+            {"id": f"coin-{i}", "symbol": f"c{i}", "name": f"Coin {i}"}
+            for i in range(coins)
+        ]
+        self.serial = itertools.count()
+        self.requests = Counter()
+        self.errors = 0
+        self.base = None
+        self.runner = None
+        self.routes = {
+            "meme-api.com/gimme": self.meme_api,
+            "api.imgflip.com/get_memes": self.imgflip,
+            "some-random-api.ml/meme": self.some_random_api,
+            "api.jikan.moe/v4/anime": self.jikan,
+            "api.openweathermap.org/data/2.5/weather": self.weather,
+            "api.coingecko.com/api/v3/coins/list": self.coin_list,
+            "api.coingecko.com/api/v3/coins/markets": self.coin_markets,
+            "api.coingecko.com/api/v3/simple/price": self.simple_price,
+            "api.coingecko.com/api/v3/exchange_rates": self.exchange_rates,
+            "api.coingecko.com/api/v3/search": self.coin_search,
+            "catfact.ninja/fact": self.cat_fact,
+            "dog.ceo/api/breeds/image/random": self.dog,
+            "api.quotable.io/random": self.quotable,
+            "zenquotes.io/api/random": self.zenquotes,
+        }
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/{route:.+}", self.handle)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        host, port = self.runner.addresses[0][:2]
+        self.base = f"http://{host}:{port}"
+
+    async def close(self):
+        if self.runner is not None:
+            await self.runner.cleanup()
+
+    def rewrite(self, url):
+        parts = urlsplit(url)
+        query = f"?{parts.query}" if parts.query else ""
+        return f"{self.base}/{parts.netloc}{parts.path}{query}"
+
+    async def handle(self, request):
+        route = request.match_info["route"]
+        handler = self.routes.get(route)
+        if handler is None:
+            return web.json_response({"error": "not found"}, status=404)
+
+        self.requests[route] += 1
+        # Latency dasar + ekor eksponensial supaya ada tail seperti API asli
+        delay = self.latency
+        if self.jitter:
+            delay += random.expovariate(1 / self.jitter)
+        await asyncio.sleep(delay)
+
+        if random.random() < self.error_rate:
+            self.errors += 1
+            return web.json_response({"error": "injected"}, status=503)
+        return web.json_response(handler(request.query))
+
+    def meme_api(self, query):
+        n = next(self.serial)
+        return {
+            "url": f"https://i.example.com/meme-{n}.png",
+            "title": f"Meme {n}",
+            "subreddit": "memes",
+            "author": "benchmark",
+            "ups": n,
+        }
+
+    def imgflip(self, query):
+        n = next(self.serial)
+        memes = [
+            {"url": f"https://i.example.com/imgflip-{n}-{i}.png", "name": f"Meme {i}"}
+            for i in range(20)
+        ]
+        return {"success": True, "data": {"memes": memes}}
+
+    def some_random_api(self, query):
+        n = next(self.serial)
+        return {
+            "image": f"https://i.example.com/sra-{n}.png",
+            "caption": f"Meme {n}",
+            "category": "random",
+        }
+
+    def jikan(self, query):
+        title = query.get("q", "")
+        return {
+            "data": [
+                {
+                    "title": title.title(),
+                    "synopsis": "Sinopsis benchmark. " * 40,
+                    "url": "https://myanimelist.net/anime/1",
+                    "images": {
+                        "jpg": {"large_image_url": "https://i.example.com/a.jpg"}
+                    },
+                    "type": "TV",
+                    "year": 2020,
+                    "episodes": 24,
+                    "score": 8.5,
+                    "popularity": 1234,
+                    "rank": 56,
+                    "status": "Finished Airing",
+                    "duration": "24 min per ep",
+                    "rating": "PG-13",
+                    "genres": [{"name": "Action"}, {"name": "Drama"}],
+                    "studios": [{"name": "Studio Benchmark"}],
+                    "aired": {"string": "Jan 2020 to Jun 2020"},
+                }
+            ]
+        }
+
+    def weather(self, query):
+        return {
+            "cod": 200,
+            "name": query.get("q", "").title(),
+            "coord": {"lat": -6.2, "lon": 106.8},
+            "main": {
+                "temp": 30.1,
+                "feels_like": 34.2,
+                "temp_min": 28.0,
+                "temp_max": 32.5,
+                "humidity": 70,
+                "pressure": 1009,
+            },
+            "weather": [{"description": "scattered clouds"}],
+            "wind": {"speed": 3.1, "deg": 240},
+            "clouds": {"all": 40},
+            "visibility": 8000,
+            "sys": {"country": "ID", "sunrise": 1700000000, "sunset": 1700043200},
+        }
+
+    def market(self, rank):
+        coin = self.coins[rank]
+        price = 1000 / (rank + 1)
+        return {
+            "id": coin["id"],
+            "current_price": price,
+            "price_change_percentage_24h": 1.5,
+            "market_cap": price * 1_000_000,
+            "total_volume": price * 10_000,
+            "market_cap_rank": rank + 1,
+        }
+
+    def coin_list(self, query):
+        return self.coins
+
+    def coin_markets(self, query):
+        per_page = int(query.get("per_page", 100))
+        start = (int(query.get("page", 1)) - 1) * per_page
+        end = min(start + per_page, len(self.coins))
+        return [self.market(rank) for rank in range(start, end)]
+
+    def simple_price(self, query):
+        data = {}
+        for coin_id in query.get("ids", "").split(","):
+            if not coin_id.startswith("coin-"):
+                continue
+            market = self.market(int(coin_id.split("-", 1)[1]) % len(self.coins))
+            data[coin_id] = {
+                "usd": market["current_price"],
+                "idr": market["current_price"] * 16000,
+                "usd_24h_change": market["price_change_percentage_24h"],
+                "usd_market_cap": market["market_cap"],
+                "usd_24h_vol": market["total_volume"],
+            }
+        return data
+
+    def exchange_rates(self, query):
+        return {"rates": {"usd": {"value": 60000.0}, "idr": {"value": 960000000.0}}}
+
+    def coin_search(self, query):
+        text = query.get("query", "").lower()
+        return {"coins": [c for c in self.coins if c["symbol"] == text][:1]}
+
+    def cat_fact(self, query):
+        return {"fact": f"Cat fact #{next(self.serial)}"}
+
+    def dog(self, query):
+        n = next(self.serial)
+        return {"status": "success", "message": f"https://i.example.com/dog-{n}.jpg"}
+
+    def quotable(self, query):
+        n = next(self.serial)
+        return {"content": f"Quote #{n}", "author": "Benchmark", "tags": []}
+
+    def zenquotes(self, query):
+        n = next(self.serial)
+        return [{"q": f"Zen quote #{n}", "a": "Benchmark"}]
+
+
+class FakeAsset:
+    def __init__(self, url, data, latency):
+        self.url = url
+        self.key = url.rsplit("/", 1)[-1]
+        self.data = data
+        self.latency = latency
+
+    def replace(self, **kwargs):
+        return self
+
+    async def read(self):
+        await asyncio.sleep(self.latency)
+        return self.data
+
+
+class FakeChannel:
+    def __init__(self, channel_id, name, latency):
+        self.id = channel_id
+        self.name = name
+        self.latency = latency
+        self.sent = 0
+
+    async def send(self, **kwargs):
+        await asyncio.sleep(self.latency)
+        self.sent += 1
+
+
+class FakeGuild:
+    def __init__(self, guild_id, icon, channel):
+        self.id = guild_id
+        self.name = f"Guild {guild_id}"
+        self.icon = icon
+        self.text_channels = [channel]
+        self.system_channel = None
+        self.member_count = 100
+        self.channel = channel
+
+    def get_channel(self, channel_id):
+        return self.channel if channel_id == self.channel.id else None
+
+
+class FakeMember:
+    def __init__(self, member_id, guild, avatar):
+        self.id = member_id
+        self.name = f"member{member_id}"
+        self.display_name = f"Member {member_id}"
+        self.mention = f"<@{member_id}>"
+        self.display_avatar = avatar
+        self.created_at = datetime.now(timezone.utc)
+        self.guild = guild
+
+
+class FakeResponse:
+    """Meniru InteractionResponse: cuma boleh dipakai sekali per interaction"""
+
+    def __init__(self, interaction):
+        self.interaction = interaction
+        self.done = False
+
+    def is_done(self):
+        return self.done
+
+    async def _respond(self):
+        if self.done:
+            raise discord.InteractionResponded(self.interaction)
+        self.done = True
+        self.interaction.first_response = time.perf_counter()
+        await asyncio.sleep(self.interaction.latency)
+
+    async def defer(self, **kwargs):
+        await self._respond()
+
+    async def send_message(self, **kwargs):
+        await self._respond()
+        self.interaction.record(kwargs)
+
+
+class FakeFollowup:
+    def __init__(self, interaction):
+        self.interaction = interaction
+
+    async def send(self, **kwargs):
+        if not self.interaction.response.is_done():
+            raise RuntimeError("followup dikirim sebelum interaction di-response")
+        await asyncio.sleep(self.interaction.latency)
+        self.interaction.record(kwargs)
+
+
+class FakeInteraction:
+    def __init__(self, command, user, guild, latency):
+        self.command = SimpleNamespace(qualified_name=command)
+        self.user = user
+        self.guild = guild
+        self.guild_id = guild.id
+        self.latency = latency
+        self.created_at = datetime.now(timezone.utc)
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+        self.first_response = None
+        self.embeds = []
+
+    def record(self, kwargs):
+        if "embed" in kwargs:
+            self.embeds.append(kwargs["embed"])
+        self.embeds.extend(kwargs.get("embeds") or [])
+
+    @property
+    def ok(self):
+        # Semua embed error di bot.py diawali "❌"
+        return bool(self.embeds) and not any(
+            (embed.title or "").startswith("❌") for embed in self.embeds
+        )
+
+
+ANIME_TITLES = ["naruto", "one piece", "frieren", "bleach", "spy x family"]
+CITIES = ["jakarta", "bandung", "surabaya", "medan", "makassar", "denpasar"]
+CALC_EXPRESSIONS = [
+    "2 + 3 * 4",
+    "sqrt(16) + 2 ^ 10",
+    "(1 + 2) * (3 + 4) / 5",
+    "sin(pi / 2) + log(100)",
+    "factorial(20) / 3",
+    "x = 12 * 12",
+    "max(1, 5, 3) * min(4, 2)",
+]
+
+
+class LoadContext:
+    """State bersama semua skenario: server stub, cog crypto, object Discord palsu"""
+
+    def __init__(self, stub, args):
+        self.stub = stub
+        self.latency = args.discord_latency / 1000
+        self.distinct = args.distinct
+        self.ids = itertools.count(1)
+        self.crypto = bot.CryptoCommand(bot.bot)
+        self.icon_bytes = make_image_bytes(256, (240, 200, 60))
+        self.avatar_bytes = make_image_bytes(256, (60, 200, 240))
+        self.channel = FakeChannel(1, "general", self.latency)
+        self.guild = FakeGuild(1, self.asset("icons/1/guild.png"), self.channel)
+
+    def asset(self, path, data=None):
+        url = f"https://cdn.discordapp.com/{path}"
+        return FakeAsset(url, data or self.icon_bytes, self.latency)
+
+    def member(self, guild):
+        member_id = next(self.ids)
+        avatar = self.asset(f"avatars/{member_id}/a.png", self.avatar_bytes)
+        return FakeMember(member_id, guild, avatar)
+
+    def interaction(self, command):
+        return FakeInteraction(
+            command, self.member(self.guild), self.guild, self.latency
+        )
+
+    def pick(self, values, i):
+        # Variasi query dibatasi --distinct supaya hit ratio cache terkontrol
+        return f"{values[i % len(values)]} {i % self.distinct // len(values)}"
+
+    async def warm_up(self):
+        """Isi state yang di bot asli di-load saat startup (pool, coin index, ticker)"""
+        await self.crypto.coin_index.refresh()
+        await self.crypto.ticker.refresh()
+        for pool in bot.content_pools.values():
+            await pool.refill()
+
+
+async def scenario_meme(ctx, i):
+    interaction = ctx.interaction("meme")
+    await bot.random_meme.callback(interaction)
+    return interaction
+
+
+async def scenario_anime(ctx, i):
+    interaction = ctx.interaction("animeinfo")
+    await bot.anime_info.callback(interaction, ctx.pick(ANIME_TITLES, i))
+    return interaction
+
+
+async def scenario_weather(ctx, i):
+    interaction = ctx.interaction("weather")
+    await bot.weather_info.callback(interaction, ctx.pick(CITIES, i))
+    return interaction
+
+
+async def scenario_crypto(ctx, i):
+    interaction = ctx.interaction("crypto")
+    # Campuran top coin (snapshot ticker) dan coin di luar ticker (simple/price)
+    coin = f"c{i % ctx.distinct * len(ctx.stub.coins) // ctx.distinct}"
+    await bot.CryptoCommand.crypto.callback(ctx.crypto, interaction, coin)
+    return interaction
+
+
+async def scenario_kalkulator(ctx, i):
+    interaction = ctx.interaction("kalkulator")
+    expression = CALC_EXPRESSIONS[i % len(CALC_EXPRESSIONS)]
+    await bot.kalkulator.callback(
+        interaction, expression, "float", bot.CALC_DEFAULT_PRECISION
+    )
+    return interaction
+
+
+async def scenario_welcome(ctx, i):
+    # Guild baru per member: jalur welcome tunggal, bukan burst
+    guild_id = next(ctx.ids)
+    channel = FakeChannel(guild_id, "welcome", ctx.latency)
+    guild = FakeGuild(guild_id, ctx.asset(f"icons/{guild_id}/guild.png"), channel)
+    await bot.on_member_join(ctx.member(guild))
+    return SimpleNamespace(ok=channel.sent > 0)
+
+
+LOAD_SCENARIOS = {
+    "meme": scenario_meme,
+    "anime": scenario_anime,
+    "weather": scenario_weather,
+    "crypto": scenario_crypto,
+    "kalkulator": scenario_kalkulator,
+    "welcome": scenario_welcome,
+}
+
+
+class LoopLagMonitor:
+    """Ukur seberapa telat event loop membangunkan sleep pendek"""
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.samples = []
+        self.task = None
+
+    def start(self):
+        self.samples = []
+        self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        return self.samples
+
+    async def _run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(time.perf_counter() - start - self.interval)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile, values harus sudah urut"""
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(pct / 100 * len(values)) - 1)]
+
+
+async def run_level(ctx, scenario, concurrency, requests):
+    latencies = []
+    first_responses = []
+    errors = 0
+    counter = itertools.count()
+
+    async def worker():
+        nonlocal errors
+        while (i := next(counter)) < requests:
+            start = time.perf_counter()
+            try:
+                result = await scenario(ctx, i)
+                ok = result.ok
+                first = getattr(result, "first_response", None)
+                if first is not None:
+                    first_responses.append(first - start)
+            except Exception:
+                logging.getLogger("benchmark").exception("Scenario failed")
+                ok = False
+            latencies.append(time.perf_counter() - start)
+            errors += not ok
+
+    monitor = LoopLagMonitor()
+    monitor.start()
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    lag = sorted(await monitor.stop())
+
+    latencies.sort()
+    first_responses.sort()
+    return {
+        "throughput": requests / elapsed,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "first_p95": percentile(first_responses, 95),
+        "errors": errors,
+        "lag_p99": percentile(lag, 99),
+        "lag_max": lag[-1] if lag else 0.0,
+    }
+
+
+def ms(seconds):
+    return f"{seconds * 1000:7.1f}"
+
+
+async def load_test(args):
+    logging.getLogger("bot").setLevel(args.log_level)
+
+    stub = StubUpstream(
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        error_rate=0.0,
+        coins=args.coins,
+    )
+    await stub.start()
+    bot.http_client.rewrite = stub.rewrite
+    if not args.budgets:
+        # Budget per host asli (mis. Jikan 3/s) akan jadi bottleneck utama
+        bot.http_client.budgets = {}
+
+    ctx = LoadContext(stub, args)
+    try:
+        # Warm-up tanpa error injection, seperti bot yang sudah lama jalan
+        if not args.cold:
+            await ctx.warm_up()
+        stub.error_rate = args.error_rate
+
+        print(
+            f"Upstream stub {stub.base}: latency {args.latency:g}ms "
+            f"+ jitter {args.jitter:g}ms, error rate {args.error_rate:.0%}, "
+            f"Discord latency {args.discord_latency:g}ms"
+        )
+        print(
+            f"{'scenario':<11}{'conc':>5}{'req/s':>9}{'p50':>9}{'p95':>8}"
+            f"{'p99':>8}{'1st p95':>8}{'errors':>8}{'lag p99':>8}{'lag max':>8}"
+        )
+        for name in args.scenarios:
+            for concurrency in args.concurrency:
+                # Setiap level mulai dengan response cache kosong
+                bot.response_cache = bot.ResponseCache()
+                result = await run_level(
+                    ctx, LOAD_SCENARIOS[name], concurrency, args.requests
+                )
+                print(
+                    f"{name:<11}{concurrency:>5}{result['throughput']:9.1f}"
+                    f"{ms(result['p50']):>9}{ms(result['p95']):>8}"
+                    f"{ms(result['p99']):>8}{ms(result['first_p95']):>8}"
+                    f"{result['errors']:>8}{ms(result['lag_p99']):>8}"
+                    f"{ms(result['lag_max']):>8}"
+                )
+
+        total = sum(stub.requests.values())
+        print(f"Upstream requests: {total:,} ({stub.errors:,} injected errors)")
+    finally:
+        ctx.crypto.prices.close()
+        # Refill pool / revalidate cache yang masih jalan jangan sampai buka session baru
+        pending = asyncio.all_tasks() - {asyncio.current_task()}
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        await bot.http_client.close()
+        await stub.close()
+
+
+def run_load(args):
+    asyncio.run(load_test(args))
+
+
+def comma_list(cast):
+    def parse(value):
+        return [cast(item) for item in value.split(",") if item.strip()]
+
+    return parse
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    banner = subparsers.add_parser("banner", help="renders per second welcome banner")
+    banner.add_argument("--renders", type=int, default=200)
+    banner.set_defaults(func=run_banner)
+
+    load = subparsers.add_parser(
+        "load", help="load test command callback dengan Discord dan upstream palsu"
+    )
+    load.add_argument(
+        "--scenarios",
+        type=comma_list(str),
+        default=list(LOAD_SCENARIOS),
+        help=f"subset dari {','.join(LOAD_SCENARIOS)}",
+    )
+    load.add_argument("--concurrency", type=comma_list(int), default=[1, 10, 50])
+    load.add_argument("--requests", type=int, default=200, help="per level")
+    load.add_argument("--latency", type=float, default=50, help="upstream, ms")
+    load.add_argument("--jitter", type=float, default=20, help="ekor eksponensial, ms")
+    load.add_argument("--error-rate", type=float, default=0.0, help="0.0 - 1.0")
+    load.add_argument("--discord-latency", type=float, default=30, help="ms")
+    load.add_argument(
+        "--distinct", type=int, default=100, help="jumlah query unik per command"
+    )
+    load.add_argument("--coins", type=int, default=500, help="coin di stub CoinGecko")
+    load.add_argument(
+        "--budgets", action="store_true", help="pakai rate budget upstream asli"
+    )
+    load.add_argument(
+        "--cold", action="store_true", help="tanpa warm-up pool, coin index, ticker"
+    )
+    load.add_argument("--log-level", default="ERROR")
+    load.set_defaults(func=run_load)
+
+    args = parser.parse_args()
+    if args.func is run_load:
+        unknown = set(args.scenarios) - set(LOAD_SCENARIOS)
+        if unknown:
+            parser.error(f"unknown scenario: {', '.join(sorted(unknown))}")
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
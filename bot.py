@@ -1,147 +1,2130 @@
+import builtins
+import os
+import sys
+import time
+
+PROCESS_START = time.perf_counter()
+
+# STARTUP_PROFILE=true: laporkan waktu import per module (set di environment, bukan .env)
+STARTUP_PROFILE = os.getenv("STARTUP_PROFILE", "false").lower() == "true"
+import_timings = {}
+
+
+def profile_imports():
+    """Catat waktu import top-level, return fungsi untuk berhenti"""
+    original_import = builtins.__import__
+    depth = 0
+
+    def profiled_import(name, *args, **kwargs):
+        nonlocal depth
+        # Hanya import terluar yang dicatat, import di dalamnya ikut terhitung
+        if depth or name in sys.modules:
+            return original_import(name, *args, **kwargs)
+        depth += 1
+        start = time.perf_counter()
+        try:
+            return original_import(name, *args, **kwargs)
+        finally:
+            depth -= 1
+            import_timings[name] = time.perf_counter() - start
+
+    builtins.__import__ = profiled_import
+    return lambda: setattr(builtins, "__import__", original_import)
+
+
+if STARTUP_PROFILE:
+    stop_import_profile = profile_imports()
+
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
+import bisect
+import contextlib
+import contextvars
+import functools
+import hashlib
+import itertools
 import random
 import re
 import math
 import io
 import aiohttp
 import asyncio
+import atexit
 from datetime import datetime, timezone
+import email.utils
 import json
-import os
+import logging
+import logging.handlers
+import queue
+import signal
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import decimal
+from decimal import Decimal
+from fractions import Fraction
+from collections import Counter, OrderedDict, deque, namedtuple
+from urllib.parse import urlencode, urlsplit
 from dotenv import load_dotenv
 
 load_dotenv()
 
+
+# Logging: JSON lines ke bot.log lewat queue, supaya event loop tidak nunggu I/O
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FILE = os.getenv("LOG_FILE", "bot.log")
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(5 * 1024 * 1024)))
+LOG_BACKUPS = int(os.getenv("LOG_BACKUPS", "3"))
+LOG_CONSOLE = os.getenv("LOG_CONSOLE", "true").lower() == "true"
+# Event sukses yang sering (command/upstream OK) hanya dicatat sebagian
+LOG_SUCCESS_SAMPLE = float(os.getenv("LOG_SUCCESS_SAMPLE", "0.1"))
+LOG_FIELDS = (
+    "event",
+    "command",
+    "guild",
+    "user",
+    "upstream",
+    "status",
+    "latency_ms",
+    "sample_rate",
+    "cluster",
+)
+
+
+class JsonFormatter(logging.Formatter):
+    """Satu record jadi satu baris JSON"""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for field in LOG_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SuccessSampler(logging.Filter):
+    """Record dengan extra sample=True hanya diteruskan dengan probabilitas `rate`"""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        if getattr(record, "sample", False):
+            if random.random() >= self.rate:
+                return False
+            record.sample_rate = self.rate
+        return True
+
+
+def setup_logging():
+    """Pasang QueueHandler di root logger, handler file/console jalan di thread listener"""
+    cluster_id = os.getenv("CLUSTER_ID")
+    log_file = LOG_FILE
+    if cluster_id is not None:
+        # Tiap worker punya file sendiri, RotatingFileHandler tidak aman lintas proses
+        root, ext = os.path.splitext(LOG_FILE)
+        log_file = f"{root}.cluster{cluster_id}{ext}"
+
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8"
+    )
+    file_handler.setFormatter(JsonFormatter())
+    handlers = [file_handler]
+    if LOG_CONSOLE:
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(logging.Formatter("%(message)s"))
+        handlers.append(console_handler)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(SuccessSampler(LOG_SUCCESS_SAMPLE))
+    if cluster_id is not None:
+
+        def tag_cluster(record):
+            record.cluster = cluster_id
+            return True
+
+        queue_handler.addFilter(tag_cluster)
+
+    root_logger = logging.getLogger()
+    root_logger.setLevel(LOG_LEVEL)
+    root_logger.addHandler(queue_handler)
+
+    listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+# setup_logging() dipanggil dari __main__, jadi import bot (benchmark, test)
+# tidak membuka bot.log
+log = logging.getLogger("bot")
+
+
+def interaction_fields(interaction):
+    """Field log standar untuk satu interaction"""
+    command = interaction.command
+    return {
+        "command": command.qualified_name if command else None,
+        "guild": interaction.guild_id,
+        "user": interaction.user.id,
+    }
+
+
+# Metrics: counter + histogram in-process, diekspor format teks Prometheus
+METRICS_PORT = int(os.getenv("METRICS_PORT") or 0)  # opt-in, kosong/0 = endpoint mati
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class Histogram:
+    """Histogram bucket tetap (seperti Prometheus), quantile dihitung perkiraan"""
+
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(METRICS_BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(METRICS_BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for i, n in enumerate(self.counts):
+            if n and cumulative + n >= rank:
+                if i == len(METRICS_BUCKETS):
+                    return METRICS_BUCKETS[-1]
+                lower = METRICS_BUCKETS[i - 1] if i else 0
+                return lower + (METRICS_BUCKETS[i] - lower) * (rank - cumulative) / n
+            cumulative += n
+        return METRICS_BUCKETS[-1]
+
+
+def format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (
+        (
+            name,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+class Metrics:
+    """Registry metric berlabel; gauge diambil dari collector saat dirender"""
+
+    def __init__(self):
+        self.descriptions = {}
+        self.counters = {}  # nama -> Counter({labels: nilai})
+        self.histograms = {}  # nama -> {labels: Histogram}
+        self.collectors = []  # fungsi -> [(nama, deskripsi, [(labels dict, nilai)])]
+
+    def counter(self, name, description):
+        self.descriptions[name] = description
+        self.counters[name] = Counter()
+
+    def histogram(self, name, description):
+        self.descriptions[name] = description
+        self.histograms[name] = {}
+
+    def inc(self, name, amount=1, **labels):
+        self.counters[name][tuple(sorted(labels.items()))] += amount
+
+    def observe(self, name, value, **labels):
+        key = tuple(sorted(labels.items()))
+        series = self.histograms[name]
+        if key not in series:
+            series[key] = Histogram()
+        series[key].observe(value)
+
+    def series(self, name):
+        """{labels dict sebagai tuple: Histogram/nilai} untuk ringkasan /stats"""
+        return self.histograms.get(name) or self.counters.get(name) or {}
+
+    def render(self):
+        lines = []
+        for name, series in self.counters.items():
+            lines.append(f"# HELP {name} {self.descriptions[name]}")
+            lines.append(f"# TYPE {name} counter")
+            for labels, value in series.items():
+                lines.append(f"{name}{format_labels(labels)} {value}")
+        for name, series in self.histograms.items():
+            lines.append(f"# HELP {name} {self.descriptions[name]}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, histogram in series.items():
+                cumulative = 0
+                bounds = [str(bound) for bound in METRICS_BUCKETS] + ["+Inf"]
+                for bound, count in zip(bounds, histogram.counts):
+                    cumulative += count
+                    lines.append(
+                        f"{name}_bucket{format_labels(labels, [('le', bound)])} {cumulative}"
+                    )
+                lines.append(f"{name}_sum{format_labels(labels)} {histogram.sum}")
+                lines.append(f"{name}_count{format_labels(labels)} {histogram.count}")
+        for collector in self.collectors:
+            for name, description, samples in collector():
+                lines.append(f"# HELP {name} {description}")
+                lines.append(f"# TYPE {name} gauge")
+                for labels, value in samples:
+                    lines.append(
+                        f"{name}{format_labels(sorted(labels.items()))} {value}"
+                    )
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+metrics.counter("bot_commands_total", "Slash command per hasil (ok/error/rate_limited)")
+metrics.histogram("bot_command_seconds", "Durasi slash command sampai selesai")
+metrics.histogram(
+    "bot_command_first_response_seconds", "Waktu sampai response pertama (defer/kirim)"
+)
+metrics.histogram(
+    "bot_command_defer_to_followup_seconds", "Waktu dari defer sampai followup pertama"
+)
+metrics.histogram(
+    "bot_command_upstream_seconds", "Total waktu request upstream per command"
+)
+metrics.histogram("bot_command_discord_seconds", "Total waktu request ke API Discord")
+metrics.counter("bot_upstream_requests_total", "Request ke API eksternal per hasil")
+metrics.histogram("bot_upstream_seconds", "Latency request ke API eksternal")
+metrics.counter("bot_cache_lookups_total", "Lookup response cache (hit/stale/miss)")
+metrics.counter(
+    "bot_provider_requests_total", "Percobaan provider meme/quote per hasil"
+)
+metrics.histogram("bot_provider_seconds", "Latency percobaan provider meme/quote")
+metrics.counter(
+    "bot_welcome_total", "Welcome message (sent) dan member yang digabung/di-drop"
+)
+metrics.counter(
+    "bot_singleflight_coalesced_total",
+    "Request yang ikut call upstream yang sedang jalan",
+)
+
+
+class CommandTrace:
+    """Timing satu slash command, dibawa lewat contextvar selama task interaction"""
+
+    __slots__ = (
+        "command",
+        "start",
+        "upstream",
+        "discord",
+        "responded",
+        "followup",
+        "failed",
+    )
+
+    def __init__(self, command):
+        self.command = command
+        self.start = time.perf_counter()
+        self.upstream = 0.0
+        self.discord = 0.0
+        self.responded = None
+        self.followup = None
+        self.failed = False
+
+
+command_trace = contextvars.ContextVar("command_trace", default=None)
+
+
+def current_command():
+    trace = command_trace.get()
+    return trace.command if trace is not None else "background"
+
+
+def finish_command(trace, outcome):
+    command = trace.command
+    metrics.inc("bot_commands_total", command=command, outcome=outcome)
+    metrics.observe(
+        "bot_command_seconds", time.perf_counter() - trace.start, command=command
+    )
+    metrics.observe("bot_command_upstream_seconds", trace.upstream, command=command)
+    metrics.observe("bot_command_discord_seconds", trace.discord, command=command)
+    if trace.responded is not None:
+        metrics.observe(
+            "bot_command_first_response_seconds",
+            trace.responded - trace.start,
+            command=command,
+        )
+        if trace.followup is not None:
+            metrics.observe(
+                "bot_command_defer_to_followup_seconds",
+                trace.followup - trace.responded,
+                command=command,
+            )
+
+
+def mark_command_failure(record):
+    # Command yang menangkap error sendiri tetap dihitung gagal kalau log ERROR
+    if record.levelno >= logging.ERROR:
+        trace = command_trace.get()
+        if trace is not None:
+            trace.failed = True
+    return True
+
+
+log.addFilter(mark_command_failure)
+
+
+async def on_discord_request_start(session, context, params):
+    context.start = time.perf_counter()
+
+
+async def on_discord_request_end(session, context, params):
+    trace = command_trace.get()
+    if trace is None:
+        return
+    now = time.perf_counter()
+    trace.discord += now - context.start
+    path = params.url.path
+    # POST .../callback = defer/response pertama, webhooks/... = followup
+    if path.endswith("/callback"):
+        if trace.responded is None:
+            trace.responded = now
+    elif "/webhooks/" in path and trace.followup is None:
+        trace.followup = now
+
+
+# Dipasang sebagai http_trace discord.py untuk mengukur waktu request ke Discord
+discord_trace = aiohttp.TraceConfig()
+discord_trace.on_request_start.append(on_discord_request_start)
+discord_trace.on_request_end.append(on_discord_request_end)
+
+
+class MetricsServer:
+    """Endpoint /metrics lokal untuk Prometheus"""
+
+    def __init__(self, host=METRICS_HOST, port=METRICS_PORT):
+        self.host = host
+        self.port = port
+        self.runner = None
+
+    async def start(self):
+        # aiohttp.web cuma di-import kalau endpoint dipakai
+        from aiohttp import web
+
+        async def handle(request):
+            return web.Response(
+                text=metrics.render(), content_type="text/plain", charset="utf-8"
+            )
+
+        app = web.Application()
+        app.router.add_get("/metrics", handle)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, self.host, self.port).start()
+        log.info("📈 Metrics di http://%s:%d/metrics", self.host, self.port)
+
+    async def close(self):
+        if self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
+
+
+# Di cluster mode tiap worker pakai port sendiri: METRICS_PORT + CLUSTER_ID
+metrics_server = MetricsServer(
+    port=METRICS_PORT + int(os.getenv("CLUSTER_ID") or 0) if METRICS_PORT else 0
+)
+
+
+# HTTP client bersama untuk semua command (connection pool + DNS cache)
+HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "10"))
+HTTP_DNS_CACHE_TTL = int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))
+HTTP_DEFAULT_TIMEOUT = float(os.getenv("HTTP_DEFAULT_TIMEOUT", "10"))
+
+# Timeout (detik) per upstream, sesuai karakter masing-masing API
+UPSTREAM_TIMEOUTS = {
+    "meme-api.com": 5,
+    "api.imgflip.com": 5,
+    "some-random-api.ml": 5,
+    "api.jikan.moe": 10,
+    "api.quotable.io": 5,
+    "zenquotes.io": 5,
+    "catfact.ninja": 5,
+    "api.openweathermap.org": 8,
+    "dog.ceo": 5,
+    "api.coingecko.com": 10,
+}
+
+# Budget request per upstream: daftar (jumlah, per detik) sesuai limit yang dipublikasikan
+UPSTREAM_BUDGETS = {
+    "api.jikan.moe": [(3, 1), (60, 60)],
+    "api.coingecko.com": [(30, 60)],
+    "api.openweathermap.org": [(60, 60)],
+    "meme-api.com": [(5, 1)],
+    "api.imgflip.com": [(5, 1)],
+    "some-random-api.ml": [(5, 1)],
+    "api.quotable.io": [(3, 1), (180, 60)],
+    "zenquotes.io": [(5, 30)],
+    "catfact.ninja": [(5, 1)],
+    "dog.ceo": [(10, 1)],
+}
+# Kalau harus antri lebih lama dari ini, langsung gagal daripada bikin command nunggu
+HTTP_MAX_PACING_WAIT = float(os.getenv("HTTP_MAX_PACING_WAIT", "3"))
+HTTP_MAX_RETRY_AFTER = float(os.getenv("HTTP_MAX_RETRY_AFTER", "300"))
+BREAKER_FAILURES = int(os.getenv("BREAKER_FAILURES", "5"))
+BREAKER_COOLDOWN = float(os.getenv("BREAKER_COOLDOWN", "30"))
+
+
+class UpstreamUnavailable(aiohttp.ClientError):
+    """Request tidak dikirim karena circuit breaker terbuka atau budget upstream habis"""
+
+    def __init__(self, host, retry_after, reason):
+        super().__init__(f"{host} unavailable ({reason}), retry in {retry_after:.0f}s")
+        self.host = host
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+def parse_retry_after(value, default=5):
+    """Header Retry-After bisa berupa detik atau HTTP date"""
+    if not value:
+        return default
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            when = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return default
+        seconds = (when - datetime.now(timezone.utc)).total_seconds()
+    return min(max(seconds, 0), HTTP_MAX_RETRY_AFTER)
+
+
+class HostPacer:
+    """Token bucket per upstream, request diberi jarak supaya tidak melewati budget"""
+
+    def __init__(self, host, budgets, max_wait=HTTP_MAX_PACING_WAIT):
+        self.host = host
+        self.budgets = budgets
+        self.max_wait = max_wait
+        self.tokens = [capacity for capacity, per in budgets]
+        self.updated = time.monotonic()
+        self.paused_until = 0
+        self.waited = 0.0
+
+    def refill(self, now):
+        elapsed = now - self.updated
+        self.updated = now
+        self.tokens = [
+            min(capacity, tokens + elapsed * capacity / per)
+            for tokens, (capacity, per) in zip(self.tokens, self.budgets)
+        ]
+
+    def delay(self, now):
+        """Detik sampai semua bucket punya satu token (dan pause Retry-After lewat)"""
+        self.refill(now)
+        wait = max(self.paused_until - now, 0)
+        for tokens, (capacity, per) in zip(self.tokens, self.budgets):
+            if tokens < 1:
+                wait = max(wait, (1 - tokens) * per / capacity)
+        return wait
+
+    async def acquire(self):
+        # Token dipesan di depan (bucket boleh minus) lalu sleep tanpa antri lock,
+        # jadi caller berikutnya langsung tahu total antriannya dan bisa fail fast
+        now = time.monotonic()
+        wait = self.delay(now)
+        if wait > self.max_wait:
+            reason = "retry-after" if self.paused_until > now else "budget"
+            raise UpstreamUnavailable(self.host, wait, reason)
+        self.tokens = [tokens - 1 for tokens in self.tokens]
+        if wait > 0:
+            self.waited += wait
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                # Slot yang batal dikembalikan ke bucket
+                self.tokens = [
+                    min(capacity, tokens + 1)
+                    for tokens, (capacity, per) in zip(self.tokens, self.budgets)
+                ]
+                raise
+
+    def pause(self, seconds):
+        """Dipanggil saat upstream balas 429"""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+class CircuitBreaker:
+    """closed -> open setelah N kegagalan beruntun -> half-open (satu probe) -> closed"""
+
+    def __init__(self, host, failures=BREAKER_FAILURES, cooldown=BREAKER_COOLDOWN):
+        self.host = host
+        self.threshold = failures
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.rejected = 0
+        self.trips = 0
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.cooldown:
+            return "open"
+        return "half-open"
+
+    def check(self):
+        """Raise kalau request tidak boleh dikirim sekarang, return True untuk probe"""
+        state = self.state
+        if state == "closed":
+            return False
+        if state == "half-open" and not self.probing:
+            self.probing = True
+            return True
+        self.rejected += 1
+        retry_after = max(self.opened_at + self.cooldown - time.monotonic(), 0)
+        raise UpstreamUnavailable(self.host, retry_after, "circuit open")
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.probing or self.failures >= self.threshold:
+            if self.opened_at is None or self.probing:
+                self.trips += 1
+            self.opened_at = time.monotonic()
+        self.probing = False
+
+
+class HTTPClient:
+    """Satu aiohttp session untuk seluruh bot, dibuat saat startup dan ditutup saat shutdown"""
+
+    def __init__(
+        self,
+        limit=HTTP_POOL_LIMIT,
+        limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+        dns_cache_ttl=HTTP_DNS_CACHE_TTL,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        timeouts=None,
+        default_timeout=HTTP_DEFAULT_TIMEOUT,
+        budgets=None,
+        rewrite=None,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.default_timeout = aiohttp.ClientTimeout(total=default_timeout)
+        self.timeouts = {
+            host: aiohttp.ClientTimeout(total=seconds)
+            for host, seconds in (timeouts or {}).items()
+        }
+        self.budgets = budgets or {}
+        # url -> url, dipakai benchmark untuk mengarahkan upstream ke server stub
+        self.rewrite = rewrite
+        self.pacers = {}
+        self.breakers = {}
+        self.session = None
+
+    async def start(self):
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector, timeout=self.default_timeout
+            )
+
+    async def close(self):
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    def timeout_for(self, url):
+        host = urlsplit(url).hostname
+        return self.timeouts.get(host, self.default_timeout)
+
+    def guards_for(self, host):
+        """Pacer (bisa None kalau host tidak punya budget) dan breaker untuk satu host"""
+        if host not in self.breakers:
+            self.breakers[host] = CircuitBreaker(host)
+            if host in self.budgets:
+                self.pacers[host] = HostPacer(host, self.budgets[host])
+        return self.pacers.get(host), self.breakers[host]
+
+    async def get_json(self, url, params=None, headers=None):
+        """GET ke upstream, return JSON kalau status 200 dan None kalau tidak
+
+        Raise UpstreamUnavailable tanpa mengirim request kalau breaker host terbuka
+        atau budget host habis.
+        """
+        await self.start()
+        host = urlsplit(url).hostname
+        pacer, breaker = self.guards_for(host)
+        try:
+            probe = breaker.check()
+        except UpstreamUnavailable:
+            metrics.inc(
+                "bot_upstream_requests_total", upstream=host, outcome="rejected"
+            )
+            raise
+        start = None
+        outcome = "error"
+        # Query string tidak ikut dicatat (bisa berisi API key)
+        endpoint = url.split("?", 1)[0]
+        fields = {"event": "upstream", "upstream": host}
+        try:
+            if pacer is not None:
+                await pacer.acquire()
+            timeout = self.timeout_for(url)
+            if self.rewrite is not None:
+                url = self.rewrite(url)
+            start = time.perf_counter()
+            async with self.session.get(
+                url, params=params, headers=headers, timeout=timeout
+            ) as response:
+                fields["status"] = response.status
+                fields["latency_ms"] = round((time.perf_counter() - start) * 1000)
+                outcome = f"http_{response.status // 100}xx"
+                if response.status == 429:
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    if pacer is not None:
+                        pacer.pause(retry_after)
+                    breaker.record_failure()
+                    log.warning(
+                        "API Error: Status 429 for %s, retry in %.0fs",
+                        endpoint,
+                        retry_after,
+                        extra=fields,
+                    )
+                    return None
+                if response.status >= 500:
+                    breaker.record_failure()
+                    log.warning(
+                        "API Error: Status %s for %s",
+                        response.status,
+                        endpoint,
+                        extra=fields,
+                    )
+                    return None
+                if response.status != 200:
+                    breaker.record_success()
+                    log.warning(
+                        "API Error: Status %s for %s",
+                        response.status,
+                        endpoint,
+                        extra=fields,
+                    )
+                    return None
+                data = await response.json()
+                breaker.record_success()
+                log.info("API OK: %s", endpoint, extra=dict(fields, sample=True))
+                outcome = "ok"
+                return data
+        except UpstreamUnavailable:
+            outcome = "rejected"
+            raise
+        except asyncio.CancelledError:
+            # Mis. kalah hedge provider: bukan kesalahan upstream
+            outcome = "cancelled"
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            breaker.record_failure()
+            fields["latency_ms"] = round((time.perf_counter() - start) * 1000)
+            log.warning("API request failed: %s", endpoint, exc_info=True, extra=fields)
+            raise
+        finally:
+            # Probe half-open yang di-cancel tidak boleh mengunci breaker
+            if probe:
+                breaker.probing = False
+            self.record(host, start, outcome)
+
+    def record(self, host, start, outcome):
+        metrics.inc("bot_upstream_requests_total", upstream=host, outcome=outcome)
+        if start is None:
+            return
+        elapsed = time.perf_counter() - start
+        metrics.observe("bot_upstream_seconds", elapsed, upstream=host)
+        trace = command_trace.get()
+        if trace is not None:
+            trace.upstream += elapsed
+
+    def stats(self):
+        return {
+            host: {
+                "state": breaker.state,
+                "failures": breaker.failures,
+                "trips": breaker.trips,
+                "rejected": breaker.rejected,
+                "paced_seconds": round(getattr(self.pacers.get(host), "waited", 0), 1),
+            }
+            for host, breaker in self.breakers.items()
+        }
+
+
+http_client = HTTPClient(timeouts=UPSTREAM_TIMEOUTS, budgets=UPSTREAM_BUDGETS)
+
+
+# Cache response API: (fresh TTL, stale TTL) dalam detik per endpoint
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "2048"))
+CACHE_POLICIES = {
+    "crypto_price": (30, 60),
+    "crypto_search": (3600, 86400),
+    "weather": (600, 600),
+    "anime": (86400, 86400),
+}
+
+
+def cache_key(url, params=None):
+    """Normalisasi request jadi key (query upstream kita semua case-insensitive)"""
+    key = url
+    if params:
+        key += "?" + urlencode(sorted(params.items()))
+    return " ".join(key.lower().split())
+
+
+class ResponseCache:
+    """LRU cache dengan TTL per policy, serve data stale sambil revalidate di background"""
+
+    def __init__(self, maxsize=RESPONSE_CACHE_SIZE, policies=CACHE_POLICIES):
+        self.maxsize = maxsize
+        self.policies = policies
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._tasks = set()
+        self.hits = Counter()
+        self.stale_hits = Counter()
+        self.misses = Counter()
+
+    async def get_or_fetch(self, key, fetcher, policy):
+        fresh_ttl, stale_ttl = self.policies[policy]
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            value, expires_at = entry
+            now = time.monotonic()
+            if now < expires_at:
+                self.hits[policy] += 1
+                self.record(policy, "hit")
+                self._entries.move_to_end(key)
+                return value
+            if now < expires_at + stale_ttl:
+                # Data basi tapi masih boleh dipakai, refresh di background
+                self.stale_hits[policy] += 1
+                self.record(policy, "stale")
+                self._entries.move_to_end(key)
+                self._revalidate(key, fetcher, fresh_ttl, policy)
+                return value
+            del self._entries[key]
+
+        self.misses[policy] += 1
+        self.record(policy, "miss")
+        value = await fetcher()
+        self.set(key, value, fresh_ttl)
+        return value
+
+    def record(self, policy, result):
+        metrics.inc(
+            "bot_cache_lookups_total",
+            policy=policy,
+            command=current_command(),
+            result=result,
+        )
+
+    def set(self, key, value, ttl):
+        # Jangan cache response gagal
+        if value is None:
+            return
+        self._entries[key] = (value, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _revalidate(self, key, fetcher, ttl, policy):
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        # Context kosong: waktu refresh bukan milik command yang kebetulan memicunya
+        task = asyncio.create_task(
+            self._refresh(key, fetcher, ttl, policy), context=contextvars.Context()
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refresh(self, key, fetcher, ttl, policy):
+        try:
+            self.set(key, await fetcher(), ttl)
+        except Exception as e:
+            # Key cache berisi URL lengkap (termasuk API key), jangan dicatat
+            log.warning(
+                "Cache refresh error for %s: %s",
+                policy,
+                type(e).__name__,
+                extra={"event": "cache"},
+            )
+        finally:
+            self._refreshing.discard(key)
+
+    def stats(self):
+        hits = sum(self.hits.values()) + sum(self.stale_hits.values())
+        misses = sum(self.misses.values())
+        total = hits + misses
+        return {
+            "size": len(self._entries),
+            "hits": hits,
+            "stale_hits": sum(self.stale_hits.values()),
+            "misses": misses,
+            "hit_ratio": hits / total if total else 0.0,
+        }
+
+
+response_cache = ResponseCache()
+
+
+class SingleFlight:
+    """Gabungkan request identik yang sedang berjalan jadi satu call ke upstream"""
+
+    def __init__(self):
+        self._inflight = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def do(self, key, fn):
+        task = self._inflight.get(key)
+        if task is None:
+            self.started += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+        else:
+            self.coalesced += 1
+            metrics.inc("bot_singleflight_coalesced_total", command=current_command())
+        # shield: caller yang di-cancel tidak ikut membatalkan caller lain
+        return await asyncio.shield(task)
+
+    def _finish(self, key, task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Tandai exception sudah diambil walaupun semua caller sudah cancel
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self):
+        return {
+            "inflight": len(self._inflight),
+            "started": self.started,
+            "coalesced": self.coalesced,
+        }
+
+
+single_flight = SingleFlight()
+
+
+async def fetch_json(url, params=None, headers=None, policy=None):
+    """Fetch JSON dari upstream, lewat response cache kalau endpoint punya policy"""
+
+    async def fetcher():
+        return await http_client.get_json(url, params=params, headers=headers)
+
+    if policy is None:
+        # Endpoint random (meme, dog, dll) tidak boleh di-cache atau digabung
+        return await fetcher()
+
+    key = cache_key(url, params)
+
+    async def coalesced_fetcher():
+        return await single_flight.do(key, fetcher)
+
+    return await response_cache.get_or_fetch(key, coalesced_fetcher, policy)
+
+
+# Mode member cache: full (default discord.py) atau lean (LRU + idle timeout)
+# Di mode lean hanya member yang baru join (atau hasil chunk) yang masuk cache;
+# member yang cuma pakai command tidak ditambahkan, hanya diperpanjang kalau sudah ada
+MEMBER_CACHE_MODE = os.getenv("MEMBER_CACHE_MODE", "full").lower()
+MEMBER_CACHE_MAX = int(os.getenv("MEMBER_CACHE_MAX", "5000"))
+MEMBER_CACHE_IDLE = float(os.getenv("MEMBER_CACHE_IDLE", "1800"))
+MEMBER_CACHE_SWEEP = float(os.getenv("MEMBER_CACHE_SWEEP", "60"))
+# Guild._remove_member itu internal discord.py 2.x, versi lain: tidak di-evict
+CAN_EVICT_MEMBERS = discord.version_info.major == 2 and hasattr(
+    discord.Guild, "_remove_member"
+)
+
+
+class MemberCacheManager:
+    """Batasi member cache (mode lean): member yang sudah di-cache dibuang saat idle"""
+
+    def __init__(self, max_size=MEMBER_CACHE_MAX, idle_timeout=MEMBER_CACHE_IDLE):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self._seen = OrderedDict()
+        self.evicted = 0
+
+    def touch(self, member):
+        key = (member.guild.id, member.id)
+        self._seen[key] = time.monotonic()
+        self._seen.move_to_end(key)
+
+    def evict(self, client):
+        now = time.monotonic()
+        while self._seen:
+            key, last_seen = next(iter(self._seen.items()))
+            if len(self._seen) <= self.max_size and now - last_seen < self.idle_timeout:
+                break
+            del self._seen[key]
+
+            guild_id, member_id = key
+            guild = client.get_guild(guild_id)
+            if guild is None or member_id == client.user.id:
+                continue
+            member = guild.get_member(member_id)
+            if member is not None and CAN_EVICT_MEMBERS:
+                # discord.py tidak punya API publik untuk evict satu member
+                guild._remove_member(member)
+                self.evicted += 1
+
+
+member_cache = MemberCacheManager()
+
+
+# Rate limit per user sesuai aturan di README: (kapasitas, per detik)
+RATE_LIMIT_POLICIES = {
+    "cooldown": (1, 3),
+    "general": (10, 60),
+    "api": (5, 60),
+    "meme": (1, 10),
+    "crypto": (1, 5),
+    "weather": (1, 10),
+    "animeinfo": (1, 5),
+}
+RATE_LIMIT_POLICIES.update(json.loads(os.getenv("RATE_LIMITS", "{}")))
+API_COMMANDS = {"meme", "animeinfo", "quote", "catfact", "dog", "weather", "crypto"}
+RATE_LIMIT_BACKEND = os.getenv(
+    "RATE_LIMIT_BACKEND", "memory"
+).lower()  # memory / sqlite
+RATE_LIMIT_DB = os.getenv("RATE_LIMIT_DB", "ratelimit.sqlite3")
+RATE_LIMIT_SWEEP = 60
+
+# Penalti spam: strike hilang setelah STRIKE_TTL detik tanpa pelanggaran
+STRIKE_TTL = 300
+COOLDOWN_STRIKES, COOLDOWN_SECONDS = 3, 60
+BLACKLIST_STRIKES, BLACKLIST_SECONDS = 6, 300
+
+
+def refill_bucket(state, capacity, per, now):
+    """Jumlah token sekarang dari state (tokens, updated) terakhir"""
+    if state is None:
+        return capacity
+    tokens, updated = state
+    return min(capacity, tokens + (now - updated) * capacity / per)
+
+
+class MemoryRateLimitBackend:
+    """State rate limit di memory proses ini"""
+
+    blocking = False
+
+    def __init__(self):
+        self.buckets = {}
+        self.penalties = {}
+        self.last_sweep = 0
+
+    def acquire(self, buckets, now):
+        """Ambil satu token dari semua bucket, return 0 atau detik sampai boleh lagi"""
+        self.sweep(now)
+        states = []
+        retry_after = 0
+        for key, capacity, per in buckets:
+            entry = self.buckets.get(key)
+            tokens = refill_bucket(entry and entry[:2], capacity, per, now)
+            if tokens < 1:
+                retry_after = max(retry_after, (1 - tokens) * per / capacity)
+            states.append((key, tokens, per))
+
+        if not retry_after:
+            # Setelah `per` detik bucket pasti penuh lagi, jadi boleh dibuang
+            for key, tokens, per in states:
+                self.buckets[key] = (tokens - 1, now, now + per)
+        return retry_after
+
+    def get_penalty(self, key, now):
+        entry = self.penalties.get(key)
+        if entry is None or entry[2] < now:
+            return 0, 0
+        return entry[0], entry[1]
+
+    def set_penalty(self, key, strikes, blocked_until, expires):
+        self.penalties[key] = (strikes, blocked_until, expires)
+
+    def sweep(self, now):
+        if now - self.last_sweep < RATE_LIMIT_SWEEP:
+            return
+        self.last_sweep = now
+        for table in (self.buckets, self.penalties):
+            for key in [key for key, entry in table.items() if entry[2] < now]:
+                del table[key]
+
+
+class SQLiteRateLimitBackend(MemoryRateLimitBackend):
+    """State rate limit di file SQLite lokal, dipakai bersama oleh proses cluster"""
+
+    blocking = True
+
+    def __init__(self, path=RATE_LIMIT_DB):
+        super().__init__()
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(
+            path, timeout=5, isolation_level=None, check_same_thread=False
+        )
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets "
+            "(key TEXT PRIMARY KEY, tokens REAL, updated REAL, expires REAL)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS penalties "
+            "(key TEXT PRIMARY KEY, strikes INTEGER, blocked_until REAL, expires REAL)"
+        )
+
+    @contextlib.contextmanager
+    def transaction(self):
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    def acquire(self, buckets, now):
+        self.sweep(now)
+        with self.transaction() as conn:
+            states = []
+            retry_after = 0
+            for key, capacity, per in buckets:
+                row = conn.execute(
+                    "SELECT tokens, updated FROM buckets WHERE key = ?", (key,)
+                ).fetchone()
+                tokens = refill_bucket(row, capacity, per, now)
+                if tokens < 1:
+                    retry_after = max(retry_after, (1 - tokens) * per / capacity)
+                states.append((key, tokens, per))
+
+            if not retry_after:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO buckets VALUES (?, ?, ?, ?)",
+                    [(key, tokens - 1, now, now + per) for key, tokens, per in states],
+                )
+        return retry_after
+
+    def get_penalty(self, key, now):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT strikes, blocked_until FROM penalties "
+                "WHERE key = ? AND expires >= ?",
+                (key, now),
+            ).fetchone()
+        return row or (0, 0)
+
+    def set_penalty(self, key, strikes, blocked_until, expires):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO penalties VALUES (?, ?, ?, ?)",
+                (key, strikes, blocked_until, expires),
+            )
+
+    def sweep(self, now):
+        if now - self.last_sweep < RATE_LIMIT_SWEEP:
+            return
+        self.last_sweep = now
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM buckets WHERE expires < ?", (now,))
+            conn.execute("DELETE FROM penalties WHERE expires < ?", (now,))
+
+
+RateLimitDecision = namedtuple("RateLimitDecision", "allowed retry_after penalty")
+
+
+class RateLimiter:
+    """Token bucket per user + per command, dengan penalti bertingkat untuk spam"""
+
+    def __init__(
+        self, backend, policies=RATE_LIMIT_POLICIES, api_commands=API_COMMANDS
+    ):
+        self.backend = backend
+        self.policies = policies
+        self.api_commands = api_commands
+        self.allowed = 0
+        self.limited = 0
+
+    def buckets_for(self, user_id, command):
+        names = ["cooldown", "api" if command in self.api_commands else "general"]
+        if command in self.policies:
+            names.append(command)
+        return [
+            (f"{name}:{user_id}", *self.policies[name])
+            for name in names
+            if name in self.policies
+        ]
+
+    async def check(self, user_id, command):
+        if self.backend.blocking:
+            decision = await asyncio.to_thread(self._check, user_id, command)
+        else:
+            decision = self._check(user_id, command)
+        if decision.allowed:
+            self.allowed += 1
+        else:
+            self.limited += 1
+        return decision
+
+    def _check(self, user_id, command):
+        now = time.time()
+        penalty_key = f"penalty:{user_id}"
+        strikes, blocked_until = self.backend.get_penalty(penalty_key, now)
+        if blocked_until > now:
+            penalty = "blacklist" if strikes >= BLACKLIST_STRIKES else "cooldown"
+            return RateLimitDecision(False, blocked_until - now, penalty)
+
+        retry_after = self.backend.acquire(self.buckets_for(user_id, command), now)
+        if not retry_after:
+            return RateLimitDecision(True, 0, None)
+
+        # Pelanggaran: tambah strike lalu tentukan penalti
+        strikes += 1
+        penalty = "warning"
+        blocked_until = 0
+        if strikes >= BLACKLIST_STRIKES:
+            penalty, blocked_until = "blacklist", now + BLACKLIST_SECONDS
+        elif strikes >= COOLDOWN_STRIKES:
+            penalty, blocked_until = "cooldown", now + COOLDOWN_SECONDS
+        self.backend.set_penalty(
+            penalty_key, strikes, blocked_until, max(blocked_until, now) + STRIKE_TTL
+        )
+        retry_after = max(retry_after, blocked_until - now)
+        return RateLimitDecision(False, retry_after, penalty)
+
+
+if RATE_LIMIT_BACKEND == "sqlite":
+    rate_limiter = RateLimiter(SQLiteRateLimitBackend())
+else:
+    rate_limiter = RateLimiter(MemoryRateLimitBackend())
+
+
+class RateLimitedTree(app_commands.CommandTree):
+    """Command tree yang menerapkan rate limiter ke semua slash command
+
+    Sekaligus titik awal metrics: trace di-set di sini (task yang sama dengan
+    invoke command) dan ditutup di on_app_command_completion / on_error.
+    """
+
+    async def interaction_check(self, interaction: discord.Interaction):
+        # Autocomplete tidak dihitung sebagai pemakaian command
+        if interaction.type != discord.InteractionType.application_command:
+            return True
+
+        command = interaction.command
+        name = command.qualified_name if command else "unknown"
+        decision = await rate_limiter.check(interaction.user.id, name)
+        if decision.allowed:
+            command_trace.set(CommandTrace(name))
+            return True
+
+        metrics.inc("bot_commands_total", command=name, outcome="rate_limited")
+
+        wait = math.ceil(decision.retry_after)
+        if decision.penalty == "blacklist":
+            embed = discord.Embed(
+                title="🚫 Diblokir Sementara",
+                description=f"Kamu diblokir sementara karena spam berlebihan. Coba lagi dalam **{wait}s**.",
+                color=0xFF0000,
+            )
+        elif decision.penalty == "cooldown":
+            embed = discord.Embed(
+                title="⏳ Cooldown",
+                description=f"Kamu terkena cooldown karena spam. Coba lagi dalam **{wait}s**.",
+                color=0xFFA500,
+            )
+        else:
+            embed = discord.Embed(
+                title="⚠️ Pelan-pelan!",
+                description=f"Kamu terlalu cepat menjalankan command. Coba lagi dalam **{wait}s**.",
+                color=0xFFFF00,
+            )
+            embed.add_field(
+                name="💡 Info",
+                value="Spam berulang akan dikenai cooldown 1 menit, lalu blokir 5 menit.",
+                inline=False,
+            )
+
+        try:
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+        except discord.HTTPException:
+            pass
+        return False
+
+    async def on_error(self, interaction: discord.Interaction, error):
+        trace = command_trace.get()
+        if trace is not None:
+            finish_command(trace, "error")
+        await super().on_error(interaction, error)
+
+
+# Cluster mode: supervisor menjalankan beberapa worker, tiap worker satu range shard
+CLUSTER_WORKERS = int(os.getenv("CLUSTER_WORKERS", "0"))
+CLUSTER_ID = os.getenv("CLUSTER_ID")
+CLUSTER_STATUS_DIR = os.getenv("CLUSTER_STATUS_DIR", ".cluster")
+CLUSTER_STATUS_INTERVAL = float(os.getenv("CLUSTER_STATUS_INTERVAL", "30"))
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "0")) or None
+SHARD_IDS = [int(i) for i in os.getenv("SHARD_IDS", "").split(",") if i] or None
+
+BotBase = commands.AutoShardedBot if SHARD_COUNT else commands.Bot
+
+
+# Slash command hanya di-sync kalau schema berubah dari hash yang tersimpan
+COMMAND_HASH_FILE = os.getenv("COMMAND_HASH_FILE", ".command_tree_hash")
+FORCE_COMMAND_SYNC = os.getenv("FORCE_COMMAND_SYNC", "false").lower() == "true"
+
+startup_timings = {}
+
+
+@contextlib.contextmanager
+def startup_phase(name):
+    """Catat durasi satu fase startup"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        startup_timings[name] = time.perf_counter() - start
+
+
+def report_startup():
+    phases = ", ".join(
+        f"{name} {seconds * 1000:.0f}ms" for name, seconds in startup_timings.items()
+    )
+    log.info("⏱️ Startup: %s", phases, extra={"event": "startup"})
+
+    if STARTUP_PROFILE:
+        slowest = sorted(import_timings.items(), key=lambda item: -item[1])
+        for name, seconds in slowest[:15]:
+            log.info("   import %s: %.1fms", name, seconds * 1000)
+
+
+def command_tree_hash(client):
+    payload = {
+        "application_id": client.application_id,
+        "commands": [
+            command.to_dict(client.tree) for command in client.tree.get_commands()
+        ],
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+async def sync_command_tree(client):
+    # Di cluster mode cukup satu worker yang sync (command global)
+    if CLUSTER_ID not in (None, "0"):
+        return
+
+    digest = command_tree_hash(client)
+    try:
+        with open(COMMAND_HASH_FILE) as f:
+            stored = f.read().strip()
+    except OSError:
+        stored = None
+
+    if digest == stored and not FORCE_COMMAND_SYNC:
+        log.info("✅ Slash commands unchanged, skipping sync.")
+        return
+
+    synced = await client.tree.sync()
+    with open(COMMAND_HASH_FILE, "w") as f:
+        f.write(digest)
+    log.info("✅ Synced %d slash commands.", len(synced))
+
+
+class DiscordBot(BotBase):
+    async def setup_hook(self):
+        # Dipanggil sekali sebelum gateway connect, tidak terulang saat reconnect.
+        # HTTP client dan banner renderer dibuat saat pertama dipakai.
+        with startup_phase("cogs"):
+            await setup_crypto_commands(self)
+
+        if metrics_server.port:
+            try:
+                await metrics_server.start()
+            except OSError as e:
+                log.warning("Metrics endpoint tidak bisa dibuka: %s", e)
+
+        # Sync jalan di background supaya gateway bisa connect secepatnya
+        self.sync_task = asyncio.create_task(self.sync_commands_in_background())
+
+        # Pool konten mulai diisi di background, command tetap jalan walau kosong
+        refill_content_pools.start()
+        if MEMBER_CACHE_MODE == "lean":
+            if not CAN_EVICT_MEMBERS:
+                log.warning(
+                    "discord.py %s tidak punya Guild._remove_member, "
+                    "member cache lean tidak di-evict",
+                    discord.__version__,
+                )
+            evict_idle_members.start()
+        if CLUSTER_ID is not None:
+            report_cluster_status.start()
+
+    async def sync_commands_in_background(self):
+        try:
+            with startup_phase("command_sync"):
+                await sync_command_tree(self)
+        except Exception as e:
+            log.exception("Error syncing slash commands: %s", e)
+
+    async def close(self):
+        await super().close()
+        await http_client.close()
+        await metrics_server.close()
+        banner_renderer.close()
+
+
 # Bot setup dengan intents
 intents = discord.Intents.default()
 intents.message_content = True
 intents.members = True
 intents.guilds = True
+# Presence itu privileged intent (harus diaktifkan juga di Developer Portal);
+# tanpa ini semua member terlihat offline, jadi jumlah online tidak ditampilkan
+PRESENCE_INTENT = os.getenv("PRESENCE_INTENT", "false").lower() == "true"
+intents.presences = PRESENCE_INTENT
+
+bot_options = {}
+if MEMBER_CACHE_MODE == "lean":
+    # Hanya cache member yang join; guild di-chunk saat pertama dibutuhkan
+    member_cache_flags = discord.MemberCacheFlags.none()
+    member_cache_flags.joined = True
+    bot_options.update(
+        member_cache_flags=member_cache_flags, chunk_guilds_at_startup=False
+    )
+if SHARD_COUNT:
+    bot_options.update(shard_count=SHARD_COUNT, shard_ids=SHARD_IDS)
+
+bot = DiscordBot(
+    command_prefix="!",
+    intents=intents,
+    tree_cls=RateLimitedTree,
+    http_trace=discord_trace,
+    **bot_options,
+)
 
-bot = commands.Bot(command_prefix="!", intents=intents)
 
+@tasks.loop(seconds=MEMBER_CACHE_SWEEP)
+async def evict_idle_members():
+    member_cache.evict(bot)
 
-@bot.event
-async def on_ready():
-    # Add CryptoCommand cog
-    await bot.add_cog(CryptoCommand(bot))
 
-    # Sync commands
-    synced = await bot.tree.sync()
-    print(f"🤖 Bot {bot.user.display_name} telah aktif!")
-    print(f"📊 Connected to {len(bot.guilds)} servers")
-    print(f"✅ Synced {len(synced)} slash commands.")
+@bot.listen("on_interaction")
+async def touch_interaction_member(interaction):
+    # Cuma member yang memang ada di cache (join/chunk) yang diperpanjang
+    user = interaction.user
+    if isinstance(user, discord.Member) and user.guild.get_member(user.id):
+        member_cache.touch(user)
 
 
-# Function to create welcome banner
-async def create_welcome_banner(member):
+@bot.listen("on_app_command_completion")
+async def record_command_metrics(interaction, command):
+    trace = command_trace.get()
+    if trace is not None:
+        finish_command(trace, "error" if trace.failed else "ok")
+
+
+@bot.listen("on_app_command_completion")
+async def log_command_completion(interaction, command):
+    # Sukses itu event paling sering, jadi di-sample
+    latency = datetime.now(timezone.utc) - interaction.created_at
+    log.info(
+        "Command /%s selesai",
+        command.qualified_name,
+        extra=dict(
+            interaction_fields(interaction),
+            event="command",
+            latency_ms=round(latency.total_seconds() * 1000),
+            sample=True,
+        ),
+    )
+
+
+@bot.event
+async def on_ready():
+    # on_ready bisa terpanggil lagi setelah reconnect, setup ada di setup_hook
+    if "gateway_ready" not in startup_timings:
+        startup_timings["gateway_ready"] = time.perf_counter() - PROCESS_START
+        report_startup()
+
+    log.info("🤖 Bot %s telah aktif!", bot.user.display_name)
+    log.info("📊 Connected to %d servers", len(bot.guilds))
+
+
+# Welcome banner dirender di thread pool supaya tidak memblok event loop
+BANNER_WORKERS = int(os.getenv("BANNER_WORKERS", "2"))
+BANNER_QUEUE_SIZE = int(os.getenv("BANNER_QUEUE_SIZE", "16"))
+BANNER_WIDTH = int(os.getenv("BANNER_WIDTH", "800"))
+BANNER_HEIGHT = int(os.getenv("BANNER_HEIGHT", "200"))
+BANNER_FORMAT = os.getenv("BANNER_FORMAT", "png").lower()  # png / webp
+BANNER_WEBP_QUALITY = int(os.getenv("BANNER_WEBP_QUALITY", "80"))
+BANNER_PNG_OPTIMIZE = os.getenv("BANNER_PNG_OPTIMIZE", "false").lower() == "true"
+BANNER_AVATARS = os.getenv("BANNER_AVATARS", "true").lower() == "true"
+BANNER_GUILD_CACHE = int(os.getenv("BANNER_GUILD_CACHE", "256"))
+
+
+@functools.lru_cache(maxsize=None)
+def load_pil():
+    """Pillow baru di-import saat banner pertama dirender"""
+    start = time.perf_counter()
+    from PIL import Image, ImageDraw, ImageFont
+
+    if STARTUP_PROFILE:
+        log.info("⏱️ Lazy import PIL: %.0fms", (time.perf_counter() - start) * 1000)
+    return Image, ImageDraw, ImageFont
+
+
+@functools.lru_cache(maxsize=None)
+def load_font(size):
+    """Font di-load sekali per ukuran lalu dipakai ulang"""
+    _, _, ImageFont = load_pil()
     try:
-        # Create a simple banner using PIL
-        width, height = 800, 200
-        img = Image.new(
-            "RGB", (width, height), color=(114, 137, 218)
-        )  # Discord blurple
-        draw = ImageDraw.Draw(img)
+        return ImageFont.truetype("arial.ttf", size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+@functools.lru_cache(maxsize=8)
+def circle_mask(diameter):
+    Image, ImageDraw, _ = load_pil()
+    mask = Image.new("L", (diameter, diameter), 0)
+    ImageDraw.Draw(mask).ellipse((0, 0, diameter - 1, diameter - 1), fill=255)
+    return mask
+
+
+class BannerRenderer:
+    """Render welcome banner dari layer guild yang di-cache, di worker thread"""
+
+    def __init__(
+        self,
+        workers=BANNER_WORKERS,
+        queue_size=BANNER_QUEUE_SIZE,
+        width=BANNER_WIDTH,
+        height=BANNER_HEIGHT,
+        image_format=BANNER_FORMAT,
+        webp_quality=BANNER_WEBP_QUALITY,
+        png_optimize=BANNER_PNG_OPTIMIZE,
+        avatars=BANNER_AVATARS,
+        guild_cache_size=BANNER_GUILD_CACHE,
+    ):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.width = width
+        self.height = height
+        self.format = "webp" if image_format == "webp" else "png"
+        self.webp_quality = webp_quality
+        self.png_optimize = png_optimize
+        self.avatars = avatars
+        self.guild_cache_size = guild_cache_size
+        self.executor = None
+        self.pending = 0
+        self.rendered = 0
+        self.rejected = 0
+        self._layers = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Semua posisi diskalakan dari layout asli 800x200
+        scale = height / 200
+        self.font_large = max(int(36 * scale), 8)
+        self.font_small = max(int(20 * scale), 8)
+        self.text_y = height // 2 - int(30 * scale)
+        self.guild_text_y = self.text_y + int(50 * scale)
+        self.avatar_size = int(height * 0.6)
+        self.avatar_pos = (int(30 * scale), (height - self.avatar_size) // 2)
+        self.icon_size = int(height * 0.25)
+        self.icon_pos = (width - self.icon_size - int(12 * scale), int(12 * scale))
+
+    @property
+    def extension(self):
+        return self.format
+
+    @staticmethod
+    def layer_key(guild):
+        return (guild.name, guild.icon.key if guild.icon else None)
+
+    def has_layer(self, guild_id, key):
+        with self._lock:
+            entry = self._layers.get(guild_id)
+            return entry is not None and entry[0] == key
+
+    async def render(self, member):
+        """Return BytesIO banner, atau None kalau antrian penuh (fallback embed saja)"""
+        if self.pending >= self.queue_size:
+            self.rejected += 1
+            return None
+
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="banner"
+            )
 
-        # Try to use default font, fallback if not available
+        self.pending += 1
         try:
-            font_large = ImageFont.truetype("arial.ttf", 36)
-            font_small = ImageFont.truetype("arial.ttf", 20)
-        except:
-            font_large = ImageFont.load_default()
-            font_small = ImageFont.load_default()
-
-        # Draw text
-        welcome_text = f"Welcome {member.display_name}!"
-        guild_text = f"to {member.guild.name}"
+            guild = member.guild
+            key = self.layer_key(guild)
+
+            # Download aset di event loop, cuma kalau memang dibutuhkan
+            icon_bytes = None
+            if guild.icon and not self.has_layer(guild.id, key):
+                icon_bytes = await self._read_asset(guild.icon, self.icon_size)
+            avatar_bytes = None
+            if self.avatars:
+                avatar_bytes = await self._read_asset(
+                    member.display_avatar, self.avatar_size
+                )
 
-        # Center the text
-        bbox = draw.textbbox((0, 0), welcome_text, font=font_large)
-        text_width = bbox[2] - bbox[0]
-        x = (width - text_width) // 2
-        y = height // 2 - 30
+            # Kirim data mentah saja ke worker, object discord tidak thread-safe
+            banner = await asyncio.get_running_loop().run_in_executor(
+                self.executor,
+                self.render_sync,
+                guild.id,
+                key,
+                guild.name,
+                icon_bytes,
+                member.display_name,
+                avatar_bytes,
+            )
+        finally:
+            self.pending -= 1
+        self.rendered += 1
+        return banner
+
+    @staticmethod
+    async def _read_asset(asset, size):
+        # Ukuran asset Discord harus pangkat 2 (16 - 4096)
+        asset_size = 16
+        while asset_size < size and asset_size < 1024:
+            asset_size *= 2
+        try:
+            return await asset.replace(size=asset_size, static_format="png").read()
+        except (discord.HTTPException, ValueError) as e:
+            log.warning("Error reading banner asset: %s", e)
+            return None
+
+    def _open_image(self, data, size):
+        if not data:
+            return None
+        Image, _, _ = load_pil()
+        try:
+            image = Image.open(io.BytesIO(data)).convert("RGB")
+        except OSError:
+            return None
+        return image.resize((size, size))
+
+    def guild_layer(self, guild_id, key, guild_name, icon_bytes):
+        """Layer statis guild: background, nama guild dan icon (dibuat sekali)"""
+        with self._lock:
+            entry = self._layers.get(guild_id)
+            if entry is not None and entry[0] == key:
+                self._layers.move_to_end(guild_id)
+                return entry[1]
+
+        Image, ImageDraw, _ = load_pil()
+        layer = Image.new(
+            "RGB", (self.width, self.height), color=(114, 137, 218)
+        )  # Discord blurple
+        draw = ImageDraw.Draw(layer)
+        font_small = load_font(self.font_small)
+
+        guild_text = f"to {guild_name}"
+        bbox = draw.textbbox((0, 0), guild_text, font=font_small)
+        x = (self.width - (bbox[2] - bbox[0])) // 2
+        draw.text(
+            (x, self.guild_text_y), guild_text, fill=(255, 255, 255), font=font_small
+        )
 
-        draw.text((x, y), welcome_text, fill=(255, 255, 255), font=font_large)
+        icon = self._open_image(icon_bytes, self.icon_size)
+        if icon is not None:
+            layer.paste(icon, self.icon_pos, circle_mask(self.icon_size))
+
+        with self._lock:
+            self._layers[guild_id] = (key, layer)
+            self._layers.move_to_end(guild_id)
+            while len(self._layers) > self.guild_cache_size:
+                self._layers.popitem(last=False)
+        return layer
+
+    def render_sync(
+        self, guild_id, key, guild_name, icon_bytes, display_name, avatar_bytes
+    ):
+        _, ImageDraw, _ = load_pil()
+        img = self.guild_layer(guild_id, key, guild_name, icon_bytes).copy()
+        draw = ImageDraw.Draw(img)
+        font_large = load_font(self.font_large)
 
-        bbox2 = draw.textbbox((0, 0), guild_text, font=font_small)
-        text_width2 = bbox2[2] - bbox2[0]
-        x2 = (width - text_width2) // 2
-        y2 = y + 50
+        # Teks welcome di-center seperti layout asli
+        welcome_text = f"Welcome {display_name}!"
+        bbox = draw.textbbox((0, 0), welcome_text, font=font_large)
+        x = (self.width - (bbox[2] - bbox[0])) // 2
+        draw.text((x, self.text_y), welcome_text, fill=(255, 255, 255), font=font_large)
 
-        draw.text((x2, y2), guild_text, fill=(255, 255, 255), font=font_small)
+        avatar = self._open_image(avatar_bytes, self.avatar_size)
+        if avatar is not None:
+            img.paste(avatar, self.avatar_pos, circle_mask(self.avatar_size))
 
         # Save to BytesIO
         banner_bytes = io.BytesIO()
-        img.save(banner_bytes, format="PNG")
+        if self.format == "webp":
+            img.save(banner_bytes, format="WEBP", quality=self.webp_quality, method=4)
+        else:
+            img.save(banner_bytes, format="PNG", optimize=self.png_optimize)
         banner_bytes.seek(0)
 
         return banner_bytes
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+
+banner_renderer = BannerRenderer()
+
+
+# Function to create welcome banner
+async def create_welcome_banner(member):
+    try:
+        return await banner_renderer.render(member)
     except Exception as e:
-        print(f"Error creating welcome banner: {e}")
+        log.exception(
+            "Error creating welcome banner: %s",
+            e,
+            extra={"event": "welcome", "guild": member.guild.id, "user": member.id},
+        )
         return None
 
 
 # Helper function untuk HTTP requests
-async def fetch_api(url, headers=None):
+async def fetch_api(url, headers=None, params=None, policy=None):
     """Generic function untuk fetch API dengan error handling"""
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    print(f"API Error: Status {response.status} for {url}")
-                    return None
-    except aiohttp.ClientError as e:
-        print(f"Network Error: {e}")
+        return await fetch_json(url, params=params, headers=headers, policy=policy)
+    except UpstreamUnavailable as e:
+        log.info("Upstream Skipped: %s", e, extra={"upstream": e.host})
+        return None
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        # Detailnya sudah dicatat HTTPClient
+        log.debug("Network Error: %s", type(e).__name__)
         return None
     except json.JSONDecodeError as e:
-        print(f"JSON Error: {e}")
+        log.warning("JSON Error: %s", e, extra={"upstream": urlsplit(url).hostname})
         return None
     except Exception as e:
-        print(f"Unexpected Error: {e}")
+        log.exception("Unexpected Error: %s", e)
         return None
 
 
-# MEME API Command
-@bot.tree.command(name="meme", description="Dapatkan meme random dari internet!")
-async def random_meme(interaction: discord.Interaction):
-    await interaction.response.defer()  # Bot akan "typing..."
+# Multi-provider fetch: hedged request ke provider berikutnya kalau yang pertama lambat
+PROVIDER_HEDGE_AFTER = float(os.getenv("PROVIDER_HEDGE_AFTER", "1.5"))
+PROVIDER_EWMA_ALPHA = 0.2
 
-    try:
-        # Coba beberapa API meme
-        meme_apis = [
-            "https://meme-api.com/gimme",
-            "https://api.imgflip.com/get_memes",
+
+class Provider:
+    """Satu upstream + normalizer ke schema bersama, dengan statistik latency/error"""
+
+    def __init__(self, name, url, normalize):
+        self.name = name
+        self.url = url
+        self.normalize = normalize
+        self.latency = None  # EWMA detik, None = belum pernah dicoba
+        self.error_rate = 0.0  # EWMA 0..1
+        self.calls = 0
+        self.wins = 0
+
+    def record(self, elapsed, ok):
+        self.calls += 1
+        if self.latency is None:
+            self.latency = elapsed
+        else:
+            self.latency += PROVIDER_EWMA_ALPHA * (elapsed - self.latency)
+        self.error_rate += PROVIDER_EWMA_ALPHA * (
+            (0.0 if ok else 1.0) - self.error_rate
+        )
+
+    def score(self, default_latency, error_penalty):
+        """Makin kecil makin bagus: perkiraan latency + penalti error"""
+        latency = default_latency if self.latency is None else self.latency
+        return latency + self.error_rate * error_penalty
+
+
+class ProviderGroup:
+    """Daftar provider untuk satu jenis konten, urutannya di-rank ulang otomatis"""
+
+    def __init__(self, name, providers, hedge_after=PROVIDER_HEDGE_AFTER):
+        self.name = name
+        self.providers = providers
+        self.hedge_after = hedge_after
+        self.hedges = 0
+
+    def ranked(self):
+        # Provider yang error dihukum setara timeout upstream-nya
+        return sorted(
+            self.providers,
+            key=lambda provider: provider.score(
+                self.hedge_after,
+                http_client.timeout_for(provider.url).total or HTTP_DEFAULT_TIMEOUT,
+            ),
+        )
+
+    async def _attempt(self, provider):
+        start = time.perf_counter()
+        result = None
+        try:
+            data = await fetch_api(provider.url)
+            if data is not None:
+                result = provider.normalize(data)
+        except asyncio.CancelledError:
+            # Kalah dari hedge: minimal selambat ini, jangan dihitung sebagai error
+            provider.record(time.perf_counter() - start, True)
+            self.record(provider, start, "cancelled")
+            raise
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            log.warning(
+                "Provider %s returned unexpected data: %s",
+                provider.name,
+                e,
+                extra={"upstream": provider.name},
+            )
+        provider.record(time.perf_counter() - start, result is not None)
+        self.record(provider, start, "ok" if result is not None else "error")
+        return provider, result
+
+    def record(self, provider, start, outcome):
+        labels = {"group": self.name, "provider": provider.name}
+        metrics.inc("bot_provider_requests_total", outcome=outcome, **labels)
+        metrics.observe("bot_provider_seconds", time.perf_counter() - start, **labels)
+
+    async def fetch(self):
+        """Return (provider, data) dari jawaban bagus pertama, atau (None, None)"""
+        queue = deque(self.ranked())
+        pending = set()
+        try:
+            while queue or pending:
+                if queue:
+                    if pending:
+                        self.hedges += 1
+                    pending.add(asyncio.ensure_future(self._attempt(queue.popleft())))
+                # Tunggu hasil; kalau lewat hedge_after, kirim ke provider berikutnya
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=self.hedge_after if queue else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    provider, result = task.result()
+                    if result is not None:
+                        provider.wins += 1
+                        return provider, result
+            return None, None
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stats(self):
+        return {
+            provider.name: {
+                "latency_ms": (
+                    None if provider.latency is None else round(provider.latency * 1000)
+                ),
+                "error_rate": round(provider.error_rate, 3),
+                "calls": provider.calls,
+                "wins": provider.wins,
+            }
+            for provider in self.ranked()
+        }
+
+
+def normalize_meme_api(data):
+    if not data.get("url"):
+        return None
+    return {
+        "url": data["url"],
+        "title": data.get("title"),
+        "subreddit": data.get("subreddit"),
+        "author": data.get("author"),
+        "ups": data.get("ups"),
+    }
+
+
+def normalize_imgflip(data):
+    memes = data["data"]["memes"] if data.get("success") else None
+    if not memes:
+        return None
+    meme = random.choice(memes)
+    return {"url": meme["url"], "title": meme.get("name")}
+
+
+def normalize_some_random_api(data):
+    if not data.get("image"):
+        return None
+    return {
+        "url": data["image"],
+        "title": data.get("caption"),
+        "subreddit": data.get("category"),
+    }
+
+
+def normalize_quotable(data):
+    if not data.get("content"):
+        return None
+    return {
+        "content": data["content"],
+        "author": data.get("author") or "Unknown",
+        "tags": data.get("tags") or [],
+    }
+
+
+def normalize_zenquotes(data):
+    quote = data[0]
+    if not quote.get("q"):
+        return None
+    return {"content": quote["q"], "author": quote.get("a") or "Unknown", "tags": []}
+
+
+meme_providers = ProviderGroup(
+    "meme",
+    [
+        Provider("meme-api.com", "https://meme-api.com/gimme", normalize_meme_api),
+        Provider("imgflip.com", "https://api.imgflip.com/get_memes", normalize_imgflip),
+        Provider(
+            "some-random-api.ml",
             "https://some-random-api.ml/meme",
-        ]
+            normalize_some_random_api,
+        ),
+    ],
+)
+quote_providers = ProviderGroup(
+    "quote",
+    [
+        Provider("Quotable API", "https://api.quotable.io/random", normalize_quotable),
+        Provider("ZenQuotes", "https://zenquotes.io/api/random", normalize_zenquotes),
+    ],
+)
+
+
+# Pool konten random yang sudah di-prefetch, supaya command bisa langsung jawab
+CONTENT_POOL_SIZE = int(os.getenv("CONTENT_POOL_SIZE", "10"))
+CONTENT_POOL_LOW_WATER = int(os.getenv("CONTENT_POOL_LOW_WATER", "3"))
+CONTENT_POOL_TTL = float(os.getenv("CONTENT_POOL_TTL", "1800"))
+CONTENT_POOL_RECENT = int(os.getenv("CONTENT_POOL_RECENT", "50"))
+CONTENT_POOL_REFILL_INTERVAL = 60
+
+
+class ContentPool:
+    """Antrian item siap kirim untuk satu command, diisi ulang di background"""
+
+    def __init__(
+        self,
+        name,
+        fetch,
+        key,
+        size=CONTENT_POOL_SIZE,
+        low_water=CONTENT_POOL_LOW_WATER,
+        ttl=CONTENT_POOL_TTL,
+        recent=CONTENT_POOL_RECENT,
+    ):
+        self.name = name
+        self.fetch = fetch  # async () -> (source, item) atau (None, None)
+        self.key = key
+        self.size = size
+        self.low_water = low_water
+        self.ttl = ttl
+        self.items = deque()  # (fetched_at, source, item)
+        self.queued = set()
+        self.recent = deque(maxlen=recent)
+        self.refill_task = None
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.duplicates = 0
+
+    def seen(self, key):
+        return key in self.queued or key in self.recent
+
+    def take(self):
+        """Return (source, item) yang masih fresh, atau (None, None) kalau pool kosong"""
+        self.prune()
+        if not self.items:
+            self.misses += 1
+            self.schedule_refill()
+            return None, None
+        _, source, item = self.items.popleft()
+        key = self.key(item)
+        self.queued.discard(key)
+        self.recent.append(key)
+        self.hits += 1
+        self.schedule_refill()
+        return source, item
+
+    def served(self, item):
+        """Item hasil fetch live juga dicatat supaya tidak muncul lagi dari pool"""
+        self.recent.append(self.key(item))
+
+    def prune(self):
+        now = time.monotonic()
+        while self.items and now - self.items[0][0] > self.ttl:
+            _, _, item = self.items.popleft()
+            self.queued.discard(self.key(item))
+            self.expired += 1
+
+    def schedule_refill(self):
+        if len(self.items) > self.low_water:
+            return
+        if self.refill_task is None or self.refill_task.done():
+            # Context kosong supaya refill tidak tercatat di CommandTrace pemicunya
+            self.refill_task = asyncio.create_task(
+                self.refill(), context=contextvars.Context()
+            )
+
+    async def refill(self):
+        # Batasi percobaan supaya upstream yang sering kasih duplikat tidak di-spam
+        for _ in range(self.size * 2):
+            if len(self.items) >= self.size:
+                break
+            source, item = await self.fetch()
+            if item is None:
+                break  # Upstream lagi bermasalah, coba lagi nanti
+            key = self.key(item)
+            if self.seen(key):
+                self.duplicates += 1
+                continue
+            self.items.append((time.monotonic(), source, item))
+            self.queued.add(key)
+
+    def stats(self):
+        return {
+            "size": len(self.items),
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "duplicates": self.duplicates,
+        }
+
+
+async def fetch_meme():
+    provider, meme = await meme_providers.fetch()
+    return (provider.name, meme) if meme else (None, None)
+
+
+async def fetch_quote():
+    provider, quote = await quote_providers.fetch()
+    return (provider.name, quote) if quote else (None, None)
+
+
+async def fetch_cat_fact():
+    data = await fetch_api("https://catfact.ninja/fact")
+    if data and data.get("fact"):
+        return "CatFact API", {"fact": data["fact"]}
+    return None, None
+
+
+async def fetch_dog():
+    data = await fetch_api("https://dog.ceo/api/breeds/image/random")
+    if data and data.get("message") and data.get("status") == "success":
+        return "Dog CEO API", {"url": data["message"]}
+    return None, None
+
+
+content_pools = {
+    "meme": ContentPool("meme", fetch_meme, key=lambda meme: meme["url"]),
+    "quote": ContentPool("quote", fetch_quote, key=lambda quote: quote["content"]),
+    "catfact": ContentPool("catfact", fetch_cat_fact, key=lambda fact: fact["fact"]),
+    "dog": ContentPool("dog", fetch_dog, key=lambda dog: dog["url"]),
+}
+
 
-        meme_data = None
+@tasks.loop(seconds=CONTENT_POOL_REFILL_INTERVAL)
+async def refill_content_pools():
+    for pool in content_pools.values():
+        pool.prune()
+        pool.schedule_refill()
 
-        # Coba API pertama (meme-api.com)
-        meme_data = await fetch_api(meme_apis[0])
 
-        if meme_data and "url" in meme_data:
+async def take_or_fetch(interaction: discord.Interaction, name):
+    """Ambil item dari pool; kalau kosong, defer lalu fetch live"""
+    pool = content_pools[name]
+    source, item = pool.take()
+    if item is None:
+        await interaction.response.defer()  # Bot akan "typing..."
+        source, item = await pool.fetch()
+        if item is not None:
+            pool.served(item)
+    return source, item
+
+
+async def respond(interaction: discord.Interaction, **kwargs):
+    """Kirim lewat followup kalau sudah defer, kalau belum langsung sebagai response"""
+    if interaction.response.is_done():
+        await interaction.followup.send(**kwargs)
+    else:
+        await interaction.response.send_message(**kwargs)
+
+
+# MEME API Command
+@bot.tree.command(name="meme", description="Dapatkan meme random dari internet!")
+async def random_meme(interaction: discord.Interaction):
+    try:
+        # Meme dari pool prefetch; kalau kosong coba beberapa API meme secara live
+        source, meme_data = await take_or_fetch(interaction, "meme")
+
+        if meme_data:
             embed = discord.Embed(title="😂 Random Meme", color=0xFF6B35)
 
             # Set title jika ada
-            if "title" in meme_data:
+            if meme_data.get("title"):
                 embed.add_field(name="📝 Title", value=meme_data["title"], inline=False)
 
             # Set subreddit info jika ada
-            if "subreddit" in meme_data:
+            if meme_data.get("subreddit"):
                 embed.add_field(
                     name="📍 From", value=f"r/{meme_data['subreddit']}", inline=True
                 )
 
-            if "author" in meme_data:
+            if meme_data.get("author"):
                 embed.add_field(
                     name="👤 By", value=f"u/{meme_data['author']}", inline=True
                 )
 
-            if "ups" in meme_data:
+            if meme_data.get("ups") is not None:
                 embed.add_field(
                     name="⬆️ Upvotes", value=f"{meme_data['ups']:,}", inline=True
                 )
@@ -151,11 +2134,11 @@ async def random_meme(interaction: discord.Interaction):
 
             # Set footer
             embed.set_footer(
-                text=f"Requested by {interaction.user.display_name} • Via meme-api.com",
+                text=f"Requested by {interaction.user.display_name} • Via {source}",
                 icon_url=interaction.user.display_avatar.url,
             )
 
-            await interaction.followup.send(embed=embed)
+            await respond(interaction, embed=embed)
 
         else:
             # Fallback jika API gagal
@@ -169,16 +2152,18 @@ async def random_meme(interaction: discord.Interaction):
                 value="• Pastikan koneksi internet stabil\n• API mungkin sedang down\n• Coba beberapa saat lagi",
                 inline=False,
             )
-            await interaction.followup.send(embed=embed, ephemeral=True)
+            await respond(interaction, embed=embed, ephemeral=True)
 
     except Exception as e:
-        print(f"Error in meme command: {e}")
+        log.exception(
+            "Error in meme command: %s", e, extra=interaction_fields(interaction)
+        )
         embed = discord.Embed(
             title="❌ Error!",
             description="Terjadi kesalahan saat mengambil meme.",
             color=0xFF0000,
         )
-        await interaction.followup.send(embed=embed, ephemeral=True)
+        await respond(interaction, embed=embed, ephemeral=True)
 
 
 # ANIME INFO Command menggunakan Jikan API
@@ -189,7 +2174,7 @@ async def anime_info(interaction: discord.Interaction, judul: str):
     try:
         # Search anime menggunakan Jikan API v4
         search_url = f"https://api.jikan.moe/v4/anime?q={judul}&limit=1"
-        search_data = await fetch_api(search_url)
+        search_data = await fetch_api(search_url, policy="anime")
 
         if not search_data or not search_data.get("data"):
             embed = discord.Embed(
@@ -300,7 +2285,9 @@ async def anime_info(interaction: discord.Interaction, judul: str):
         await interaction.followup.send(embed=embed)
 
     except Exception as e:
-        print(f"Error in animeinfo command: {e}")
+        log.exception(
+            "Error in animeinfo command: %s", e, extra=interaction_fields(interaction)
+        )
         embed = discord.Embed(
             title="❌ Error!",
             description="Terjadi kesalahan saat mengambil info anime.",
@@ -317,40 +2304,30 @@ async def anime_info(interaction: discord.Interaction, judul: str):
 # QUOTE API Command
 @bot.tree.command(name="quote", description="Dapatkan quote inspiratif random!")
 async def random_quote(interaction: discord.Interaction):
-    await interaction.response.defer()
-
     try:
-        # API untuk quotes
-        quote_apis = [
-            "https://api.quotable.io/random",
-            "https://zenquotes.io/api/random",
-        ]
-
-        # Coba API pertama
-        quote_data = await fetch_api(quote_apis[0])
+        # Quote dari pool prefetch, kalau kosong fetch live
+        source, quote_data = await take_or_fetch(interaction, "quote")
 
-        if quote_data and "content" in quote_data:
+        if quote_data:
             embed = discord.Embed(
                 title="💭 Inspirational Quote",
                 description=f"*\"{quote_data['content']}\"*",
                 color=0x9B59B6,
             )
 
-            embed.add_field(
-                name="👤 Author", value=quote_data.get("author", "Unknown"), inline=True
-            )
+            embed.add_field(name="👤 Author", value=quote_data["author"], inline=True)
 
-            if "tags" in quote_data:
+            if quote_data["tags"]:
                 embed.add_field(
                     name="🏷️ Tags", value=", ".join(quote_data["tags"][:3]), inline=True
                 )
 
             embed.set_footer(
-                text=f"Requested by {interaction.user.display_name} • Via Quotable API",
+                text=f"Requested by {interaction.user.display_name} • Via {source}",
                 icon_url=interaction.user.display_avatar.url,
             )
 
-            await interaction.followup.send(embed=embed)
+            await respond(interaction, embed=embed)
 
         else:
             # Fallback quotes jika API gagal
@@ -388,54 +2365,56 @@ async def random_quote(interaction: discord.Interaction):
                 text=f"Requested by {interaction.user.display_name} • Fallback Quote"
             )
 
-            await interaction.followup.send(embed=embed)
+            await respond(interaction, embed=embed)
 
     except Exception as e:
-        print(f"Error in quote command: {e}")
+        log.exception(
+            "Error in quote command: %s", e, extra=interaction_fields(interaction)
+        )
         embed = discord.Embed(
             title="❌ Error!",
             description="Tidak bisa mengambil quote saat ini.",
             color=0xFF0000,
         )
-        await interaction.followup.send(embed=embed, ephemeral=True)
+        await respond(interaction, embed=embed, ephemeral=True)
 
 
 # CAT FACT API Command
 @bot.tree.command(name="catfact", description="Fakta random tentang kucing!")
 async def cat_fact(interaction: discord.Interaction):
-    await interaction.response.defer()
-
     try:
-        fact_data = await fetch_api("https://catfact.ninja/fact")
+        source, fact_data = await take_or_fetch(interaction, "catfact")
 
-        if fact_data and "fact" in fact_data:
+        if fact_data:
             embed = discord.Embed(
                 title="🐱 Cat Fact", description=fact_data["fact"], color=0xFFA500
             )
 
             embed.set_thumbnail(url="https://cataas.com/cat?width=200&height=200")
             embed.set_footer(
-                text=f"Requested by {interaction.user.display_name} • Via CatFact API",
+                text=f"Requested by {interaction.user.display_name} • Via {source}",
                 icon_url=interaction.user.display_avatar.url,
             )
 
-            await interaction.followup.send(embed=embed)
+            await respond(interaction, embed=embed)
         else:
             embed = discord.Embed(
                 title="❌ Cat Fact Tidak Tersedia",
                 description="Tidak bisa mengambil fakta kucing saat ini.",
                 color=0xFF0000,
             )
-            await interaction.followup.send(embed=embed, ephemeral=True)
+            await respond(interaction, embed=embed, ephemeral=True)
 
     except Exception as e:
-        print(f"Error in catfact command: {e}")
+        log.exception(
+            "Error in catfact command: %s", e, extra=interaction_fields(interaction)
+        )
         embed = discord.Embed(
             title="❌ Error!",
             description="Terjadi kesalahan saat mengambil cat fact.",
             color=0xFF0000,
         )
-        await interaction.followup.send(embed=embed, ephemeral=True)
+        await respond(interaction, embed=embed, ephemeral=True)
 
 
 wether_api = os.getenv("WEATHER_API")
@@ -451,7 +2430,7 @@ async def weather_info(interaction: discord.Interaction, kota: str):
         weather_url = f"http://api.openweathermap.org/data/2.5/weather?q={kota}&appid={wether_api}&units=metric&lang=id"
 
         # Fetch data cuaca
-        weather_data = await fetch_api(weather_url)
+        weather_data = await fetch_api(weather_url, policy="weather")
 
         if weather_data and weather_data.get("cod") == 200:
             # Data cuaca berhasil didapat
@@ -634,7 +2613,9 @@ async def weather_info(interaction: discord.Interaction, kota: str):
         await interaction.followup.send(embed=embed, ephemeral=True)
 
     except Exception as e:
-        print(f"Error in weather command: {e}")
+        log.exception(
+            "Error in weather command: %s", e, extra=interaction_fields(interaction)
+        )
         embed = discord.Embed(
             title="❌ Error!",
             description="Terjadi kesalahan tak terduga saat mengambil info cuaca.",
@@ -649,37 +2630,37 @@ async def weather_info(interaction: discord.Interaction, kota: str):
 # DOG API Command
 @bot.tree.command(name="dog", description="Dapatkan foto anjing random yang lucu!")
 async def random_dog(interaction: discord.Interaction):
-    await interaction.response.defer()
-
     try:
-        dog_data = await fetch_api("https://dog.ceo/api/breeds/image/random")
+        source, dog_data = await take_or_fetch(interaction, "dog")
 
-        if dog_data and "message" in dog_data and dog_data["status"] == "success":
+        if dog_data:
             embed = discord.Embed(title="🐕 Random Dog", color=0x8B4513)
 
-            embed.set_image(url=dog_data["message"])
+            embed.set_image(url=dog_data["url"])
             embed.set_footer(
-                text=f"Requested by {interaction.user.display_name} • Via Dog CEO API",
+                text=f"Requested by {interaction.user.display_name} • Via {source}",
                 icon_url=interaction.user.display_avatar.url,
             )
 
-            await interaction.followup.send(embed=embed)
+            await respond(interaction, embed=embed)
         else:
             embed = discord.Embed(
                 title="❌ Dog Image Tidak Tersedia",
                 description="Tidak bisa mengambil foto anjing saat ini.",
                 color=0xFF0000,
             )
-            await interaction.followup.send(embed=embed, ephemeral=True)
+            await respond(interaction, embed=embed, ephemeral=True)
 
     except Exception as e:
-        print(f"Error in dog command: {e}")
+        log.exception(
+            "Error in dog command: %s", e, extra=interaction_fields(interaction)
+        )
         embed = discord.Embed(
             title="❌ Error!",
             description="Terjadi kesalahan saat mengambil foto anjing.",
             color=0xFF0000,
         )
-        await interaction.followup.send(embed=embed, ephemeral=True)
+        await respond(interaction, embed=embed, ephemeral=True)
 
 
 # Help command (Updated dengan API commands)
@@ -736,87 +2717,687 @@ async def help_command(interaction: discord.Interaction):
     await interaction.response.send_message(embed=embed)
 
 
+# Kalkulator: tokenizer -> parser (AST) -> evaluator dengan batas, tanpa eval()
+CALC_MAX_LENGTH = 200
+CALC_MAX_DEPTH = 32
+CALC_MAX_NODES = 256
+CALC_MAX_OPS = 1000
+CALC_MAX_BITS = 3000  # ~900 digit, masih muat di satu field embed
+CALC_MAX_SERIES_TERMS = 500
+CALC_MAX_EXPONENT = 1000  # 1e-10000000 jadi Fraction dengan penyebut raksasa
+CALC_MAX_ROUND_DIGITS = 1000  # round(x, -10**7) bisa jalan berdetik-detik
+CALC_TIMEOUT = float(os.getenv("CALC_TIMEOUT", "5"))
+# Lewat dari ini command di-defer dulu, hasil dikirim setelah selesai
+CALC_LATENCY_BUDGET = float(os.getenv("CALC_LATENCY_BUDGET", "1"))
+CALC_CACHE_SIZE = 1024
+CALC_DEFAULT_PRECISION = 28
+CALC_MAX_PRECISION = 100
+
+CALC_TOKEN_RE = re.compile(
+    r"\s*(?:(?P<number>\d+\.?\d*(?:[eE][+-]?\d+)?|\.\d+(?:[eE][+-]?\d+)?)"
+    r"|(?P<name>[A-Za-z_][A-Za-z_0-9]*|π)"
+    r"|(?P<op>\*\*|[-+*/%^()√×÷,!=]))"
+)
+CALC_OP_ALIASES = {"**": "^", "×": "*", "÷": "/"}
+CALC_CONSTANTS = {"pi": "pi", "π": "pi", "tau": "tau", "e": "e"}
+
+
+def decimal_context(precision):
+    """Context untuk mode exact; overflow/invalid jadi exception, bukan Infinity/NaN"""
+    return decimal.Context(
+        prec=precision,
+        Emax=999,
+        Emin=-999,
+        traps=[decimal.InvalidOperation, decimal.DivisionByZero, decimal.Overflow],
+    )
+
+
+def to_decimal(value):
+    """Fraction/int/float -> Decimal di context aktif"""
+    if isinstance(value, Fraction):
+        return Decimal(value.numerator) / Decimal(value.denominator)
+    if isinstance(value, float):
+        return +Decimal(repr(value))
+    return +Decimal(value)
+
+
+def as_integer(value, name):
+    """Argumen yang harus bilangan bulat (faktorial, digit round)"""
+    if isinstance(value, int):
+        return value
+    if isinstance(value, (float, Decimal)) and value == int(value):
+        return int(value)
+    if isinstance(value, Fraction) and value.denominator == 1:
+        return value.numerator
+    raise CalculationError(f"Argumen `{name}` harus bilangan bulat")
+
+
+@functools.lru_cache(maxsize=8)
+def decimal_pi(precision):
+    """Resep pi dari dokumentasi modul decimal"""
+    with decimal.localcontext(decimal_context(precision + 2)):
+        three = Decimal(3)
+        lasts, t, s, n, na, d, da = 0, three, 3, 1, 0, 0, 24
+        while s != lasts:
+            lasts = s
+            n, na = n + na, na + 8
+            d, da = d + da, da + 32
+            t = (t * n) / d
+            s += t
+    return s
+
+
+def current_pi():
+    return +decimal_pi(decimal.getcontext().prec)
+
+
+def decimal_series(x, first, start):
+    """Deret Taylor sin (first=x, start=1) / cos (first=1, start=0)"""
+    context = decimal.getcontext()
+    with decimal.localcontext() as local:
+        local.prec = context.prec + 2
+        # Range reduction ke [-pi, pi] supaya deret cepat konvergen
+        tau = 2 * decimal_pi(context.prec)
+        x = x.remainder_near(tau)
+        i, lasts, s, fact, num, sign = start, 0, first, 1, first, 1
+        for _ in range(CALC_MAX_SERIES_TERMS):
+            if s == lasts:
+                break
+            lasts = s
+            i += 2
+            fact *= i * (i - 1)
+            num *= x * x
+            sign *= -1
+            s += num / fact * sign
+        else:
+            raise CalculationError("Operasi terlalu berat")
+    return +s
+
+
+def exact_sqrt(x):
+    # Kuadrat sempurna tetap eksak: √(9/4) = 3/2
+    if isinstance(x, Fraction) and x >= 0:
+        numerator, denominator = math.isqrt(x.numerator), math.isqrt(x.denominator)
+        if numerator**2 == x.numerator and denominator**2 == x.denominator:
+            return Fraction(numerator, denominator)
+    return to_decimal(x).sqrt()
+
+
+def checked_factorial(n):
+    n = as_integer(n, "factorial")
+    if n < 0:
+        raise CalculationError("Faktorial hanya untuk bilangan bulat ≥ 0")
+    # log2(n!) dari lgamma, dicek sebelum dihitung
+    if n > 1 and math.lgamma(n + 1) / math.log(2) > CALC_MAX_BITS:
+        raise CalculationError("Hasil terlalu besar")
+    return math.factorial(n)
+
+
+def checked_round(x, digits=0):
+    digits = as_integer(digits, "round")
+    # round dihitung langsung di event loop, jadi digit harus dibatasi dulu
+    if abs(digits) > CALC_MAX_ROUND_DIGITS:
+        raise CalculationError(f"Digit `round` maksimal ±{CALC_MAX_ROUND_DIGITS:,}")
+    return round(x, digits)
+
+
+def float_log(x, base=10):
+    return math.log(x, base)
+
+
+def exact_log(x, base=10):
+    x = to_decimal(x)
+    if base == 10:
+        return x.log10()
+    return x.ln() / to_decimal(base).ln()
+
+
+def via_float(function):
+    """Fungsi tanpa versi Decimal (invers trigonometri): dihitung dengan presisi float"""
+    return lambda x: to_decimal(function(float(x)))
+
+
+# nama -> (fungsi mode float, fungsi mode exact, jumlah argumen minimum, maksimum)
+CALC_FUNCTIONS = {
+    "sqrt": (math.sqrt, exact_sqrt, 1, 1),
+    "abs": (abs, abs, 1, 1),
+    "round": (checked_round, checked_round, 1, 2),
+    "min": (min, min, 1, 16),
+    "max": (max, max, 1, 16),
+    "pow": (None, None, 2, 2),  # diarahkan ke operator ^ supaya kena batas yang sama
+    "floor": (math.floor, math.floor, 1, 1),
+    "ceil": (math.ceil, math.ceil, 1, 1),
+    "factorial": (checked_factorial, checked_factorial, 1, 1),
+    "sin": (math.sin, lambda x: decimal_series(to_decimal(x), to_decimal(x), 1), 1, 1),
+    "cos": (math.cos, lambda x: decimal_series(to_decimal(x), Decimal(1), 0), 1, 1),
+    "tan": (
+        math.tan,
+        lambda x: CALC_FUNCTIONS["sin"][1](x) / CALC_FUNCTIONS["cos"][1](x),
+        1,
+        1,
+    ),
+    "asin": (math.asin, via_float(math.asin), 1, 1),
+    "acos": (math.acos, via_float(math.acos), 1, 1),
+    "atan": (math.atan, via_float(math.atan), 1, 1),
+    "ln": (math.log, lambda x: to_decimal(x).ln(), 1, 1),
+    "log": (float_log, exact_log, 1, 2),
+    "log2": (math.log2, lambda x: exact_log(x, 2), 1, 1),
+    "exp": (math.exp, lambda x: to_decimal(x).exp(), 1, 1),
+    "deg": (math.degrees, lambda x: to_decimal(x) * 180 / current_pi(), 1, 1),
+    "rad": (math.radians, lambda x: to_decimal(x) * current_pi() / 180, 1, 1),
+}
+# Fungsi murah yang boleh dihitung langsung di event loop (mode float)
+CALC_CHEAP_FUNCTIONS = {"abs", "round", "min", "max", "floor", "ceil", "sqrt"}
+
+ParsedExpression = namedtuple("ParsedExpression", "tree nodes heavy")
+
+
+class CalculationError(ValueError):
+    """Error kalkulator dengan pesan yang aman ditampilkan ke user"""
+
+
+def tokenize(text):
+    """Pecah ekspresi jadi list (jenis, nilai)"""
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = CALC_TOKEN_RE.match(text, position)
+        if match is None:
+            raise CalculationError(
+                f"Karakter tidak dikenal: `{text[position:].lstrip()[:1]}`"
+            )
+        position = match.end()
+        if match.group("number"):
+            # Literal disimpan sebagai string, dikonversi sesuai mode saat evaluasi
+            literal = match.group("number")
+            if not math.isfinite(float(literal)):
+                raise CalculationError("Angka terlalu besar")
+            # Underflow ke 0.0 lolos cek di atas, jadi eksponen dicek terpisah
+            if abs(Decimal(literal).as_tuple().exponent) > CALC_MAX_EXPONENT:
+                raise CalculationError(f"Eksponen maksimal ±{CALC_MAX_EXPONENT:,}")
+            tokens.append(("number", literal))
+        elif match.group("name"):
+            tokens.append(("name", match.group("name")))
+        else:
+            op = match.group("op")
+            tokens.append(("op", CALC_OP_ALIASES.get(op, op)))
+    return tokens
+
+
+class ExpressionParser:
+    """Recursive descent parser, prioritas: + - < * / % < unary < ^ (right-assoc) < !"""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.position = 0
+        self.depth = 0
+        self.nodes = 0
+        self.heavy = False
+
+    def peek(self, offset=0):
+        if self.position + offset < len(self.tokens):
+            return self.tokens[self.position + offset]
+        return (None, None)
+
+    def next(self):
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def expect(self, value):
+        if self.next() != ("op", value):
+            raise CalculationError(f"Kurang `{value}`")
+
+    def node(self, *node):
+        self.nodes += 1
+        if self.nodes > CALC_MAX_NODES:
+            raise CalculationError("Operasi terlalu panjang")
+        return node
+
+    @contextlib.contextmanager
+    def nested(self):
+        self.depth += 1
+        if self.depth > CALC_MAX_DEPTH:
+            raise CalculationError("Terlalu banyak tanda kurung/operator bertingkat")
+        try:
+            yield
+        finally:
+            self.depth -= 1
+
+    def parse(self):
+        if not self.tokens:
+            raise CalculationError("Operasi kosong")
+        tree = self.statement()
+        if self.position < len(self.tokens):
+            raise CalculationError(f"Token tidak terduga: `{self.peek()[1]}`")
+        return ParsedExpression(tree, self.nodes, self.heavy)
+
+    def statement(self):
+        # Assignment variabel: x = 2 + 3
+        kind, name = self.peek()
+        if kind == "name" and self.peek(1) == ("op", "="):
+            if name in CALC_FUNCTIONS or name in CALC_CONSTANTS:
+                raise CalculationError(f"`{name}` tidak bisa dipakai sebagai variabel")
+            self.position += 2
+            return self.node("assign", name, self.expression())
+        return self.expression()
+
+    def expression(self):
+        left = self.term()
+        while self.peek() in (("op", "+"), ("op", "-")):
+            op = self.next()[1]
+            left = self.node("binary", op, left, self.term())
+        return left
+
+    def term(self):
+        left = self.unary()
+        while True:
+            kind, value = self.peek()
+            if kind == "op" and value in ("*", "/", "%"):
+                self.next()
+                left = self.node("binary", value, left, self.unary())
+            elif kind == "name" or (kind == "op" and value in ("(", "√")):
+                # Perkalian implisit: 2π, 3(4+5), 2√9, 2x
+                left = self.node("binary", "*", left, self.unary())
+            else:
+                return left
+
+    def unary(self):
+        kind, value = self.peek()
+        if kind == "op" and value in ("-", "+", "√"):
+            self.next()
+            with self.nested():
+                return self.node("unary", value, self.unary())
+        return self.power()
+
+    def power(self):
+        base = self.postfix()
+        if self.peek() == ("op", "^"):
+            self.next()
+            self.heavy = True
+            with self.nested():
+                return self.node("binary", "^", base, self.unary())
+        return base
+
+    def postfix(self):
+        value = self.primary()
+        while self.peek() == ("op", "!"):
+            self.next()
+            self.heavy = True
+            value = self.node("call", "factorial", (value,))
+        return value
+
+    def primary(self):
+        kind, value = self.next()
+        if kind == "number":
+            return self.node("number", value)
+        if kind == "name":
+            if value in CALC_FUNCTIONS:
+                return self.call(value)
+            if value in CALC_CONSTANTS:
+                return self.node("const", CALC_CONSTANTS[value])
+            return self.node("var", value)
+        if (kind, value) == ("op", "("):
+            with self.nested():
+                inner = self.expression()
+            self.expect(")")
+            return inner
+        if kind is None:
+            raise CalculationError("Operasi tidak lengkap")
+        raise CalculationError(f"Token tidak terduga: `{value}`")
+
+    def call(self, name):
+        self.expect("(")
+        args = []
+        with self.nested():
+            if self.peek() != ("op", ")"):
+                args.append(self.expression())
+                while self.peek() == ("op", ","):
+                    self.next()
+                    args.append(self.expression())
+        self.expect(")")
+        _, _, minimum, maximum = CALC_FUNCTIONS[name]
+        if not minimum <= len(args) <= maximum:
+            raise CalculationError(f"Jumlah argumen `{name}` tidak valid")
+        if name not in CALC_CHEAP_FUNCTIONS:
+            self.heavy = True
+        if name == "pow":
+            return self.node("binary", "^", *args)
+        return self.node("call", name, tuple(args))
+
+
+@functools.lru_cache(maxsize=CALC_CACHE_SIZE)
+def parse_expression(text):
+    """Parse + cache; AST berupa tuple jadi aman dipakai bersama"""
+    if len(text) > CALC_MAX_LENGTH:
+        raise CalculationError(f"Operasi maksimal {CALC_MAX_LENGTH} karakter")
+    return ExpressionParser(tokenize(text)).parse()
+
+
+def check_magnitude(value):
+    if isinstance(value, int):
+        if value.bit_length() > CALC_MAX_BITS:
+            raise CalculationError("Hasil terlalu besar")
+    elif isinstance(value, Fraction):
+        if max(abs(value.numerator), value.denominator).bit_length() > CALC_MAX_BITS:
+            raise CalculationError("Hasil terlalu besar")
+    elif isinstance(value, Decimal):
+        if not value.is_finite():
+            raise CalculationError("Hasil terlalu besar")
+    elif not math.isfinite(value):
+        raise CalculationError("Hasil terlalu besar")
+    return value
+
+
+def checked_power(base, exponent):
+    """Pangkat dengan estimasi ukuran hasil sebelum dihitung"""
+    if isinstance(base, (int, Fraction)) and isinstance(exponent, int):
+        bits = max(abs(base.numerator), base.denominator).bit_length() - 1
+        if bits * abs(exponent) > CALC_MAX_BITS:
+            raise CalculationError("Hasil terlalu besar")
+    if base == 0 and exponent < 0:
+        raise ZeroDivisionError
+    result = base**exponent
+    if isinstance(result, complex):
+        raise CalculationError("Hasil bukan bilangan real")
+    return result
+
+
+class ExpressionEvaluator:
+    """Evaluasi AST dengan batas jumlah operasi dan deadline
+
+    Mode "float" memakai int/float biasa, mode "exact" memakai Fraction selama
+    hasilnya rasional dan Decimal dengan presisi `precision` untuk sisanya.
+    """
+
+    def __init__(
+        self,
+        mode="float",
+        precision=CALC_DEFAULT_PRECISION,
+        variables=None,
+        max_ops=CALC_MAX_OPS,
+        timeout=CALC_TIMEOUT,
+    ):
+        self.exact = mode == "exact"
+        self.context = decimal_context(precision)
+        self.variables = variables or {}
+        self.ops = 0
+        self.max_ops = max_ops
+        self.deadline = time.perf_counter() + timeout
+
+    def run(self, tree):
+        """Return hasil ekspresi (untuk assignment: nilai yang di-assign)"""
+        if tree[0] == "assign":
+            tree = tree[2]
+        try:
+            with decimal.localcontext(self.context):
+                return self.evaluate(tree)
+        except (OverflowError, decimal.Overflow):
+            raise CalculationError("Hasil terlalu besar")
+        except decimal.InvalidOperation:
+            raise CalculationError("Operasi di luar domain fungsi")
+
+    def evaluate(self, node):
+        self.ops += 1
+        if self.ops > self.max_ops or time.perf_counter() > self.deadline:
+            raise CalculationError("Operasi terlalu berat")
+        kind = node[0]
+        if kind == "number":
+            return self.number(node[1])
+        if kind == "const":
+            return self.constant(node[1])
+        if kind == "var":
+            if node[1] not in self.variables:
+                raise CalculationError(f"Variabel `{node[1]}` belum didefinisikan")
+            return self.convert(self.variables[node[1]])
+        if kind == "unary":
+            value = self.evaluate(node[2])
+            if node[1] == "-":
+                return -value
+            if node[1] == "√":
+                return self.call("sqrt", [value])
+            return value
+        if kind == "binary":
+            left, right = self.evaluate(node[2]), self.evaluate(node[3])
+            return check_magnitude(self.binary(node[1], left, right))
+        if kind == "call":
+            return self.call(node[1], [self.evaluate(arg) for arg in node[2]])
+        raise CalculationError("Operasi tidak valid")
+
+    def number(self, literal):
+        if self.exact:
+            return Fraction(literal)
+        if literal.isdigit():
+            return int(literal)
+        return float(literal)
+
+    def constant(self, name):
+        if not self.exact:
+            return {"pi": math.pi, "tau": math.tau, "e": math.e}[name]
+        if name == "e":
+            return Decimal(1).exp()
+        pi = +decimal_pi(self.context.prec)
+        return pi * 2 if name == "tau" else pi
+
+    def convert(self, value):
+        """Variabel dari sesi mode lain disesuaikan ke mode sekarang"""
+        if self.exact:
+            return Fraction(repr(value)) if isinstance(value, float) else value
+        if isinstance(value, (Fraction, Decimal)):
+            return float(value)
+        return value
+
+    def call(self, name, args):
+        function = CALC_FUNCTIONS[name][1 if self.exact else 0]
+        return check_magnitude(function(*args))
+
+    def binary(self, op, left, right):
+        if self.exact and not (
+            isinstance(left, (int, Fraction)) and isinstance(right, (int, Fraction))
+        ):
+            left, right = to_decimal(left), to_decimal(right)
+        if op == "+":
+            return left + right
+        if op == "-":
+            return left - right
+        if op == "*":
+            return left * right
+        if op == "/":
+            if right == 0:
+                raise ZeroDivisionError
+            return left / right
+        if op == "%":
+            if right == 0:
+                raise ZeroDivisionError
+            return left % right
+        if isinstance(right, Fraction):
+            if right.denominator == 1:
+                return checked_power(left, right.numerator)
+            # Pangkat pecahan hasilnya irasional, lanjut dengan Decimal
+            return checked_power(to_decimal(left), to_decimal(right))
+        return checked_power(left, right)
+
+
+class CalculatorSessions:
+    """Variabel kalkulator per user (termasuk `ans`), dibuang kalau lama tidak dipakai"""
+
+    def __init__(self, max_users=1000, max_variables=20, idle=3600):
+        self.max_users = max_users
+        self.max_variables = max_variables
+        self.idle = idle
+        self.sessions = OrderedDict()  # user_id -> (last_used, {nama: nilai})
+
+    def variables(self, user_id):
+        entry = self.sessions.get(user_id)
+        if entry is None or time.monotonic() - entry[0] > self.idle:
+            self.sessions.pop(user_id, None)
+            return {}
+        return dict(entry[1])
+
+    def store(self, user_id, values):
+        variables = self.variables(user_id)
+        variables.update(values)
+        if len(variables) > self.max_variables:
+            raise CalculationError(f"Maksimal {self.max_variables} variabel per user")
+        self.sessions[user_id] = (time.monotonic(), variables)
+        self.sessions.move_to_end(user_id)
+        while len(self.sessions) > self.max_users:
+            self.sessions.popitem(last=False)
+
+
+calc_sessions = CalculatorSessions()
+calc_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="calc")
+
+
+async def calculate(
+    text, variables=None, mode="float", precision=CALC_DEFAULT_PRECISION
+):
+    """Return (nama variabel atau None, hasil)
+
+    Parse memakai cache; yang berat (dan semua mode exact) dijalankan di thread
+    dengan timeout.
+    """
+    parsed = parse_expression(text)
+    name = parsed.tree[1] if parsed.tree[0] == "assign" else None
+    evaluator = ExpressionEvaluator(mode, precision, variables)
+    if not parsed.heavy and mode == "float":
+        return name, evaluator.run(parsed.tree)
+
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(calc_executor, evaluator.run, parsed.tree)
+    try:
+        return name, await asyncio.wait_for(future, CALC_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise CalculationError("Operasi terlalu lama")
+
+
+def format_calc_result(value):
+    """Return (teks hasil, nilai desimal untuk notasi ilmiah/perkiraan)"""
+    if isinstance(value, Fraction):
+        if value.denominator == 1:
+            value = value.numerator
+        else:
+            with decimal.localcontext(decimal_context(CALC_DEFAULT_PRECISION)):
+                approx = to_decimal(value)
+            return f"{value.numerator}/{value.denominator}", approx
+    if isinstance(value, float):
+        if value.is_integer():
+            value = int(value)
+        else:
+            value = round(value, 8)  # Batasi decimal places
+    if isinstance(value, Decimal):
+        # Context bawaan cuma 28 digit, jangan sampai hasil presisi tinggi terpotong
+        with decimal.localcontext(decimal_context(CALC_MAX_PRECISION)):
+            value = value.normalize()
+            if value == value.to_integral_value() and value.adjusted() < 30:
+                value = value.quantize(1)
+        text = f"{value:f}" if -30 < value.adjusted() < 30 else str(value)
+        return text, value
+    return str(value), Decimal(value)
+
+
+def shorten(text, limit=1000):
+    """Batasi panjang teks untuk field embed (maks 1024 karakter)"""
+    return text if len(text) <= limit else text[: limit - 1] + "…"
+
+
 # Calculator command
 @bot.tree.command(name="kalkulator", description="Kalkulator matematika sederhana")
-async def kalkulator(interaction: discord.Interaction, operasi: str):
+@app_commands.describe(
+    operasi="Contoh: 2 + 3 * 4, sin(pi/6), 10!, x = 5, 2x + ans",
+    mode="float (default) atau exact (pecahan/decimal tanpa pembulatan float)",
+    presisi="Jumlah digit signifikan untuk mode exact",
+)
+@app_commands.choices(
+    mode=[
+        app_commands.Choice(name="float", value="float"),
+        app_commands.Choice(name="exact", value="exact"),
+    ]
+)
+async def kalkulator(
+    interaction: discord.Interaction,
+    operasi: str,
+    mode: str = "float",
+    presisi: app_commands.Range[int, 1, CALC_MAX_PRECISION] = CALC_DEFAULT_PRECISION,
+):
     try:
-        # Validasi karakter yang diperbolehkan
-        allowed_chars = re.compile(r"^[0-9+\-*/.()√π^% ]+$")
-        expression = operasi.replace(" ", "")
+        # Parse + hitung tanpa eval(), dengan batas ukuran dan waktu
+        task = asyncio.ensure_future(
+            calculate(
+                operasi, calc_sessions.variables(interaction.user.id), mode, presisi
+            )
+        )
+        # Kalau lewat latency budget, defer dulu lalu kirim hasil setelah selesai
+        done, _ = await asyncio.wait({task}, timeout=CALC_LATENCY_BUDGET)
+        if not done:
+            await interaction.response.defer(thinking=True)
 
-        if not allowed_chars.match(expression):
+        try:
+            name, result = await task
+            values = {"ans": result}
+            if name is not None:
+                values[name] = result
+            calc_sessions.store(interaction.user.id, values)
+        except CalculationError as e:
             embed = discord.Embed(
-                title="❌ Karakter Tidak Valid!",
-                description="Operasi hanya boleh menggunakan angka dan operator matematika.",
+                title="❌ Operasi Tidak Valid!",
+                description=str(e),
                 color=0xFF0000,
             )
             embed.add_field(
                 name="✅ Operator Valid:",
-                value="• `+` (tambah), `-` (kurang)\n• `*` (kali), `/` (bagi)\n• `()` (kurung)\n• `^` (pangkat), `√` (akar)\n• `%` (modulo), `π` (pi)",
+                value="• `+` (tambah), `-` (kurang)\n• `*` (kali), `/` (bagi)\n• `()` (kurung)\n• `^` (pangkat), `√` (akar)\n• `%` (modulo), `!` (faktorial)\n• `π`/`pi`, `tau`, `e`",
+                inline=False,
+            )
+            embed.add_field(
+                name="🔣 Fungsi:",
+                value="`sqrt` `abs` `round` `min` `max` `pow` `floor` `ceil`\n`sin` `cos` `tan` `asin` `acos` `atan` `deg` `rad`\n`ln` `log(x, basis)` `log2` `exp` `factorial`",
                 inline=False,
             )
             embed.add_field(
                 name="📝 Contoh:",
-                value="`/kalkulator 2 + 3 * 4`\n`/kalkulator √16 + 5^2`\n`/kalkulator π * 2`",
+                value="`/kalkulator 2 + 3 * 4`\n`/kalkulator √16 + 5^2`\n`/kalkulator x = π * 2` lalu `/kalkulator x / 2`",
                 inline=False,
             )
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await respond(interaction, embed=embed, ephemeral=True)
             return
 
-        # Replace custom operators
-        expression = expression.replace("√", "sqrt")
-        expression = expression.replace("π", str(3.14159265359))
-        expression = expression.replace("^", "**")
-
-        # Fungsi helper untuk sqrt
-        def sqrt(x):
-            return math.sqrt(x)
-
-        # Evaluasi dengan namespace terbatas untuk keamanan
-        allowed_names = {
-            "__builtins__": {},
-            "sqrt": sqrt,
-            "abs": abs,
-            "round": round,
-            "min": min,
-            "max": max,
-            "pow": pow,
-        }
-
-        # Hitung hasil
-        result = eval(expression, allowed_names)
-
-        # Format hasil
-        if isinstance(result, float):
-            if result.is_integer():
-                result = int(result)
-            else:
-                result = round(result, 8)  # Batasi decimal places
+        text, approx = format_calc_result(result)
 
         # Buat embed hasil
         embed = discord.Embed(title="🧮 Hasil Kalkulasi", color=0x00BFFF)
 
         # Tampilkan operasi asli (dengan symbol yang bagus)
         display_expression = (
-            operasi.replace("*", "×")
-            .replace("/", "÷")
-            .replace("sqrt", "√")
-            .replace(str(3.14159265359), "π")
+            operasi.replace("**", "^").replace("*", "×").replace("/", "÷")
         )
 
         embed.add_field(
-            name="📝 Operasi:", value=f"`{display_expression}`", inline=False
+            name="📝 Operasi:", value=shorten(f"`{display_expression}`"), inline=False
         )
-        embed.add_field(name="✅ Hasil:", value=f"**{result}**", inline=False)
+        embed.add_field(name="✅ Hasil:", value=shorten(f"**{text}**"), inline=False)
+
+        # Pecahan eksak juga ditampilkan perkiraan desimalnya
+        if isinstance(result, Fraction) and result.denominator != 1:
+            embed.add_field(name="≈ Desimal:", value=f"{approx}", inline=True)
 
         # Tambahkan info tambahan untuk hasil tertentu
-        if abs(result) > 1000000:
+        if abs(approx) > 1000000:
             embed.add_field(
-                name="📊 Notasi Ilmiah:", value=f"{result:.2e}", inline=True
+                name="📊 Notasi Ilmiah:", value=f"{approx:.2e}", inline=True
             )
 
-        embed.set_footer(text=f"Dihitung oleh {interaction.user.display_name}")
-        await interaction.response.send_message(embed=embed)
+        if name is not None:
+            embed.add_field(
+                name="💾 Variabel:", value=f"`{name}` disimpan", inline=True
+            )
+
+        footer = f"Dihitung oleh {interaction.user.display_name}"
+        if mode == "exact":
+            footer += f" • mode exact, {presisi} digit"
+        embed.set_footer(text=footer)
+        await respond(interaction, embed=embed)
 
     except ZeroDivisionError:
         embed = discord.Embed(
@@ -827,7 +3408,7 @@ async def kalkulator(interaction: discord.Interaction, operasi: str):
         embed.add_field(
             name="💡 Tips:", value="Pastikan penyebut tidak bernilai 0", inline=False
         )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await respond(interaction, embed=embed, ephemeral=True)
 
     except ValueError as e:
         embed = discord.Embed(
@@ -840,7 +3421,7 @@ async def kalkulator(interaction: discord.Interaction, operasi: str):
             value="• Akar dari bilangan negatif\n• Operasi tidak valid\n• Syntax error",
             inline=False,
         )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await respond(interaction, embed=embed, ephemeral=True)
 
     except Exception as e:
         embed = discord.Embed(
@@ -853,7 +3434,7 @@ async def kalkulator(interaction: discord.Interaction, operasi: str):
             value="• Periksa syntax operasi\n• Gunakan tanda kurung jika perlu\n• Coba operasi yang lebih sederhana",
             inline=False,
         )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await respond(interaction, embed=embed, ephemeral=True)
 
 
 # Tool: Random Number Generator
@@ -961,37 +3542,565 @@ async def ping_command(interaction: discord.Interaction):
         status = "🔴 Poor"
         color = 0xFF0000
 
-    embed = discord.Embed(
-        title="🏓 Pong!", description=f"Bot latency: **{latency}ms**", color=color
-    )
+    embed = discord.Embed(
+        title="🏓 Pong!", description=f"Bot latency: **{latency}ms**", color=color
+    )
+
+    embed.add_field(name="📊 Status Koneksi", value=status, inline=True)
+
+    embed.add_field(name="📈 WebSocket Latency", value=f"{latency}ms", inline=True)
+
+    embed.set_footer(text=f"Requested by {interaction.user.display_name}")
+
+    await interaction.response.send_message(embed=embed)
+
+
+BREAKER_STATE_VALUES = {"closed": 0, "half-open": 1, "open": 2}
+
+
+def collect_runtime_gauges():
+    """Gauge yang dibaca langsung dari state (stats() tiap subsystem) saat scrape"""
+    upstream = http_client.stats()
+    yield (
+        "bot_upstream_breaker_state",
+        "State circuit breaker (0 closed, 1 half-open, 2 open)",
+        [
+            ({"upstream": host}, BREAKER_STATE_VALUES[stats["state"]])
+            for host, stats in upstream.items()
+        ],
+    )
+    for field, name, description in (
+        ("trips", "bot_upstream_breaker_trips", "Berapa kali breaker terbuka"),
+        ("rejected", "bot_upstream_rejected", "Request ditolak breaker terbuka"),
+        ("paced_seconds", "bot_upstream_paced_seconds", "Total waktu tunggu pacer"),
+    ):
+        yield (
+            name,
+            description,
+            [({"upstream": host}, stats[field]) for host, stats in upstream.items()],
+        )
+
+    cache = response_cache.stats()
+    yield ("bot_response_cache_entries", "Entry response cache", [({}, cache["size"])])
+    yield (
+        "bot_singleflight_inflight",
+        "Call upstream single-flight yang sedang jalan",
+        [({}, single_flight.stats()["inflight"])],
+    )
+
+    providers = [
+        ({"group": group.name, "provider": name}, stats)
+        for group in (meme_providers, quote_providers)
+        for name, stats in group.stats().items()
+    ]
+    yield (
+        "bot_provider_latency_seconds",
+        "EWMA latency provider meme/quote",
+        [
+            (labels, stats["latency_ms"] / 1000)
+            for labels, stats in providers
+            if stats["latency_ms"] is not None
+        ],
+    )
+    yield (
+        "bot_provider_error_rate",
+        "EWMA error rate provider meme/quote",
+        [(labels, stats["error_rate"]) for labels, stats in providers],
+    )
+    yield (
+        "bot_provider_wins",
+        "Berapa kali provider memberi jawaban yang dipakai",
+        [(labels, stats["wins"]) for labels, stats in providers],
+    )
+
+    pools = {name: pool.stats() for name, pool in content_pools.items()}
+    yield (
+        "bot_content_pool_items",
+        "Item siap kirim di pool prefetch",
+        [({"pool": name}, stats["size"]) for name, stats in pools.items()],
+    )
+    yield (
+        "bot_content_pool_events",
+        "Hit/miss/expired/duplicate pool prefetch",
+        [
+            ({"pool": name, "event": event}, stats[event])
+            for name, stats in pools.items()
+            for event in ("hits", "misses", "expired", "duplicates")
+        ],
+    )
+
+    yield (
+        "bot_welcome_bursting_guilds",
+        "Guild yang sedang menampung join burst",
+        [({}, welcome_pipeline.stats()["bursting_guilds"])],
+    )
+    crypto = bot.get_cog("CryptoCommand")
+    if crypto is not None:
+        batches = crypto.prices.stats()
+        yield (
+            "bot_crypto_price_requests",
+            "Coin yang diminta ke simple/price",
+            [({}, batches["requests"])],
+        )
+        yield (
+            "bot_crypto_price_batches",
+            "Call simple/price (satu call bisa berisi banyak coin)",
+            [({}, batches["batches"])],
+        )
+
+    if math.isfinite(bot.latency):
+        yield ("bot_gateway_latency_seconds", "Latency websocket", [({}, bot.latency)])
+    yield ("bot_guilds", "Jumlah server", [({}, len(bot.guilds))])
+
+
+metrics.collectors.append(collect_runtime_gauges)
+
+
+def format_ms(seconds):
+    return "-" if seconds is None else f"{seconds * 1000:.0f}ms"
+
+
+@bot.tree.command(name="stats", description="Statistik performa bot (admin)")
+@app_commands.default_permissions(administrator=True)
+async def stats_command(interaction: discord.Interaction):
+    embed = discord.Embed(
+        title="📈 Statistik Performa",
+        color=0x7289DA,
+        timestamp=datetime.now(timezone.utc),
+    )
+
+    # Per command: jumlah, p50/p95 durasi, error rate
+    outcomes = {}
+    for labels, count in metrics.series("bot_commands_total").items():
+        labels = dict(labels)
+        outcomes.setdefault(labels["command"], Counter())[labels["outcome"]] += count
+    durations = {
+        dict(labels)["command"]: histogram
+        for labels, histogram in metrics.series("bot_command_seconds").items()
+    }
+    upstream = {
+        dict(labels)["command"]: histogram
+        for labels, histogram in metrics.series("bot_command_upstream_seconds").items()
+    }
+    lines = []
+    top = sorted(outcomes.items(), key=lambda item: -item[1].total())[:10]
+    for command, counts in top:
+        total = counts.total()
+        duration = durations.get(command, Histogram())
+        spent = upstream.get(command, Histogram())
+        line = (
+            f"`/{command}` {total}x • p50 {format_ms(duration.quantile(0.5))}"
+            f" • p95 {format_ms(duration.quantile(0.95))}"
+        )
+        if spent.count:
+            line += f" • upstream {format_ms(spent.sum / spent.count)}"
+        line += f" • error {counts['error'] / total:.0%}"
+        if counts["rate_limited"]:
+            line += f" • limited {counts['rate_limited']}"
+        lines.append(line)
+    embed.add_field(
+        name="⚡ Commands",
+        value=shorten("\n".join(lines) or "Belum ada data"),
+        inline=False,
+    )
+
+    # Per upstream: p95 latency, error rate, state breaker
+    requests = {}
+    for labels, count in metrics.series("bot_upstream_requests_total").items():
+        labels = dict(labels)
+        requests.setdefault(labels["upstream"], Counter())[labels["outcome"]] += count
+    latencies = {
+        dict(labels)["upstream"]: histogram
+        for labels, histogram in metrics.series("bot_upstream_seconds").items()
+    }
+    guards = http_client.stats()
+    lines = []
+    for host, counts in sorted(requests.items(), key=lambda item: -item[1].total()):
+        total = counts.total()
+        # Request yang di-cancel (kalah hedge) tidak dihitung ke error rate
+        finished = total - counts["cancelled"]
+        error_rate = 1 - counts["ok"] / finished if finished else 0
+        latency = latencies.get(host, Histogram())
+        guard = guards.get(host)
+        line = (
+            f"`{host}` {total}x • p95 {format_ms(latency.quantile(0.95))}"
+            f" • error {error_rate:.0%}"
+            f" • {guard['state'] if guard else '-'}"
+        )
+        if guard and guard["trips"]:
+            line += f" • trip {guard['trips']} (tolak {guard['rejected']})"
+        if guard and guard["paced_seconds"]:
+            line += f" • pacing {guard['paced_seconds']}s"
+        lines.append(line)
+    embed.add_field(
+        name="🌐 Upstream",
+        value=shorten("\n".join(lines) or "Belum ada data"),
+        inline=False,
+    )
+
+    # Cache hit ratio per policy
+    lookups = {}
+    for labels, count in metrics.series("bot_cache_lookups_total").items():
+        labels = dict(labels)
+        lookups.setdefault(labels["policy"], Counter())[labels["result"]] += count
+    lines = [
+        f"`{policy}` hit {(counts['hit'] + counts['stale']) / counts.total():.0%}"
+        f" ({counts.total()} lookup)"
+        for policy, counts in sorted(lookups.items())
+    ]
+    lines.append(f"Entry: {response_cache.stats()['size']}")
+    coalesced = sum(metrics.series("bot_singleflight_coalesced_total").values())
+    if coalesced:
+        lines.append(f"Digabung (single-flight): {coalesced}")
+    embed.add_field(name="🗄️ Cache", value="\n".join(lines), inline=True)
+
+    lines = []
+    for name, pool in content_pools.items():
+        stats = pool.stats()
+        line = f"`{name}` {stats['size']}/{pool.size}"
+        taken = stats["hits"] + stats["misses"]
+        if taken:
+            line += f" • hit {stats['hits'] / taken:.0%}"
+        lines.append(line)
+    embed.add_field(name="📦 Pool Prefetch", value="\n".join(lines), inline=True)
+
+    # Provider meme/quote urut ranking sekarang
+    lines = [
+        f"`{name}` {format_ms(stats['latency_ms'] and stats['latency_ms'] / 1000)}"
+        f" • error {stats['error_rate']:.0%} • menang {stats['wins']}/{stats['calls']}"
+        for group in (meme_providers, quote_providers)
+        for name, stats in group.stats().items()
+        if stats["calls"]
+    ]
+    embed.add_field(
+        name="🎲 Provider",
+        value=shorten("\n".join(lines) or "Belum ada data"),
+        inline=False,
+    )
+
+    welcome = {
+        dict(labels)["outcome"]: count
+        for labels, count in metrics.series("bot_welcome_total").items()
+    }
+    embed.add_field(
+        name="👋 Welcome",
+        value=(
+            f"Terkirim {welcome.get('sent', 0)} • digabung {welcome.get('coalesced', 0)}"
+            f" • di-drop {welcome.get('dropped', 0)}"
+        ),
+        inline=True,
+    )
+
+    crypto = bot.get_cog("CryptoCommand")
+    if crypto is not None:
+        batches = crypto.prices.stats()
+        embed.add_field(
+            name="🪙 Harga Crypto",
+            value=f"{batches['requests']} coin dalam {batches['batches']} call",
+            inline=True,
+        )
+
+    if metrics_server.runner is not None:
+        embed.set_footer(
+            text=f"Prometheus: http://{metrics_server.host}:{metrics_server.port}/metrics"
+        )
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
+class GuildStats:
+    """Counter statistik satu guild"""
+
+    __slots__ = (
+        "bots",
+        "online",
+        "channels",
+        "text_channels",
+        "voice_channels",
+        "categories",
+    )
+
+    def __init__(self):
+        self.bots = 0
+        self.online = 0
+        self.channels = 0
+        self.text_channels = 0
+        self.voice_channels = 0
+        self.categories = 0
+
+    def add_channel(self, channel, delta=1):
+        self.channels += delta
+        if isinstance(channel, discord.TextChannel):
+            self.text_channels += delta
+        elif isinstance(channel, discord.VoiceChannel):
+            self.voice_channels += delta
+        elif isinstance(channel, discord.CategoryChannel):
+            self.categories += delta
+
+
+class GuildStatsTracker:
+    """Statistik per guild, di-seed sekali lalu di-update dari gateway event"""
+
+    def __init__(self):
+        self._guilds = {}
+
+    def seed(self, guild, members=None):
+        stats = GuildStats()
+        for member in guild.members if members is None else members:
+            if member.bot:
+                stats.bots += 1
+            if member.status != discord.Status.offline:
+                stats.online += 1
+        for channel in guild.channels:
+            stats.add_channel(channel)
+        self._guilds[guild.id] = stats
+        return stats
+
+    def is_seeded(self, guild):
+        return guild.id in self._guilds
+
+    def reseed(self, guild):
+        if guild.chunked:
+            self.seed(guild)
+        else:
+            # Belum di-chunk (mode lean): seed nanti saat pertama dibutuhkan
+            self.remove(guild)
+
+    async def ensure(self, guild):
+        stats = self._guilds.get(guild.id)
+        if stats is not None:
+            return stats
+        if guild.chunked:
+            return self.seed(guild)
+
+        # Chunk tanpa menyimpan member ke cache, request paralel digabung
+        members = await single_flight.do(
+            ("chunk", guild.id), lambda: guild.chunk(cache=False)
+        )
+        return self._guilds.get(guild.id) or self.seed(guild, members)
+
+    def remove(self, guild):
+        self._guilds.pop(guild.id, None)
+
+    def member_joined(self, member):
+        stats = self._guilds.get(member.guild.id)
+        if stats is None:
+            return
+        if member.bot:
+            stats.bots += 1
+        if member.status != discord.Status.offline:
+            stats.online += 1
+
+    def member_removed(self, guild_id, user):
+        stats = self._guilds.get(guild_id)
+        if stats is None:
+            return
+        if user.bot:
+            stats.bots -= 1
+        # user berupa User (tanpa status) kalau member tidak ada di cache
+        if isinstance(user, discord.Member) and user.status != discord.Status.offline:
+            stats.online = max(stats.online - 1, 0)
+
+    def presence_changed(self, before, after):
+        stats = self._guilds.get(after.guild.id)
+        if stats is None:
+            return
+        was_online = before.status != discord.Status.offline
+        is_online = after.status != discord.Status.offline
+        if was_online != is_online:
+            stats.online += 1 if is_online else -1
+
+    def channel_changed(self, channel, delta):
+        stats = self._guilds.get(channel.guild.id)
+        if stats is not None:
+            stats.add_channel(channel, delta)
+
+
+guild_stats = GuildStatsTracker()
+
+
+MASK64 = (1 << 64) - 1
+
+
+def mix64(value):
+    """splitmix64 finalizer, hash 64-bit yang merata untuk id Discord"""
+    value = (value + 0x9E3779B97F4A7C15) & MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK64
+    return value ^ (value >> 31)
+
+
+class HyperLogLog:
+    """Estimasi jumlah distinct dengan memory tetap (2^p byte, error ~1.04/sqrt(2^p))"""
+
+    def __init__(self, p=14):
+        self.p = p
+        self.m = 1 << p
+        self.registers = bytearray(self.m)
+        self.alpha = 0.7213 / (1 + 1.079 / self.m)
+
+    def add(self, value):
+        x = mix64(value)
+        index = x >> (64 - self.p)
+        rest = x & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self):
+        estimate = self.alpha * self.m * self.m / sum(2.0**-r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.m and zeros:
+            # Koreksi untuk cardinality kecil (linear counting)
+            estimate = self.m * math.log(self.m / zeros)
+        return int(estimate)
+
+
+BOT_STATS_MODE = os.getenv("BOT_STATS_MODE", "exact").lower()  # exact / approx
+if MEMBER_CACHE_MODE == "lean":
+    # Tanpa member list lengkap, unique user tidak bisa dihitung
+    BOT_STATS_MODE = "none"
+
+
+class GlobalStats:
+    """Counter global untuk /botinfo, di-update dari gateway event"""
+
+    def __init__(self, mode=BOT_STATS_MODE):
+        self.mode = mode
+        self.reset()
+
+    def reset(self):
+        self.guilds = 0
+        self.members = 0
+        self.channels = 0
+        # exact: refcount user_id -> jumlah guild, approx: HyperLogLog (tanpa removal)
+        self.user_guilds = Counter()
+        self.user_sketch = HyperLogLog() if self.mode == "approx" else None
+
+    @property
+    def tracks_users(self):
+        return self.mode in ("exact", "approx")
+
+    @property
+    def unique_users(self):
+        if self.user_sketch is not None:
+            return self.user_sketch.count()
+        return len(self.user_guilds) if self.tracks_users else None
+
+    def seed(self, guilds):
+        self.reset()
+        for guild in guilds:
+            self.guild_joined(guild)
+
+    def _add_user(self, user_id):
+        if self.user_sketch is not None:
+            self.user_sketch.add(user_id)
+        elif self.tracks_users:
+            self.user_guilds[user_id] += 1
+
+    def _remove_user(self, user_id):
+        # HyperLogLog tidak bisa dikurangi, angka approx turun saat seed ulang
+        if self.user_sketch is None and user_id in self.user_guilds:
+            self.user_guilds[user_id] -= 1
+            if self.user_guilds[user_id] <= 0:
+                del self.user_guilds[user_id]
+
+    def guild_joined(self, guild):
+        self.guilds += 1
+        self.members += guild.member_count or 0
+        self.channels += len(guild.channels)
+        if self.tracks_users:
+            for member in guild.members:
+                self._add_user(member.id)
+
+    def guild_removed(self, guild):
+        self.guilds -= 1
+        self.members -= guild.member_count or 0
+        self.channels -= len(guild.channels)
+        if self.tracks_users:
+            for member in guild.members:
+                self._remove_user(member.id)
+
+    def member_joined(self, member):
+        self.members += 1
+        self._add_user(member.id)
+
+    def member_removed(self, user):
+        self.members -= 1
+        self._remove_user(user.id)
+
+
+global_stats = GlobalStats()
+
+
+@bot.listen("on_ready")
+async def seed_guild_stats():
+    # Seed ulang setiap ready, event bisa terlewat saat reconnect
+    for guild in bot.guilds:
+        guild_stats.reseed(guild)
+    global_stats.seed(bot.guilds)
+
 
-    embed.add_field(name="📊 Status Koneksi", value=status, inline=True)
+@bot.listen("on_guild_join")
+async def track_guild_join(guild):
+    guild_stats.reseed(guild)
+    global_stats.guild_joined(guild)
 
-    embed.add_field(name="📈 WebSocket Latency", value=f"{latency}ms", inline=True)
 
-    embed.set_footer(text=f"Requested by {interaction.user.display_name}")
+@bot.listen("on_guild_remove")
+async def track_guild_remove(guild):
+    guild_stats.remove(guild)
+    global_stats.guild_removed(guild)
 
-    await interaction.response.send_message(embed=embed)
+
+@bot.listen("on_member_join")
+async def track_member_join(member):
+    member_cache.touch(member)
+    guild_stats.member_joined(member)
+    global_stats.member_joined(member)
+
+
+@bot.listen("on_raw_member_remove")
+async def track_member_remove(payload):
+    # Raw event tetap datang walaupun member tidak ada di cache
+    guild_stats.member_removed(payload.guild_id, payload.user)
+    global_stats.member_removed(payload.user)
+
+
+@bot.listen("on_presence_update")
+async def track_presence_update(before, after):
+    # Hanya jalan kalau intents.presences aktif
+    guild_stats.presence_changed(before, after)
+
+
+@bot.listen("on_guild_channel_create")
+async def track_channel_create(channel):
+    guild_stats.channel_changed(channel, 1)
+    global_stats.channels += 1
+
+
+@bot.listen("on_guild_channel_delete")
+async def track_channel_delete(channel):
+    guild_stats.channel_changed(channel, -1)
+    global_stats.channels -= 1
 
 
 @bot.tree.command(name="serverinfo", description="Informasi lengkap tentang server ini")
 async def server_info(interaction: discord.Interaction):
     guild = interaction.guild
 
-    # Hitung berbagai statistik
-    text_channels = len(
-        [ch for ch in guild.channels if isinstance(ch, discord.TextChannel)]
-    )
-    voice_channels = len(
-        [ch for ch in guild.channels if isinstance(ch, discord.VoiceChannel)]
-    )
-    categories = len(guild.categories)
+    # Guild yang belum di-chunk (mode lean) butuh waktu, defer dulu
+    if not guild_stats.is_seeded(guild):
+        await interaction.response.defer()
+
+    # Statistik diambil dari counter, tidak perlu iterasi member/channel
+    stats = await guild_stats.ensure(guild)
+    text_channels = stats.text_channels
+    voice_channels = stats.voice_channels
+    categories = stats.categories
 
     # Status member
-    online_members = len(
-        [m for m in guild.members if m.status != discord.Status.offline]
-    )
-    bot_count = len([m for m in guild.members if m.bot])
+    online_members = stats.online
+    bot_count = stats.bots
     human_count = guild.member_count - bot_count
 
     embed = discord.Embed(
@@ -1022,8 +4131,8 @@ async def server_info(interaction: discord.Interaction):
         value=(
             f"**Total:** {guild.member_count:,}\n"
             f"**Humans:** {human_count:,}\n"
-            f"**Bots:** {bot_count:,}\n"
-            f"**Online:** {online_members:,}"
+            f"**Bots:** {bot_count:,}"
+            + (f"\n**Online:** {online_members:,}" if PRESENCE_INTENT else "")
         ),
         inline=True,
     )
@@ -1035,7 +4144,7 @@ async def server_info(interaction: discord.Interaction):
             f"**Text:** {text_channels}\n"
             f"**Voice:** {voice_channels}\n"
             f"**Categories:** {categories}\n"
-            f"**Total:** {len(guild.channels)}"
+            f"**Total:** {stats.channels}"
         ),
         inline=True,
     )
@@ -1061,7 +4170,10 @@ async def server_info(interaction: discord.Interaction):
         icon_url=interaction.user.display_avatar.url,
     )
 
-    await interaction.response.send_message(embed=embed)
+    if interaction.response.is_done():
+        await interaction.followup.send(embed=embed)
+    else:
+        await interaction.response.send_message(embed=embed)
 
 
 @bot.tree.command(name="userinfo", description="Informasi tentang user tertentu")
@@ -1165,28 +4277,110 @@ async def user_info(interaction: discord.Interaction, user: discord.Member = Non
     await interaction.response.send_message(embed=embed)
 
 
-# Welcome/Leave Events
-@bot.event
-async def on_member_join(member):
-    """Event ketika member baru join server"""
-    try:
-        # Cari channel welcome (bisa disesuaikan)
-        welcome_channel = None
-
-        # Cari channel dengan nama yang mengandung 'welcome', 'general', atau 'lobby'
-        for channel in member.guild.text_channels:
-            if any(
-                name in channel.name.lower()
-                for name in ["welcome", "general", "lobby", "main"]
-            ):
-                welcome_channel = channel
-                break
+def parse_channel_overrides(value):
+    """Format env: guild_id:channel_id,guild_id:channel_id"""
+    overrides = {}
+    for pair in value.split(","):
+        if ":" in pair:
+            guild_id, channel_id = pair.split(":", 1)
+            overrides[int(guild_id)] = int(channel_id)
+    return overrides
+
+
+_UNSCANNED = object()
+
+
+class ChannelResolver:
+    """Cache channel welcome/goodbye per guild, di-invalidate dari event channel"""
+
+    def __init__(self, keywords, overrides=None):
+        self.keywords = keywords
+        self.overrides = overrides or {}
+        self._cache = {}
+
+    def resolve(self, guild):
+        # Channel yang dikonfigurasi manual selalu menang
+        override = guild.get_channel(self.overrides.get(guild.id, 0))
+        if override is not None:
+            return override
+
+        cached = self._cache.get(guild.id, _UNSCANNED)
+        if cached is None:
+            # Sudah di-scan dan tidak ada channel; cache dibuang oleh event channel
+            return None
+        if cached is not _UNSCANNED:
+            channel = guild.get_channel(cached)
+            if channel is not None:
+                return channel
+
+        channel = self._scan(guild)
+        self._cache[guild.id] = channel.id if channel else None
+        return channel
+
+    def _scan(self, guild):
+        # Cari channel dengan nama yang mengandung salah satu keyword
+        for channel in guild.text_channels:
+            if any(name in channel.name.lower() for name in self.keywords):
+                return channel
 
         # Jika tidak ada, gunakan system channel atau channel pertama
-        if not welcome_channel:
-            welcome_channel = (
-                member.guild.system_channel or member.guild.text_channels[0]
-            )
+        if guild.system_channel:
+            return guild.system_channel
+        return guild.text_channels[0] if guild.text_channels else None
+
+    def invalidate(self, guild_id):
+        self._cache.pop(guild_id, None)
+
+
+welcome_channels = ChannelResolver(
+    ["welcome", "general", "lobby", "main"],
+    parse_channel_overrides(os.getenv("WELCOME_CHANNELS", "")),
+)
+goodbye_channels = ChannelResolver(
+    ["goodbye", "leave", "general", "lobby"],
+    parse_channel_overrides(os.getenv("GOODBYE_CHANNELS", "")),
+)
+
+
+def invalidate_channel_cache(guild):
+    welcome_channels.invalidate(guild.id)
+    goodbye_channels.invalidate(guild.id)
+
+
+@bot.listen()
+async def on_guild_channel_create(channel):
+    invalidate_channel_cache(channel.guild)
+
+
+@bot.listen()
+async def on_guild_channel_delete(channel):
+    invalidate_channel_cache(channel.guild)
+
+
+@bot.listen()
+async def on_guild_channel_update(before, after):
+    # Hasil scan cuma bergantung pada nama dan urutan channel
+    if before.name != after.name or before.position != after.position:
+        invalidate_channel_cache(after.guild)
+
+
+@bot.listen()
+async def on_guild_update(before, after):
+    if before.system_channel != after.system_channel:
+        invalidate_channel_cache(after)
+
+
+@bot.listen()
+async def on_guild_remove(guild):
+    invalidate_channel_cache(guild)
+
+
+# Welcome/Leave Events
+async def send_welcome(member):
+    """Kirim welcome message (dengan banner) untuk satu member"""
+    try:
+        # Cari channel welcome (cache per guild, bisa di-override lewat WELCOME_CHANNELS)
+        welcome_channel = welcome_channels.resolve(member.guild)
 
         if welcome_channel:
             # Buat welcome banner
@@ -1224,35 +4418,178 @@ async def on_member_join(member):
 
             # Send welcome message
             if banner:
-                file = discord.File(banner, filename="welcome_banner.png")
-                embed.set_image(url="attachment://welcome_banner.png")
+                filename = f"welcome_banner.{banner_renderer.extension}"
+                file = discord.File(banner, filename=filename)
+                embed.set_image(url=f"attachment://{filename}")
                 await welcome_channel.send(file=file, embed=embed)
             else:
                 await welcome_channel.send(embed=embed)
 
     except Exception as e:
-        print(f"Error in welcome event: {e}")
+        log.exception(
+            "Error in welcome event: %s",
+            e,
+            extra={"event": "welcome", "guild": member.guild.id, "user": member.id},
+        )
+
+
+async def send_burst_welcome(guild, members):
+    """Satu welcome gabungan untuk banyak member yang join beruntun"""
+    try:
+        welcome_channel = welcome_channels.resolve(guild)
+        if not welcome_channel:
+            return
+
+        mentions = [member.mention for member in members[:WELCOME_BURST_MAX_MENTIONS]]
+        others = len(members) - len(mentions)
+        if others:
+            names = f"{', '.join(mentions)} and {others} others"
+        elif len(mentions) > 1:
+            names = f"{', '.join(mentions[:-1])} and {mentions[-1]}"
+        else:
+            names = mentions[0]
+
+        embed = discord.Embed(
+            title="🎉 Welcome to the Server!",
+            description=f"Hey {names}, welcome to **{guild.name}**!",
+            color=0x00FF7F,
+            timestamp=datetime.now(timezone.utc),
+        )
+
+        embed.add_field(
+            name="👥 New Members",
+            value=(
+                f"**{len(members)}** members just joined\n"
+                f"**Member #{guild.member_count}**"
+            ),
+            inline=True,
+        )
+
+        embed.add_field(
+            name="📋 Getting Started",
+            value=(
+                "• Read the server rules\n"
+                "• Introduce yourself\n"
+                "• Have fun chatting!"
+            ),
+            inline=True,
+        )
+
+        if guild.icon:
+            embed.set_thumbnail(url=guild.icon.url)
+        embed.set_footer(text=f"Welcome to {guild.name}!")
+
+        await welcome_channel.send(embed=embed)
+
+    except Exception as e:
+        log.exception(
+            "Error in burst welcome: %s",
+            e,
+            extra={"event": "welcome", "guild": guild.id},
+        )
+
+
+# Burst mode: kalau ada >= THRESHOLD join dalam WINDOW detik, welcome digabung
+WELCOME_BURST_WINDOW = float(os.getenv("WELCOME_BURST_WINDOW", "5"))
+WELCOME_BURST_THRESHOLD = int(os.getenv("WELCOME_BURST_THRESHOLD", "3"))
+WELCOME_BURST_MAX_MENTIONS = int(os.getenv("WELCOME_BURST_MAX_MENTIONS", "10"))
+WELCOME_BURST_MAX_PENDING = int(os.getenv("WELCOME_BURST_MAX_PENDING", "1000"))
+
+
+class WelcomePipeline:
+    """Welcome per member saat sepi, digabung per window saat ada join burst"""
+
+    def __init__(
+        self,
+        send_single,
+        send_burst,
+        window=WELCOME_BURST_WINDOW,
+        threshold=WELCOME_BURST_THRESHOLD,
+        max_pending=WELCOME_BURST_MAX_PENDING,
+    ):
+        self.send_single = send_single
+        self.send_burst = send_burst
+        self.window = window
+        self.threshold = threshold
+        self.max_pending = max_pending
+        self._recent = {}
+        self._pending = {}
+        self._tasks = set()
+        self.sent = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+    async def member_joined(self, member):
+        guild_id = member.guild.id
+
+        # Burst sedang berjalan: tampung sampai window selesai
+        pending = self._pending.get(guild_id)
+        if pending is not None:
+            if len(pending) >= self.max_pending:
+                self.dropped += 1
+                metrics.inc("bot_welcome_total", outcome="dropped")
+            else:
+                pending.append(member)
+            return
+
+        # Cukup simpan timestamp THRESHOLD join terakhir per guild
+        now = time.monotonic()
+        recent = self._recent.get(guild_id)
+        if recent is None:
+            recent = self._recent[guild_id] = deque(maxlen=self.threshold)
+        recent.append(now)
+
+        if len(recent) < self.threshold or now - recent[0] > self.window:
+            self.sent += 1
+            metrics.inc("bot_welcome_total", outcome="sent")
+            await self.send_single(member)
+            return
+
+        self._pending[guild_id] = [member]
+        task = asyncio.create_task(self._flush_later(member.guild))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush_later(self, guild):
+        await asyncio.sleep(self.window)
+        members = self._pending.pop(guild.id, [])
+        if not members:
+            return
+        self.sent += 1
+        self.coalesced += len(members)
+        metrics.inc("bot_welcome_total", outcome="sent")
+        metrics.inc("bot_welcome_total", len(members), outcome="coalesced")
+        await self.send_burst(guild, members)
+
+    def stats(self):
+        return {
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "bursting_guilds": len(self._pending),
+        }
+
+
+welcome_pipeline = WelcomePipeline(send_welcome, send_burst_welcome)
 
 
 @bot.event
-async def on_member_remove(member):
-    """Event ketika member leave server"""
+async def on_member_join(member):
+    """Event ketika member baru join server"""
+    await welcome_pipeline.member_joined(member)
+
+
+@bot.event
+async def on_raw_member_remove(payload):
+    """Event ketika member leave server (juga untuk member yang tidak di-cache)"""
     try:
-        # Cari channel untuk goodbye message
-        goodbye_channel = None
-
-        for channel in member.guild.text_channels:
-            if any(
-                name in channel.name.lower()
-                for name in ["goodbye", "leave", "general", "lobby"]
-            ):
-                goodbye_channel = channel
-                break
+        member = payload.user
+        guild = bot.get_guild(payload.guild_id)
+        if guild is None:
+            return
 
-        if not goodbye_channel:
-            goodbye_channel = (
-                member.guild.system_channel or member.guild.text_channels[0]
-            )
+        # Cari channel untuk goodbye message
+        goodbye_channel = goodbye_channels.resolve(guild)
 
         if goodbye_channel:
             embed = discord.Embed(
@@ -1264,7 +4601,7 @@ async def on_member_remove(member):
 
             embed.add_field(
                 name="📊 Member Stats",
-                value=f"We now have **{member.guild.member_count}** members.",
+                value=f"We now have **{guild.member_count}** members.",
                 inline=False,
             )
 
@@ -1274,7 +4611,15 @@ async def on_member_remove(member):
             await goodbye_channel.send(embed=embed)
 
     except Exception as e:
-        print(f"Error in goodbye event: {e}")
+        log.exception(
+            "Error in goodbye event: %s",
+            e,
+            extra={
+                "event": "goodbye",
+                "guild": payload.guild_id,
+                "user": payload.user.id,
+            },
+        )
 
 
 # Error handling
@@ -1337,18 +4682,318 @@ async def on_app_command_error(interaction: discord.Interaction, error):
             pass
 
 
+COINGECKO_API = "https://api.coingecko.com/api/v3"
+CRYPTO_BATCH_WINDOW = float(os.getenv("CRYPTO_BATCH_WINDOW", "0.075"))
+CRYPTO_BATCH_MAX_IDS = int(os.getenv("CRYPTO_BATCH_MAX_IDS", "100"))
+
+
+class CoinPriceBatcher:
+    """Kumpulkan request harga dalam satu window lalu kirim satu call simple/price multi-id"""
+
+    url = f"{COINGECKO_API}/simple/price"
+    params = {
+        "vs_currencies": "usd,idr",
+        "include_24hr_change": "true",
+        "include_market_cap": "true",
+        "include_24hr_vol": "true",
+    }
+
+    def __init__(self, window=CRYPTO_BATCH_WINDOW, max_ids=CRYPTO_BATCH_MAX_IDS):
+        self.window = window
+        self.max_ids = max_ids
+        self._pending = {}
+        self._inflight = {}  # coin id -> future batch yang sedang di-fetch
+        self._flush_handle = None
+        self._tasks = set()
+        self.requests = 0
+        self.batches = 0
+
+    async def get(self, coin_id):
+        """Data harga satu coin: dict, {} kalau id tidak dikenal, None kalau upstream gagal"""
+        key = cache_key(self.url, {"ids": coin_id})
+        return await response_cache.get_or_fetch(
+            key, lambda: self._enqueue(coin_id), "crypto_price"
+        )
+
+    async def _enqueue(self, coin_id):
+        future = self._pending.get(coin_id) or self._inflight.get(coin_id)
+        if future is None:
+            self.requests += 1
+            future = asyncio.get_running_loop().create_future()
+            # Exception tetap "diambil" walaupun semua caller sudah cancel
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            self._pending[coin_id] = future
+            if len(self._pending) >= self.max_ids:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = asyncio.get_running_loop().call_later(
+                    self.window, self._flush
+                )
+        return await asyncio.shield(future)
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            task = asyncio.create_task(self._send(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch):
+        self.batches += 1
+        self._inflight.update(batch)
+        params = dict(self.params, ids=",".join(batch))
+        try:
+            data = await http_client.get_json(self.url, params=params)
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            for coin_id, future in batch.items():
+                if self._inflight.get(coin_id) is future:
+                    del self._inflight[coin_id]
+
+        # Fan-out hasil ke setiap interaction yang menunggu
+        for coin_id, future in batch.items():
+            if not future.done():
+                future.set_result(None if data is None else data.get(coin_id, {}))
+
+    def close(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        for future in self._pending.values():
+            future.cancel()
+        self._pending = {}
+
+    def stats(self):
+        return {"requests": self.requests, "batches": self.batches}
+
+
+COIN_INDEX_REFRESH_HOURS = float(os.getenv("COIN_INDEX_REFRESH_HOURS", "6"))
+COIN_INDEX_PREFIX_SCAN = 500
+UNRANKED = 1_000_000
+
+
+class CoinIndex:
+    """Index lokal symbol/nama/id -> id CoinGecko, di-refresh berkala di background"""
+
+    def __init__(self):
+        self.coins = {}
+        self.by_symbol = {}
+        self.by_name = {}
+        self.labels = []
+        self.loaded_at = None
+
+    @property
+    def ready(self):
+        return self.loaded_at is not None
+
+    def build(self, coins, ranks):
+        """coins dari /coins/list, ranks: id -> market cap rank"""
+
+        def rank_of(coin):
+            return ranks.get(coin["id"], UNRANKED)
+
+        entries = {}
+        by_symbol = {}
+        by_name = {}
+        labels = []
+
+        # Urutkan dari rank terbaik supaya setdefault menyimpan coin paling relevan
+        for coin in sorted(coins, key=rank_of):
+            coin_id = coin["id"]
+            symbol = (coin.get("symbol") or "").lower().strip()
+            name = (coin.get("name") or "").lower().strip()
+            rank = rank_of(coin)
+
+            entries[coin_id] = (coin.get("name") or coin_id, symbol.upper(), rank)
+            if symbol:
+                by_symbol.setdefault(symbol, coin_id)
+            if name:
+                by_name.setdefault(name, coin_id)
+            for label in {coin_id, symbol, name}:
+                if label:
+                    labels.append((label, rank, coin_id))
+
+        labels.sort()
+        self.coins = entries
+        self.by_symbol = by_symbol
+        self.by_name = by_name
+        self.labels = labels
+        self.loaded_at = time.monotonic()
+
+    def resolve(self, query):
+        """Cari id canonical: id persis, symbol, nama, lalu prefix terbaik"""
+        query = query.lower().strip()
+        if query in self.coins:
+            return query
+        coin_id = self.by_symbol.get(query) or self.by_name.get(query)
+        if coin_id:
+            return coin_id
+        matches = self.complete(query, limit=1)
+        return matches[0] if matches else None
+
+    def complete(self, prefix, limit=25):
+        """Id coin yang label-nya diawali prefix, diurutkan dari rank terbaik"""
+        prefix = prefix.lower().strip()
+        if not prefix:
+            return []
+
+        start = bisect.bisect_left(self.labels, (prefix,))
+        best = {}
+        for label, rank, coin_id in itertools.islice(
+            self.labels, start, start + COIN_INDEX_PREFIX_SCAN
+        ):
+            if not label.startswith(prefix):
+                break
+            # Label lebih pendek = match lebih dekat, dipakai sebagai tie-breaker
+            score = (rank, len(label))
+            if coin_id not in best or score < best[coin_id]:
+                best[coin_id] = score
+
+        return sorted(best, key=best.get)[:limit]
+
+    def describe(self, coin_id):
+        name, symbol, _ = self.coins.get(coin_id, (coin_id, "", UNRANKED))
+        return f"{name} ({symbol})" if symbol else name
+
+    async def refresh(self):
+        coins = await http_client.get_json(f"{COINGECKO_API}/coins/list")
+        if not coins:
+            raise Exception("Failed to fetch coin list")
+
+        markets = await http_client.get_json(
+            f"{COINGECKO_API}/coins/markets",
+            params={"vs_currency": "usd", "order": "market_cap_desc", "per_page": 250},
+        )
+        ranks = {
+            market["id"]: market["market_cap_rank"]
+            for market in markets or []
+            if market.get("market_cap_rank")
+        }
+
+        self.build(coins, ranks)
+
+
+PRICE_TICKER_INTERVAL = float(os.getenv("PRICE_TICKER_INTERVAL", "60"))
+PRICE_TICKER_COINS = int(os.getenv("PRICE_TICKER_COINS", "250"))
+PRICE_SNAPSHOT_MAX_AGE = float(os.getenv("PRICE_SNAPSHOT_MAX_AGE", "300"))
+
+
+class PriceSnapshot(
+    namedtuple("PriceSnapshot", "usd idr change_24h market_cap volume_24h")
+):
+    __slots__ = ()
+
+    def as_price_data(self):
+        """Format sama dengan response simple/price"""
+        return {
+            "usd": self.usd,
+            "idr": self.idr,
+            "usd_24h_change": self.change_24h,
+            "usd_market_cap": self.market_cap,
+            "usd_24h_vol": self.volume_24h,
+        }
+
+
+class PriceTicker:
+    """Snapshot harga top coin di memory, di-poll dari /coins/markets secara berkala"""
+
+    def __init__(self, coins=PRICE_TICKER_COINS, max_age=PRICE_SNAPSHOT_MAX_AGE):
+        self.coins = coins
+        self.max_age = max_age
+        self.snapshot = {}
+        self.updated_at = None
+
+    def get(self, coin_id):
+        """Return (PriceSnapshot, umur data dalam detik) atau None kalau tidak ada/basi"""
+        if self.updated_at is None:
+            return None
+        age = time.monotonic() - self.updated_at
+        entry = self.snapshot.get(coin_id)
+        if entry is None or age > self.max_age:
+            return None
+        return entry, age
+
+    async def refresh(self):
+        # Kurs USD -> IDR dari exchange_rates (basisnya BTC)
+        idr_rate = None
+        rates = await http_client.get_json(f"{COINGECKO_API}/exchange_rates")
+        if rates and "rates" in rates:
+            idr_rate = rates["rates"]["idr"]["value"] / rates["rates"]["usd"]["value"]
+
+        snapshot = {}
+        pages = math.ceil(self.coins / 250)
+        for page in range(1, pages + 1):
+            markets = await http_client.get_json(
+                f"{COINGECKO_API}/coins/markets",
+                params={
+                    "vs_currency": "usd",
+                    "order": "market_cap_desc",
+                    "per_page": min(250, self.coins),
+                    "page": page,
+                },
+            )
+            if not markets:
+                raise Exception(f"Failed to fetch markets page {page}")
+
+            for market in markets:
+                price = market.get("current_price")
+                snapshot[market["id"]] = PriceSnapshot(
+                    usd=price,
+                    idr=price * idr_rate if price is not None and idr_rate else None,
+                    change_24h=market.get("price_change_percentage_24h") or 0,
+                    market_cap=market.get("market_cap"),
+                    volume_24h=market.get("total_volume"),
+                )
+
+        self.snapshot = snapshot
+        self.updated_at = time.monotonic()
+
+
 class CryptoCommand(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.session = None
+        self.prices = CoinPriceBatcher()
+        self.coin_index = CoinIndex()
+        self.ticker = PriceTicker()
 
-    async def setup_session(self):
-        if self.session is None:
-            self.session = aiohttp.ClientSession()
+    async def cog_load(self):
+        self.refresh_coin_index.start()
+        self.price_ticker.start()
 
     async def cog_unload(self):
-        if self.session:
-            await self.session.close()
+        self.refresh_coin_index.cancel()
+        self.price_ticker.cancel()
+        self.prices.close()
+
+    @tasks.loop(seconds=PRICE_TICKER_INTERVAL)
+    async def price_ticker(self):
+        try:
+            await self.ticker.refresh()
+        except Exception as e:
+            log.warning("Error refreshing price ticker: %s", e)
+
+    @tasks.loop(hours=COIN_INDEX_REFRESH_HOURS)
+    async def refresh_coin_index(self):
+        try:
+            await self.coin_index.refresh()
+            log.info(
+                "🪙 Coin index loaded: %s coins", f"{len(self.coin_index.coins):,}"
+            )
+        except Exception as e:
+            log.warning("Error refreshing coin index: %s", e)
+
+    @price_ticker.before_loop
+    @refresh_coin_index.before_loop
+    async def wait_for_gateway(self):
+        # Jangan rebutan network dengan gateway saat cold start
+        await self.bot.wait_until_ready()
 
     @app_commands.command(
         name="crypto", description="Menampilkan informasi harga cryptocurrency"
@@ -1357,170 +5002,180 @@ class CryptoCommand(commands.Cog):
         coin="Simbol atau nama cryptocurrency (contoh: BTC, ETH, bitcoin)"
     )
     async def crypto(self, interaction: discord.Interaction, coin: str):
-        await self.setup_session()
-
         try:
-            # CoinGecko API endpoint
-            url = f"https://api.coingecko.com/api/v3/simple/price"
-            params = {
-                "ids": coin.lower(),
-                "vs_currencies": "usd,idr",
-                "include_24hr_change": "true",
-                "include_market_cap": "true",
-                "include_24hr_vol": "true",
-            }
+            # Resolve lewat index lokal dulu, jadi cukup satu call ke upstream
+            coin_id = coin.lower().strip()
+            if self.coin_index.ready:
+                coin_id = self.coin_index.resolve(coin_id)
+                if coin_id is None:
+                    embed = discord.Embed(
+                        title="❌ Error",
+                        description=f"Cryptocurrency '{coin}' tidak ditemukan!",
+                        color=0xFF0000,
+                        timestamp=datetime.now(timezone.utc),
+                    )
+                    await respond(interaction, embed=embed)
+                    return
+
+            # Top coin dijawab dari snapshot ticker tanpa menunggu network
+            data_age = None
+            cached = self.ticker.get(coin_id)
+            if cached is not None:
+                snapshot, data_age = cached
+                coin_data = snapshot.as_price_data()
+            else:
+                # Harga dari network bisa kena pacing upstream, defer dulu
+                await interaction.response.defer()
+                coin_data = await self.prices.get(coin_id)
+
+            if coin_data is None:
+                embed = discord.Embed(
+                    title="❌ Error",
+                    description="Gagal mengambil data cryptocurrency. Silakan coba lagi.",
+                    color=0xFF0000,
+                    timestamp=datetime.now(timezone.utc),
+                )
+                await respond(interaction, embed=embed)
+                return
+
+            if not coin_data and not self.coin_index.ready:
+                # Index belum siap: fallback ke search CoinGecko
+                search_url = f"{COINGECKO_API}/search"
+                search_params = {"query": coin}
+
+                search_data = await fetch_json(
+                    search_url, params=search_params, policy="crypto_search"
+                )
+                if search_data is None:
+                    raise Exception("Failed to search cryptocurrency")
+
+                coins = search_data.get("coins", [])
 
-            # Try with coin as ID first
-            async with self.session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if not data:
-                        # If no data with ID, try searching by symbol
-                        search_url = "https://api.coingecko.com/api/v3/search"
-                        search_params = {"query": coin}
-
-                        async with self.session.get(
-                            search_url, params=search_params
-                        ) as search_response:
-                            if search_response.status == 200:
-                                search_data = await search_response.json()
-                                coins = search_data.get("coins", [])
-
-                                if coins:
-                                    # Use the first match
-                                    coin_id = coins[0]["id"]
-                                    params["ids"] = coin_id
-
-                                    async with self.session.get(
-                                        url, params=params
-                                    ) as retry_response:
-                                        if retry_response.status == 200:
-                                            data = await retry_response.json()
-                                        else:
-                                            raise Exception(
-                                                "Failed to fetch crypto data"
-                                            )
-                                else:
-                                    embed = discord.Embed(
-                                        title="❌ Error",
-                                        description=f"Cryptocurrency '{coin}' tidak ditemukan!",
-                                        color=0xFF0000,
-                                        timestamp=datetime.now(timezone.utc),
-                                    )
-                                    await interaction.response.send_message(embed=embed)
-                                    return
-                            else:
-                                raise Exception("Failed to search cryptocurrency")
-
-                    if data:
-                        # Get the first (and should be only) result
-                        coin_data = list(data.values())[0]
-                        coin_name = list(data.keys())[0].title()
-                        coin_id = list(data.keys())[0]  # Store coin ID for chart
-
-                        # Create embed
-                        embed = discord.Embed(
-                            title=f"💰 {coin_name.upper()} Price Information",
-                            color=(
-                                0x00FF00
-                                if coin_data.get("usd_24h_change", 0) >= 0
-                                else 0xFF0000
-                            ),
-                            timestamp=datetime.now(timezone.utc),
-                        )
-
-                        # Price information
-                        usd_price = coin_data.get("usd", "N/A")
-                        idr_price = coin_data.get("idr", "N/A")
-                        change_24h = coin_data.get("usd_24h_change", 0)
-                        market_cap = coin_data.get("usd_market_cap", "N/A")
-                        volume_24h = coin_data.get("usd_24h_vol", "N/A")
-
-                        # Price Info
-                        embed.add_field(
-                            name="💵 Price Information",
-                            value=(
-                                f"**USD:** ${usd_price:,.8f}\n"
-                                if isinstance(usd_price, (int, float))
-                                else f"**USD:** {usd_price}\n"
-                            )
-                            + (
-                                f"**IDR:** Rp {idr_price:,.2f}"
-                                if isinstance(idr_price, (int, float))
-                                else f"**IDR:** {idr_price}"
-                            ),
-                            inline=False,
-                        )
-
-                        # 24h Change
-                        change_emoji = "📈" if change_24h >= 0 else "📉"
-                        change_color = "+" if change_24h >= 0 else ""
-                        embed.add_field(
-                            name=f"{change_emoji} 24h Performance",
-                            value=f"**Change:** {change_color}{change_24h:.2f}%",
-                            inline=True,
-                        )
-
-                        # Market Data
-                        market_info = ""
-                        if isinstance(market_cap, (int, float)):
-                            market_info += f"**Market Cap:** ${market_cap:,.0f}\n"
-                        if isinstance(volume_24h, (int, float)):
-                            market_info += f"**24h Volume:** ${volume_24h:,.0f}"
-
-                        if market_info:
-                            embed.add_field(
-                                name="📊 Market Data",
-                                value=market_info,
-                                inline=True,
-                            )
-
-                        embed.set_footer(
-                            text=f"Requested by {interaction.user.display_name} • Data from CoinGecko API",
-                            icon_url=interaction.user.display_avatar.url,
-                        )
-
-                        # Create chart embed
-                        chart_embed = discord.Embed(
-                            title=f"📈 {coin_name.upper()} Price Chart",
-                            description=f"7-day price chart for {coin_name}",
-                            color=0x00D4AA,
-                            timestamp=datetime.now(timezone.utc),
-                        )
-
-                        # Add chart image from CoinGecko
-                        chart_url = (
-                            f"https://www.coingecko.com/coins/{coin_id}/sparkline.svg"
-                        )
-                        chart_embed.set_image(url=chart_url)
-
-                        chart_embed.set_footer(
-                            text="Chart provided by CoinGecko",
-                            icon_url="https://static.coingecko.com/s/thumbnail-007177f3eca19695592f0b8b0eabbdae282b54154e1be912285c9034ea6cbaf2.png",
-                        )
-
-                        # Send both embeds
-                        await interaction.response.send_message(
-                            embeds=[embed, chart_embed]
-                        )
-                    else:
-                        embed = discord.Embed(
-                            title="❌ Error",
-                            description=f"Data untuk '{coin}' tidak ditemukan!",
-                            color=0xFF0000,
-                            timestamp=datetime.now(timezone.utc),
-                        )
-                        await interaction.response.send_message(embed=embed)
+                if coins:
+                    # Use the first match
+                    coin_id = coins[0]["id"]
 
+                    coin_data = await self.prices.get(coin_id)
+                    if coin_data is None:
+                        raise Exception("Failed to fetch crypto data")
                 else:
                     embed = discord.Embed(
                         title="❌ Error",
-                        description="Gagal mengambil data cryptocurrency. Silakan coba lagi.",
+                        description=f"Cryptocurrency '{coin}' tidak ditemukan!",
                         color=0xFF0000,
                         timestamp=datetime.now(timezone.utc),
                     )
-                    await interaction.response.send_message(embed=embed)
+                    await respond(interaction, embed=embed)
+                    return
+
+            if coin_data:
+                coin_name = coin_id.title()
+
+                # Create embed
+                embed = discord.Embed(
+                    title=f"💰 {coin_name.upper()} Price Information",
+                    color=(
+                        0x00FF00
+                        if coin_data.get("usd_24h_change", 0) >= 0
+                        else 0xFF0000
+                    ),
+                    timestamp=datetime.now(timezone.utc),
+                )
+
+                # Price information
+                usd_price = coin_data.get("usd", "N/A")
+                idr_price = coin_data.get("idr", "N/A")
+                change_24h = coin_data.get("usd_24h_change", 0)
+                market_cap = coin_data.get("usd_market_cap", "N/A")
+                volume_24h = coin_data.get("usd_24h_vol", "N/A")
+
+                # Price Info
+                embed.add_field(
+                    name="💵 Price Information",
+                    value=(
+                        f"**USD:** ${usd_price:,.8f}\n"
+                        if isinstance(usd_price, (int, float))
+                        else f"**USD:** {usd_price}\n"
+                    )
+                    + (
+                        f"**IDR:** Rp {idr_price:,.2f}"
+                        if isinstance(idr_price, (int, float))
+                        else f"**IDR:** {idr_price}"
+                    ),
+                    inline=False,
+                )
+
+                # 24h Change
+                change_emoji = "📈" if change_24h >= 0 else "📉"
+                change_color = "+" if change_24h >= 0 else ""
+                embed.add_field(
+                    name=f"{change_emoji} 24h Performance",
+                    value=f"**Change:** {change_color}{change_24h:.2f}%",
+                    inline=True,
+                )
+
+                # Market Data
+                market_info = ""
+                if isinstance(market_cap, (int, float)):
+                    market_info += f"**Market Cap:** ${market_cap:,.0f}\n"
+                if isinstance(volume_24h, (int, float)):
+                    market_info += f"**24h Volume:** ${volume_24h:,.0f}"
+
+                if market_info:
+                    embed.add_field(
+                        name="📊 Market Data",
+                        value=market_info,
+                        inline=True,
+                    )
+
+                source = "Data from CoinGecko API"
+                if data_age is not None:
+                    source += f" (updated {int(data_age)}s ago)"
+
+                embed.set_footer(
+                    text=f"Requested by {interaction.user.display_name} • {source}",
+                    icon_url=interaction.user.display_avatar.url,
+                )
+
+                # Create chart embed
+                chart_embed = discord.Embed(
+                    title=f"📈 {coin_name.upper()} Price Chart",
+                    description=f"7-day price chart for {coin_name}",
+                    color=0x00D4AA,
+                    timestamp=datetime.now(timezone.utc),
+                )
+
+                # Add chart image from CoinGecko
+                chart_url = f"https://www.coingecko.com/coins/{coin_id}/sparkline.svg"
+                chart_embed.set_image(url=chart_url)
+
+                chart_embed.set_footer(
+                    text="Chart provided by CoinGecko",
+                    icon_url="https://static.coingecko.com/s/thumbnail-007177f3eca19695592f0b8b0eabbdae282b54154e1be912285c9034ea6cbaf2.png",
+                )
+
+                # Send both embeds
+                await respond(interaction, embeds=[embed, chart_embed])
+            else:
+                embed = discord.Embed(
+                    title="❌ Error",
+                    description=f"Data untuk '{coin}' tidak ditemukan!",
+                    color=0xFF0000,
+                    timestamp=datetime.now(timezone.utc),
+                )
+                await respond(interaction, embed=embed)
 
+        except UpstreamUnavailable as e:
+            embed = discord.Embed(
+                title="❌ CoinGecko Sedang Sibuk",
+                description=(
+                    "Terlalu banyak request ke CoinGecko. "
+                    f"Coba lagi dalam {math.ceil(e.retry_after)} detik."
+                ),
+                color=0xFF0000,
+                timestamp=datetime.now(timezone.utc),
+            )
+            await respond(interaction, embed=embed)
         except asyncio.TimeoutError:
             embed = discord.Embed(
                 title="❌ Error",
@@ -1528,19 +5183,28 @@ class CryptoCommand(commands.Cog):
                 color=0xFF0000,
                 timestamp=datetime.now(timezone.utc),
             )
-            await interaction.response.send_message(embed=embed)
+            await respond(interaction, embed=embed)
         except Exception as e:
-            print(f"Error in crypto command: {e}")
-            embed = (
-                discord.Embed(
-                    title="❌ Error",
-                    description="Terjadi kesalahan saat mengambil data cryptocurrency.",
-                    color=0xFF0000,
-                    timestamp=datetime.utc,
-                ),
+            log.exception(
+                "Error in crypto command: %s", e, extra=interaction_fields(interaction)
+            )
+            embed = discord.Embed(
+                title="❌ Error",
+                description="Terjadi kesalahan saat mengambil data cryptocurrency.",
+                color=0xFF0000,
+                timestamp=datetime.now(timezone.utc),
             )
 
-            await interaction.response.send_message(embed=embed)
+            await respond(interaction, embed=embed)
+
+    @crypto.autocomplete("coin")
+    async def crypto_autocomplete(self, interaction: discord.Interaction, current: str):
+        return [
+            app_commands.Choice(
+                name=self.coin_index.describe(coin_id)[:100], value=coin_id
+            )
+            for coin_id in self.coin_index.complete(current)
+        ]
 
     @app_commands.command(
         name="botinfo", description="Informasi lengkap tentang bot ini"
@@ -1548,10 +5212,17 @@ class CryptoCommand(commands.Cog):
     async def info_command(self, interaction: discord.Interaction):
         bot_user = self.bot.user
 
-        # Hitung statistik bot
+        # Statistik bot dari counter global (tanpa iterasi semua member)
         total_guilds = len(self.bot.guilds)
-        total_users = len(set(self.bot.get_all_members()))
-        total_channels = len(set(self.bot.get_all_channels()))
+        total_users = global_stats.unique_users
+        total_members = global_stats.members
+        total_channels = global_stats.channels
+
+        # Unique user tidak tersedia di mode member cache lean
+        users_line = ""
+        if total_users is not None:
+            approx = "~" if global_stats.user_sketch else ""
+            users_line = f"**Users:** {approx}{total_users:,}\n"
 
         embed = discord.Embed(
             title=f"🤖 Bot Info: {bot_user.display_name}",
@@ -1580,7 +5251,8 @@ class CryptoCommand(commands.Cog):
             name="📊 Statistics",
             value=(
                 f"**Servers:** {total_guilds:,}\n"
-                f"**Users:** {total_users:,}\n"
+                f"{users_line}"
+                f"**Members:** {total_members:,}\n"
                 f"**Channels:** {total_channels:,}\n"
                 f"**Ping:** {round(self.bot.latency * 1000)}ms"
             ),
@@ -1618,16 +5290,206 @@ class CryptoCommand(commands.Cog):
         await interaction.response.send_message(embed=embed)
 
 
-# Tambahkan ini di bagian startup bot Anda
+# Dipanggil dari DiscordBot.setup_hook
 async def setup_crypto_commands(bot):
     await bot.add_cog(CryptoCommand(bot))
 
 
+def cluster_status_path(cluster_id):
+    return os.path.join(CLUSTER_STATUS_DIR, f"cluster-{cluster_id}.json")
+
+
+@tasks.loop(seconds=CLUSTER_STATUS_INTERVAL)
+async def report_cluster_status():
+    """Worker: tulis latency dan jumlah guild per shard untuk supervisor"""
+    guilds_per_shard = Counter(guild.shard_id for guild in bot.guilds)
+    status = {
+        "cluster": CLUSTER_ID,
+        "pid": os.getpid(),
+        "updated": time.time(),
+        "shards": {
+            str(shard_id): {
+                "latency": latency if math.isfinite(latency) else None,
+                "guilds": guilds_per_shard.get(shard_id, 0),
+            }
+            for shard_id, latency in bot.latencies
+        },
+    }
+
+    # Tulis ke file sementara lalu rename supaya supervisor tidak baca file setengah jadi
+    os.makedirs(CLUSTER_STATUS_DIR, exist_ok=True)
+    path = cluster_status_path(CLUSTER_ID)
+    with open(path + ".tmp", "w") as f:
+        json.dump(status, f)
+    os.replace(path + ".tmp", path)
+
+
+class ClusterWorker:
+    """Supervisor: jalankan satu proses worker dan restart kalau crash"""
+
+    def __init__(self, cluster_id, shard_ids, shard_count, start_delay):
+        self.cluster_id = cluster_id
+        self.shard_ids = shard_ids
+        self.shard_count = shard_count
+        self.start_delay = start_delay
+        self.process = None
+        self.restarts = 0
+        self.stopping = False
+
+    async def run(self):
+        # Start bertahap, identify Discord dibatasi 1 shard per 5 detik per bucket
+        await asyncio.sleep(self.start_delay)
+        backoff = 1
+
+        while not self.stopping:
+            env = dict(
+                os.environ,
+                CLUSTER_ID=str(self.cluster_id),
+                SHARD_COUNT=str(self.shard_count),
+                SHARD_IDS=",".join(map(str, self.shard_ids)),
+            )
+            started = time.monotonic()
+            self.process = await asyncio.create_subprocess_exec(
+                sys.executable, os.path.abspath(__file__), env=env
+            )
+            log.info(
+                "🧩 Cluster %s started (pid %s, shards %s-%s)",
+                self.cluster_id,
+                self.process.pid,
+                self.shard_ids[0],
+                self.shard_ids[-1],
+            )
+            code = await self.process.wait()
+            if self.stopping:
+                break
+
+            # Backoff di-reset kalau worker sempat jalan normal
+            if time.monotonic() - started > 60:
+                backoff = 1
+            self.restarts += 1
+            log.warning(
+                "⚠️ Cluster %s exited with code %s, restarting in %ss",
+                self.cluster_id,
+                code,
+                backoff,
+            )
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 60)
+
+    def stop(self):
+        self.stopping = True
+        if self.process is not None and self.process.returncode is None:
+            self.process.terminate()
+
+
+async def fetch_gateway_info(token):
+    data = await http_client.get_json(
+        "https://discord.com/api/v10/gateway/bot",
+        headers={"Authorization": f"Bot {token}"},
+    )
+    if data is None:
+        raise Exception("Failed to fetch recommended shard count")
+    return data["shards"], data["session_start_limit"]["max_concurrency"]
+
+
+def report_cluster(workers):
+    shards = {}
+    stale = []
+    for worker in workers:
+        try:
+            with open(cluster_status_path(worker.cluster_id)) as f:
+                status = json.load(f)
+        except (OSError, ValueError):
+            stale.append(worker.cluster_id)
+            continue
+        if time.time() - status["updated"] > CLUSTER_STATUS_INTERVAL * 3:
+            stale.append(worker.cluster_id)
+        shards.update(status["shards"])
+
+    latencies = [s["latency"] for s in shards.values() if s["latency"] is not None]
+    avg_latency = sum(latencies) / len(latencies) * 1000 if latencies else 0
+    log.info(
+        "📊 Cluster: %d shards up, %s guilds, avg latency %.0fms, restarts %d%s",
+        len(shards),
+        f"{sum(s['guilds'] for s in shards.values()):,}",
+        avg_latency,
+        sum(w.restarts for w in workers),
+        f", stale clusters {stale}" if stale else "",
+        extra={"event": "cluster"},
+    )
+    for shard_id, shard in sorted(shards.items(), key=lambda item: int(item[0])):
+        latency = f"{shard['latency'] * 1000:.0f}ms" if shard["latency"] else "N/A"
+        log.info(
+            "   shard %s: %s guilds, %s",
+            shard_id,
+            f"{shard['guilds']:,}",
+            latency,
+            extra={"event": "cluster"},
+        )
+
+
+async def run_cluster(token):
+    """Bagi shard ke CLUSTER_WORKERS proses, restart yang crash, dan agregasi status"""
+    if SHARD_COUNT:
+        shard_count, max_concurrency = SHARD_COUNT, 1
+    else:
+        shard_count, max_concurrency = await fetch_gateway_info(token)
+    await http_client.close()
+
+    # Range shard berurutan, dibagi serata mungkin
+    worker_count = max(1, min(CLUSTER_WORKERS, shard_count))
+    per_worker, extra = divmod(shard_count, worker_count)
+    workers = []
+    first = 0
+    for cluster_id in range(worker_count):
+        size = per_worker + (1 if cluster_id < extra else 0)
+        start_delay = first * 5 / max_concurrency
+        workers.append(
+            ClusterWorker(
+                cluster_id, list(range(first, first + size)), shard_count, start_delay
+            )
+        )
+        first += size
+
+    log.info("🧩 Starting %d clusters for %d shards", worker_count, shard_count)
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, lambda: [w.stop() for w in workers])
+        except NotImplementedError:
+            pass  # Windows
+
+    async def report_loop():
+        while not all(w.stopping for w in workers):
+            await asyncio.sleep(CLUSTER_STATUS_INTERVAL)
+            report_cluster(workers)
+
+    reporter = asyncio.create_task(report_loop())
+    try:
+        await asyncio.gather(*(worker.run() for worker in workers))
+    finally:
+        for worker in workers:
+            worker.stop()
+        reporter.cancel()
+
+
+startup_timings["module_init"] = time.perf_counter() - PROCESS_START
+if STARTUP_PROFILE:
+    stop_import_profile()
+
+
 # Run the bot
 if __name__ == "__main__":
+    setup_logging()
     token = os.getenv("TOKEN")
 
     if token is None:
-        print("❌ TOKEN tidak ditemukan. Pastikan sudah diset di environment variable.")
+        log.error(
+            "❌ TOKEN tidak ditemukan. Pastikan sudah diset di environment variable."
+        )
+    elif CLUSTER_WORKERS and CLUSTER_ID is None:
+        asyncio.run(run_cluster(token))
     else:
-        bot.run(token)
+        # Logging discord.py ikut lewat handler kita (root logger)
+        bot.run(token, log_handler=None)
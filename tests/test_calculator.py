@@ -0,0 +1,104 @@
+import asyncio
+import time
+
+import pytest
+
+import bot
+
+
+def calculate(text, mode="float", variables=None):
+    return asyncio.run(bot.calculate(text, variables, mode=mode))
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("2 + 3 * 4", 14),
+        ("(1 + 2) * 3", 9),
+        ("10 - 4 - 3", 3),
+        ("8 / 4 / 2", 1),
+        ("7 % 3", 1),
+        ("2 ^ 3 ^ 2", 512),  # ^ right-associative
+        ("-2 ^ 2", -4),  # unary lebih lemah dari ^
+        ("2 * 3!", 12),
+        ("2 ** 3", 8),
+        ("6 ÷ 4", 1.5),
+    ],
+)
+def test_operator_precedence(text, expected):
+    assert calculate(text) == (None, expected)
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["2 $ 3", "(1 + 2", "2 = 3", "x = y = 2", "(" * 40 + "1" + ")" * 40],
+)
+def test_invalid_expressions_are_rejected(text):
+    with pytest.raises(bot.CalculationError):
+        calculate(text)
+
+
+def test_expression_length_is_limited():
+    with pytest.raises(bot.CalculationError):
+        calculate("1+" * bot.CALC_MAX_LENGTH + "1")
+
+
+def test_round_rejects_huge_negative_digits():
+    # Dulu round(5, -10**7) menahan event loop beberapa detik
+    start = time.perf_counter()
+    with pytest.raises(bot.CalculationError):
+        calculate("round(5, -30000000)")
+    assert time.perf_counter() - start < 1
+
+
+def test_round_within_limit():
+    assert calculate("round(1234.5678, 2)") == (None, 1234.57)
+    assert calculate("round(1234, -2)") == (None, 1200)
+
+
+@pytest.mark.parametrize("text", ["1e-10000000 + 1", "2 ^ (1/3) + 1e-20000000"])
+def test_exact_mode_rejects_huge_exponents(text):
+    start = time.perf_counter()
+    with pytest.raises(bot.CalculationError):
+        calculate(text, mode="exact")
+    assert time.perf_counter() - start < 1
+
+
+def test_exponent_within_limit():
+    _, value = calculate("1e-300 * 1e300", mode="exact")
+    assert value == 1
+
+
+def test_assignment_and_variables():
+    assert calculate("x = 12 * 12") == ("x", 144)
+    assert calculate("x * 2 + ans", variables={"x": 144, "ans": 1}) == (None, 289)
+
+
+@pytest.mark.parametrize("text", ["z + 1", "pi = 3", "sqrt = 2"])
+def test_bad_variables_are_rejected(text):
+    with pytest.raises(bot.CalculationError):
+        calculate(text)
+
+
+def test_exact_mode_keeps_fractions():
+    from fractions import Fraction
+
+    assert calculate("1 / 3", mode="exact") == (None, Fraction(1, 3))
+    assert calculate("0.1 + 0.2", mode="exact") == (None, Fraction(3, 10))
+    # Variabel dari sesi float dikonversi ke mode exact
+    assert calculate("y + 1", mode="exact", variables={"y": 0.5}) == (
+        None,
+        Fraction(3, 2),
+    )
+
+
+def test_sessions_keep_variables_per_user():
+    sessions = bot.CalculatorSessions(max_users=1, max_variables=2)
+    sessions.store(1, {"x": 1, "ans": 1})
+    assert sessions.variables(1) == {"x": 1, "ans": 1}
+    with pytest.raises(bot.CalculationError):
+        sessions.store(1, {"y": 2})
+
+    sessions.store(2, {"ans": 5})  # user paling lama dibuang
+    assert sessions.variables(1) == {}
+    assert sessions.variables(2) == {"ans": 5}
@@ -0,0 +1,42 @@
+from types import SimpleNamespace
+
+import bot
+
+
+class FakeGuild:
+    def __init__(self, channels):
+        self.id = 1
+        self.channels = channels
+        self.system_channel = None
+
+    @property
+    def text_channels(self):
+        return self.channels
+
+    def get_channel(self, channel_id):
+        return next((c for c in self.channels if c.id == channel_id), None)
+
+
+def test_missing_channel_is_cached_until_invalidated():
+    resolver = bot.ChannelResolver(["welcome"])
+    scans = []
+    scan = resolver._scan
+    resolver._scan = lambda guild: scans.append(guild.id) or scan(guild)
+    guild = FakeGuild([])
+
+    assert resolver.resolve(guild) is None
+    assert resolver.resolve(guild) is None
+    assert scans == [1]
+
+    guild.channels.append(SimpleNamespace(id=7, name="welcome"))
+    resolver.invalidate(guild.id)
+    assert resolver.resolve(guild).id == 7
+
+
+def test_deleted_channel_triggers_rescan():
+    resolver = bot.ChannelResolver(["welcome"])
+    guild = FakeGuild([SimpleNamespace(id=7, name="welcome")])
+    assert resolver.resolve(guild).id == 7
+
+    guild.channels = [SimpleNamespace(id=8, name="welcome-2")]
+    assert resolver.resolve(guild).id == 8
@@ -0,0 +1,31 @@
+import json
+import logging
+import time
+from types import SimpleNamespace
+
+import bot
+
+
+def test_report_cluster_logs_summary_and_shards(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(bot, "CLUSTER_STATUS_DIR", str(tmp_path))
+    status = {
+        "updated": time.time(),
+        "shards": {
+            "0": {"guilds": 1200, "latency": 0.05},
+            "1": {"guilds": 800, "latency": None},
+        },
+    }
+    (tmp_path / "cluster-0.json").write_text(json.dumps(status))
+    workers = [SimpleNamespace(cluster_id=0, restarts=1)]
+
+    with caplog.at_level(logging.INFO, logger="bot"):
+        bot.report_cluster(workers)
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert messages[0] == (
+        "📊 Cluster: 2 shards up, 2,000 guilds, avg latency 50ms, restarts 1"
+    )
+    assert messages[1:] == [
+        "   shard 0: 1,200 guilds, 50ms",
+        "   shard 1: 800 guilds, N/A",
+    ]
@@ -0,0 +1,47 @@
+import asyncio
+import gc
+import logging
+
+import bot
+
+
+def test_coin_in_flight_is_not_requested_again(monkeypatch):
+    sent = []
+
+    async def get_json(url, params=None, headers=None):
+        sent.append(params["ids"])
+        await asyncio.sleep(0.05)
+        return {coin: {"usd": 1.0} for coin in params["ids"].split(",")}
+
+    monkeypatch.setattr(bot.http_client, "get_json", get_json)
+    monkeypatch.setattr(bot, "response_cache", bot.ResponseCache())
+
+    async def run():
+        batcher = bot.CoinPriceBatcher(window=0.01)
+        first = asyncio.ensure_future(batcher.get("bitcoin"))
+        await asyncio.sleep(0.03)  # batch pertama sedang di-fetch
+        second = await batcher._enqueue("bitcoin")
+        return await first, second
+
+    assert asyncio.run(run()) == ({"usd": 1.0}, {"usd": 1.0})
+    assert sent == ["bitcoin"]
+
+
+def test_failed_batch_without_waiters_does_not_leak_exceptions(monkeypatch, caplog):
+    async def get_json(url, params=None, headers=None):
+        await asyncio.sleep(0.02)
+        raise bot.UpstreamUnavailable("api.coingecko.com", 5, "budget")
+
+    monkeypatch.setattr(bot.http_client, "get_json", get_json)
+
+    async def run():
+        batcher = bot.CoinPriceBatcher(window=0.01)
+        caller = asyncio.ensure_future(batcher._enqueue("bitcoin"))
+        await asyncio.sleep(0.015)
+        caller.cancel()
+        await asyncio.sleep(0.05)
+
+    with caplog.at_level(logging.ERROR, logger="asyncio"):
+        asyncio.run(run())
+        gc.collect()
+    assert "never retrieved" not in caplog.text
@@ -0,0 +1,36 @@
+import asyncio
+
+import bot
+
+
+def test_refill_does_not_inherit_command_trace():
+    seen = []
+
+    async def fetch():
+        seen.append(bot.command_trace.get())
+        return "test", {"id": len(seen)}
+
+    async def run():
+        pool = bot.ContentPool("test", fetch, key=lambda item: item["id"], size=2)
+        bot.command_trace.set(bot.CommandTrace("meme"))
+        assert pool.take() == (None, None)  # kosong: memicu refill
+        await pool.refill_task
+        return pool
+
+    pool = asyncio.run(run())
+    assert len(pool.items) == 2
+    assert seen == [None, None]
+
+
+def test_take_skips_expired_items():
+    async def fetch():
+        return "test", {"id": 1}
+
+    async def run():
+        pool = bot.ContentPool("test", fetch, key=lambda item: item["id"], ttl=0)
+        await pool.refill()
+        return pool.take(), pool.stats()
+
+    (source, item), stats = asyncio.run(run())
+    assert item is None
+    assert stats["expired"] == 1
@@ -0,0 +1,59 @@
+import asyncio
+from types import SimpleNamespace
+
+import discord
+import pytest
+
+import bot
+
+
+class FakeInteraction:
+    def __init__(self):
+        self.deferred = False
+        self.sent = []
+        self.user = SimpleNamespace(
+            id=1, display_name="Tester", display_avatar=SimpleNamespace(url="")
+        )
+        self.guild_id = 1
+        self.command = SimpleNamespace(qualified_name="crypto")
+        self.response = SimpleNamespace(
+            is_done=lambda: self.deferred,
+            defer=self.defer,
+            send_message=self.send,
+        )
+        self.followup = SimpleNamespace(send=self.send)
+
+    async def defer(self, **kwargs):
+        self.deferred = True
+
+    async def send(self, **kwargs):
+        self.sent.append(kwargs)
+
+
+def run_crypto(error):
+    cog = bot.CryptoCommand(bot.bot)
+
+    async def get(coin_id):
+        raise error
+
+    cog.prices.get = get
+    interaction = FakeInteraction()
+    asyncio.run(bot.CryptoCommand.crypto.callback(cog, interaction, "bitcoin"))
+    return interaction
+
+
+def test_upstream_unavailable_defers_and_reports_retry():
+    interaction = run_crypto(
+        bot.UpstreamUnavailable("api.coingecko.com", 6.2, "budget")
+    )
+    assert interaction.deferred
+    [message] = interaction.sent
+    assert "7 detik" in message["embed"].description
+
+
+@pytest.mark.parametrize("error", [RuntimeError("boom"), asyncio.TimeoutError()])
+def test_errors_reply_with_embed(error):
+    interaction = run_crypto(error)
+    [message] = interaction.sent
+    assert isinstance(message["embed"], discord.Embed)
+    assert message["embed"].timestamp is not None
@@ -0,0 +1,18 @@
+from types import SimpleNamespace
+
+import bot
+
+
+def test_raw_remove_with_user_payload_keeps_online_count():
+    tracker = bot.GuildStatsTracker()
+    guild = SimpleNamespace(id=1, members=[], channels=[])
+    stats = tracker.seed(guild)
+    stats.online = 2
+    stats.bots = 1
+
+    # on_raw_member_remove untuk member yang tidak di-cache: payload.user = User
+    user = SimpleNamespace(id=5, bot=True)
+    tracker.member_removed(1, user)
+
+    assert stats.bots == 0
+    assert stats.online == 2
@@ -0,0 +1,38 @@
+import asyncio
+import time
+
+import bot
+
+
+def test_pacer_bounds_total_wait_under_concurrency():
+    async def run():
+        pacer = bot.HostPacer("example.com", [(2, 1)], max_wait=1)
+        start = time.monotonic()
+
+        async def call():
+            try:
+                await pacer.acquire()
+            except bot.UpstreamUnavailable:
+                return None
+            return time.monotonic() - start
+
+        return await asyncio.gather(*(call() for _ in range(20)))
+
+    waits = asyncio.run(run())
+    accepted = [wait for wait in waits if wait is not None]
+    # 2 token langsung + 2 per detik selama max_wait, sisanya fail fast
+    assert 2 <= len(accepted) <= 5
+    assert max(accepted) < 1.2
+
+
+def test_cancelled_wait_returns_token():
+    async def run():
+        pacer = bot.HostPacer("example.com", [(1, 1)], max_wait=5)
+        await pacer.acquire()
+        task = asyncio.create_task(pacer.acquire())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return pacer.tokens[0]
+
+    assert asyncio.run(run()) > -0.5
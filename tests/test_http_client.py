@@ -0,0 +1,43 @@
+import asyncio
+
+from aiohttp import web
+
+import bot
+
+
+def upstream_outcomes(host):
+    return {
+        dict(labels)["outcome"]: count
+        for labels, count in bot.metrics.series("bot_upstream_requests_total").items()
+        if dict(labels)["upstream"] == host
+    }
+
+
+def test_cancelled_request_is_not_an_error():
+    async def slow(request):
+        await asyncio.sleep(1)
+        return web.json_response({})
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/slow", slow)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+
+        client = bot.HTTPClient()
+        task = asyncio.ensure_future(client.get_json(f"http://127.0.0.1:{port}/slow"))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await client.close()
+        await runner.cleanup()
+        return client
+
+    client = asyncio.run(run())
+    outcomes = upstream_outcomes("127.0.0.1")
+    assert outcomes.get("cancelled") == 1
+    assert "error" not in outcomes
+    assert client.breakers["127.0.0.1"].failures == 0
@@ -0,0 +1,50 @@
+import asyncio
+from types import SimpleNamespace
+
+import bot
+
+
+class FakeGuild:
+    def __init__(self, members):
+        self.id = 1
+        self.members = {member: SimpleNamespace(id=member) for member in members}
+        self.removed = []
+
+    def get_member(self, member_id):
+        return self.members.get(member_id)
+
+    def _remove_member(self, member):
+        self.removed.append(member.id)
+        del self.members[member.id]
+
+
+def test_evicts_oldest_past_max_size():
+    guild = FakeGuild([1, 2, 3])
+    client = SimpleNamespace(
+        get_guild=lambda guild_id: guild, user=SimpleNamespace(id=99)
+    )
+    cache = bot.MemberCacheManager(max_size=2, idle_timeout=3600)
+    for member_id in (1, 2, 3):
+        cache.touch(SimpleNamespace(id=member_id, guild=guild))
+    cache.evict(client)
+    assert guild.removed == [1]
+
+
+def test_interaction_does_not_track_uncached_members(monkeypatch):
+    cache = bot.MemberCacheManager()
+    monkeypatch.setattr(bot, "member_cache", cache)
+    guild = FakeGuild([1])
+
+    class Member(bot.discord.Member):
+        # Override property Member supaya bisa dibuat tanpa state gateway
+        id = None
+        guild = None
+
+        def __init__(self, member_id):
+            self.id = member_id
+            self.guild = guild
+
+    for member_id in (1, 2):
+        interaction = SimpleNamespace(user=Member(member_id))
+        asyncio.run(bot.touch_interaction_member(interaction))
+    assert list(cache._seen) == [(1, 1)]
@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+import bot
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """url -> (delay detik, data); data None = upstream gagal"""
+    responses = {}
+    calls = []
+
+    async def fetch_api(url, headers=None, params=None, policy=None):
+        calls.append(url)
+        delay, data = responses[url]
+        await asyncio.sleep(delay)
+        return data
+
+    monkeypatch.setattr(bot, "fetch_api", fetch_api)
+    return responses, calls
+
+
+def provider(name):
+    return bot.Provider(name, f"https://{name}.example/api", lambda data: data)
+
+
+def test_slow_provider_is_hedged(upstream):
+    responses, calls = upstream
+    slow, fast = provider("slow"), provider("fast")
+    responses[slow.url] = (0.5, {"from": "slow"})
+    responses[fast.url] = (0.01, {"from": "fast"})
+    group = bot.ProviderGroup("test", [slow, fast], hedge_after=0.05)
+
+    winner, data = asyncio.run(group.fetch())
+
+    assert (winner, data) == (fast, {"from": "fast"})
+    assert group.hedges == 1
+    assert calls == [slow.url, fast.url]
+    # Kalah hedge bukan error
+    assert slow.error_rate == 0
+    assert slow.latency >= 0.05
+
+
+def test_failure_falls_through_without_waiting_for_hedge(upstream):
+    responses, calls = upstream
+    broken, backup = provider("broken"), provider("backup")
+    responses[broken.url] = (0, None)
+    responses[backup.url] = (0, {"from": "backup"})
+    group = bot.ProviderGroup("test", [broken, backup], hedge_after=10)
+
+    winner, data = asyncio.run(asyncio.wait_for(group.fetch(), 1))
+
+    assert winner is backup
+    assert group.hedges == 0
+    assert broken.error_rate > 0
+
+
+def test_all_providers_failing_returns_none(upstream):
+    responses, _ = upstream
+    providers = [provider("a"), provider("b")]
+    for item in providers:
+        responses[item.url] = (0, None)
+    group = bot.ProviderGroup("test", providers, hedge_after=0.05)
+    assert asyncio.run(group.fetch()) == (None, None)
+
+
+def test_ranking_prefers_fast_and_healthy_providers(upstream):
+    responses, _ = upstream
+    flaky, slow, good = provider("flaky"), provider("slow"), provider("good")
+    group = bot.ProviderGroup("test", [flaky, slow, good], hedge_after=1)
+
+    for _ in range(5):
+        flaky.record(0.01, False)
+        slow.record(0.8, True)
+        good.record(0.05, True)
+
+    assert group.ranked() == [good, slow, flaky]
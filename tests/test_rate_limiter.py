@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+import bot
+
+POLICIES = {"cooldown": (1, 3600), "general": (10, 60), "meme": (1, 10)}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(bot.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "sqlite":
+        return bot.SQLiteRateLimitBackend(str(tmp_path / "ratelimit.sqlite3"))
+    return bot.MemoryRateLimitBackend()
+
+
+def check(limiter, user_id=1, command="hello"):
+    return asyncio.run(limiter.check(user_id, command))
+
+
+def test_penalties_escalate_from_warning_to_blacklist(backend, clock):
+    limiter = bot.RateLimiter(backend, policies=POLICIES, api_commands=set())
+    assert check(limiter).allowed
+
+    penalties = [check(limiter).penalty for _ in range(bot.COOLDOWN_STRIKES)]
+    assert penalties == ["warning"] * (bot.COOLDOWN_STRIKES - 1) + ["cooldown"]
+
+    # Selama cooldown tidak ada strike baru
+    blocked = check(limiter)
+    assert blocked.penalty == "cooldown"
+    assert blocked.retry_after == pytest.approx(bot.COOLDOWN_SECONDS)
+
+    for _ in range(bot.BLACKLIST_STRIKES - bot.COOLDOWN_STRIKES):
+        clock[0] += bot.COOLDOWN_SECONDS + 1
+        decision = check(limiter)
+    assert decision.penalty == "blacklist"
+    assert decision.retry_after >= bot.BLACKLIST_SECONDS
+
+
+def test_strikes_expire_after_quiet_period(backend, clock):
+    limiter = bot.RateLimiter(backend, policies=POLICIES, api_commands=set())
+    check(limiter)
+    check(limiter)  # strike 1
+
+    clock[0] += bot.STRIKE_TTL + 3600  # bucket penuh lagi, strike kadaluarsa
+    assert check(limiter).allowed
+    assert check(limiter).penalty == "warning"
+
+
+def test_command_bucket_applies_per_command(backend, clock):
+    policies = {"meme": (1, 10)}
+    limiter = bot.RateLimiter(backend, policies=policies, api_commands=set())
+    assert check(limiter, command="meme").allowed
+    denied = check(limiter, command="meme")
+    assert not denied.allowed
+    assert denied.retry_after == pytest.approx(10)
+    assert check(limiter, command="hello").allowed
+    assert check(limiter, user_id=2, command="meme").allowed
+
+
+def test_sqlite_state_is_shared_between_processes(tmp_path, clock):
+    path = str(tmp_path / "ratelimit.sqlite3")
+    first = bot.RateLimiter(
+        bot.SQLiteRateLimitBackend(path), policies=POLICIES, api_commands=set()
+    )
+    second = bot.RateLimiter(
+        bot.SQLiteRateLimitBackend(path), policies=POLICIES, api_commands=set()
+    )
+    assert check(first).allowed
+    assert not check(second).allowed
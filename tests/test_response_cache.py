@@ -0,0 +1,95 @@
+import asyncio
+import logging
+
+import bot
+
+
+def make_fetcher(values):
+    calls = []
+
+    async def fetch():
+        calls.append(len(calls))
+        return values[min(len(calls) - 1, len(values) - 1)]
+
+    return fetch, calls
+
+
+def test_fresh_hit_skips_upstream():
+    cache = bot.ResponseCache(policies={"p": (60, 60)})
+    fetch, calls = make_fetcher(["a", "b"])
+
+    async def run():
+        return [await cache.get_or_fetch("k", fetch, "p") for _ in range(3)]
+
+    assert asyncio.run(run()) == ["a", "a", "a"]
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 2
+
+
+def test_stale_entry_is_served_and_revalidated():
+    cache = bot.ResponseCache(policies={"p": (0.01, 60)})
+    fetch, calls = make_fetcher(["old", "new"])
+
+    async def run():
+        await cache.get_or_fetch("k", fetch, "p")
+        await asyncio.sleep(0.02)
+        stale = await cache.get_or_fetch("k", fetch, "p")
+        await asyncio.gather(*cache._tasks)
+        fresh = await cache.get_or_fetch("k", fetch, "p")
+        return stale, fresh
+
+    assert asyncio.run(run()) == ("old", "new")
+    assert len(calls) == 2
+    assert cache.stats()["stale_hits"] == 1
+
+
+def test_expired_past_stale_window_refetches():
+    cache = bot.ResponseCache(policies={"p": (0.01, 0.01)})
+    fetch, calls = make_fetcher(["old", "new"])
+
+    async def run():
+        await cache.get_or_fetch("k", fetch, "p")
+        await asyncio.sleep(0.03)
+        return await cache.get_or_fetch("k", fetch, "p")
+
+    assert asyncio.run(run()) == "new"
+    assert cache.stats()["misses"] == 2
+
+
+def test_failed_response_is_not_cached():
+    cache = bot.ResponseCache(policies={"p": (60, 60)})
+    fetch, calls = make_fetcher([None, "ok"])
+
+    async def run():
+        return [await cache.get_or_fetch("k", fetch, "p") for _ in range(2)]
+
+    assert asyncio.run(run()) == [None, "ok"]
+
+
+def test_lru_evicts_oldest_entry():
+    cache = bot.ResponseCache(maxsize=2, policies={"p": (60, 60)})
+    for key in ("a", "b", "c"):
+        cache.set(key, key, 60)
+    assert list(cache._entries) == ["b", "c"]
+
+
+def test_cache_key_is_case_and_param_order_insensitive():
+    assert bot.cache_key("https://x/y", {"b": "2", "a": "Jakarta"}) == bot.cache_key(
+        "https://X/y", {"a": "jakarta", "b": "2"}
+    )
+
+
+def test_refresh_error_does_not_log_cache_key(caplog):
+    cache = bot.ResponseCache()
+    key = bot.cache_key(
+        "http://api.openweathermap.org/data/2.5/weather?q=jakarta&appid=deadbeefcafe"
+    )
+
+    async def failing():
+        raise RuntimeError(f"boom for {key}")
+
+    with caplog.at_level(logging.WARNING, logger="bot"):
+        asyncio.run(cache._refresh(key, failing, 60, "weather"))
+
+    assert "Cache refresh error for weather" in caplog.text
+    assert "deadbeefcafe" not in caplog.text
@@ -0,0 +1,27 @@
+import asyncio
+
+import bot
+
+
+def coalesced_total():
+    return sum(bot.metrics.series("bot_singleflight_coalesced_total").values())
+
+
+def test_concurrent_callers_share_one_call():
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"ok": True}
+
+    async def run():
+        flight = bot.SingleFlight()
+        return await asyncio.gather(*(flight.do("key", fetch) for _ in range(5)))
+
+    before = coalesced_total()
+    results = asyncio.run(run())
+    assert calls == 1
+    assert results == [{"ok": True}] * 5
+    assert coalesced_total() - before == 4
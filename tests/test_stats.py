@@ -0,0 +1,35 @@
+import asyncio
+from types import SimpleNamespace
+
+import bot
+
+
+def test_render_includes_subsystem_gauges():
+    bot.http_client.guards_for("api.example.com")
+    text = bot.metrics.render()
+    for name in (
+        "bot_upstream_breaker_trips",
+        "bot_upstream_paced_seconds",
+        "bot_response_cache_entries",
+        "bot_singleflight_inflight",
+        "bot_provider_error_rate",
+        "bot_content_pool_events",
+        "bot_welcome_bursting_guilds",
+    ):
+        assert f"# TYPE {name} gauge" in text
+
+
+def test_stats_command_sends_summary_embed():
+    sent = []
+
+    async def send_message(**kwargs):
+        sent.append(kwargs)
+
+    interaction = SimpleNamespace(response=SimpleNamespace(send_message=send_message))
+    asyncio.run(bot.stats_command.callback(interaction))
+    [message] = sent
+    names = [field.name for field in message["embed"].fields]
+    assert "🗄️ Cache" in names
+    assert "🎲 Provider" in names
+    assert "👋 Welcome" in names
+    assert message["ephemeral"]
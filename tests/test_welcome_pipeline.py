@@ -0,0 +1,44 @@
+import asyncio
+from types import SimpleNamespace
+
+import bot
+
+
+def welcome_counts():
+    return {
+        dict(labels)["outcome"]: count
+        for labels, count in bot.metrics.series("bot_welcome_total").items()
+    }
+
+
+def test_burst_is_coalesced_and_counted():
+    singles = []
+    bursts = []
+
+    async def send_single(member):
+        singles.append(member)
+
+    async def send_burst(guild, members):
+        bursts.append(members)
+
+    async def run():
+        pipeline = bot.WelcomePipeline(
+            send_single, send_burst, window=0.05, threshold=3, max_pending=2
+        )
+        guild = SimpleNamespace(id=1)
+        for i in range(6):
+            await pipeline.member_joined(SimpleNamespace(id=i, guild=guild))
+        await asyncio.sleep(0.1)
+        return pipeline
+
+    before = welcome_counts()
+    pipeline = asyncio.run(run())
+    after = welcome_counts()
+
+    # 2 welcome tunggal, join ke-3 memicu burst (maks 2 pending), sisanya di-drop
+    assert len(singles) == 2
+    assert [len(members) for members in bursts] == [2]
+    assert pipeline.stats()["dropped"] == 2
+    assert after.get("sent", 0) - before.get("sent", 0) == 3
+    assert after.get("coalesced", 0) - before.get("coalesced", 0) == 2
+    assert after.get("dropped", 0) - before.get("dropped", 0) == 2